@@ -13,7 +13,7 @@ except Exception:
     _HAS_SQLITE = False
 
 from ..models import RunDB, Project, RoadmapItem
-from ..discovery import upsert_discovery_artifacts, dor_check
+from ..discovery import upsert_discovery_artifacts, dor_check_from_objs
 from ..integrations.github import open_pr_for_run
 from .service import with_retry, persist_on_step
 from ..agents.product import draft_prd
@@ -67,7 +67,7 @@ def _append_history(state: PipelineState, step: str) -> None:
 def node_product(state: PipelineState, db: Session) -> PipelineState:
     _append_history(state, "product")
     # Ensure discovery artifacts exist (idempotent)
-    upsert_discovery_artifacts(db, state["tenant_id"], state["project_id"], state["roadmap_item_id"], force=False)
+    ensured = upsert_discovery_artifacts(db, state["tenant_id"], state["project_id"], state["roadmap_item_id"], force=False)
     # Build PRD via product persona (typed artifact)
     proj = db.get(Project, state["project_id"]) if state.get("project_id") else None
     item = db.get(RoadmapItem, state["roadmap_item_id"]) if state.get("roadmap_item_id") else None
@@ -76,7 +76,7 @@ def node_product(state: PipelineState, db: Session) -> PipelineState:
 
     prd_json = draft_prd(project_name, item_title, references=None)
     # Optionally record DoR status in shared fields for backward-compat (not required by tests)
-    _ok, _missing, _ = dor_check(db, state["tenant_id"], state["project_id"], state["roadmap_item_id"])
+    _ok, _missing, _ = dor_check_from_objs(*ensured["artifacts"])
     prd_json.setdefault("dor_pass", _ok)
     if _missing:
         prd_json.setdefault("missing", _missing)
@@ -181,11 +181,18 @@ def node_release(state: PipelineState, db: Session) -> PipelineState:
     return state
 
 # --------- Builder / Runner ---------
+_CHECKPOINT_DIR = "data"
+_checkpoint_dir_ready = False
+
 def _checkpointer():
+    global _checkpoint_dir_ready
     mode = os.getenv("LANGGRAPH_CHECKPOINT", "sqlite").lower()
     if mode == "sqlite" and _HAS_SQLITE:
-        os.makedirs("data", exist_ok=True)
-        return SqliteSaver("data/langgraph.db")
+        # Create the directory on first sqlite use only, not on every graph build
+        if not _checkpoint_dir_ready:
+            os.makedirs(_CHECKPOINT_DIR, exist_ok=True)
+            _checkpoint_dir_ready = True
+        return SqliteSaver(os.path.join(_CHECKPOINT_DIR, "langgraph.db"))
     return MemorySaver()
 
 def build_graph(db: Session):
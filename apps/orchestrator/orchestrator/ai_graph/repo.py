@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import uuid
 from typing import Optional, List, Dict, Any
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy import asc, desc
 
 from ..models import GraphState
@@ -46,6 +46,11 @@ def get_last(db: Session, run_id: str) -> Optional[GraphState]:
 def get_history(db: Session, run_id: str) -> List[Dict[str, Any]]:
     rows = (
         db.query(GraphState)
+        # Timeline columns only; state_json (a full state snapshot per attempt) is not shown
+        .options(load_only(
+            GraphState.run_id, GraphState.step_index, GraphState.step_name, GraphState.status,
+            GraphState.attempt, GraphState.created_at, GraphState.error, GraphState.logs_json,
+        ))
         .filter(GraphState.run_id == run_id)
         .order_by(asc(GraphState.step_index), asc(GraphState.attempt))
         .all()
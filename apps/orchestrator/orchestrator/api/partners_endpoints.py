@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
-from fastapi.responses import JSONResponse
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Literal
 from sqlalchemy.orm import Session
 
 from ..db import get_db
-from ..security import audit_event, mask_dict
+from ..security import apply_redaction, audit_event, mask_dict
 from ..integrations import partners as svc
 
 
@@ -15,7 +17,9 @@ router = APIRouter(prefix="/integrations/partners", tags=["partners"])
 
 
 @router.get("")
-def list_partners():
+def list_partners(format: Literal["nested", "flat"] = Query(default="nested")):
+    if format == "flat":
+        return svc.list_partners_flat()
     items = svc.list_partners()
     # Deterministic sort by partner_id already applied in service
     return items
@@ -33,16 +37,19 @@ def call_partner(partner_id: str, body: CallBody, db: Session = Depends(get_db))
         ok, resp = svc.call_partner(partner_id, op=body.op, payload=body.payload, idempotency_key=body.idempotency_key)
     except KeyError:
         raise HTTPException(404, "partner not found")
-    # Minimal audit with redaction
+    # Minimal audit with redaction: payload/result always strict, the envelope per
+    # REDACTION_MODE. Built once here (keys sorted like mask_dict) so audit_event
+    # does not walk the already-masked payload and result a second time.
+    red_mode = os.getenv("REDACTION_MODE", "strict")
     try:
         audit_event(
             db,
             actor="api",
             event_type="partners.call",
             request_id=f"{partner_id}:call:{body.op}:{body.idempotency_key or ''}",
-            details={
-                "partner_id": partner_id,
-                "op": body.op,
+            details_redacted={
+                "op": apply_redaction(body.op, mode=red_mode),
+                "partner_id": apply_redaction(partner_id, mode=red_mode),
                 "payload": mask_dict(body.payload or {}, mode="strict"),
                 "result": mask_dict(resp, mode="strict"),
             },
@@ -50,7 +57,7 @@ def call_partner(partner_id: str, body: CallBody, db: Session = Depends(get_db))
     except Exception:
         pass
     if not ok:
-        return JSONResponse(status_code=400, content=resp)
+        return ORJSONResponse(status_code=400, content=resp)
     return resp
 
 
@@ -13,6 +13,19 @@ from ..services.postmortem import PostmortemService
 router = APIRouter(prefix="/postmortems", tags=["postmortems"])
 
 
+# Collection routes are declared before /{run_id} so they are not captured by it
+@router.get("/search")
+def search_postmortems(q: Optional[str] = Query(default=None), tag: Optional[str] = Query(default=None)):
+    svc = PostmortemService()
+    return svc.search(q=q, tag=tag)
+
+
+@router.get("/list")
+def list_postmortems(q: Optional[str] = Query(default=None), tag: Optional[str] = Query(default=None)):
+    svc = PostmortemService()
+    return svc.list(q=q, tag=tag)
+
+
 @router.get("/{run_id}")
 def get_postmortem(run_id: str):
     svc = PostmortemService()
@@ -64,11 +77,3 @@ def ingest_kb_postmortem(run_id: str, db: Session = Depends(get_db)):
     except Exception:
         pass
     return res
-
-
-@router.get("/search")
-def search_postmortems(q: Optional[str] = Query(default=None), tag: Optional[str] = Query(default=None)):
-    svc = PostmortemService()
-    return svc.search(q=q, tag=tag)
-
-
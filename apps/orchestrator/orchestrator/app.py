@@ -1,25 +1,36 @@
 
-from fastapi import FastAPI, HTTPException, Depends, Query
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, HTTPException, Depends, Query, Request, Response, Body
+from fastapi.responses import HTMLResponse, ORJSONResponse
+from sqlalchemy import select, insert, update, and_, or_
 from sqlalchemy.orm import Session
-import uuid, datetime as dt
+import uuid, hashlib, html, re, gzip
+import urllib.parse
+import time
+from email.utils import formatdate, parsedate_to_datetime
 from typing import Optional, List, Dict
+from pydantic import TypeAdapter
 import os
+import asyncio
+import string
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
-from .db import Base, engine, get_db
-from .models import RunDB, Project, RoadmapItem, PRD, DesignCheck, ResearchNote, KbChunk, PullRequest
+from .db import get_db, init_db, SessionLocal, _env_int
+from .models import RunDB, Project, RoadmapItem, KbChunk, PullRequest, utcnow
 from .schemas import (
     RunCreate, RunRead,
     ProjectCreate, ProjectRead, ProjectUpdate,  # NEW
     RoadmapItemCreate, RoadmapItemRead, RoadmapItemUpdate,
-    PRDRead, DesignCheckRead, ResearchNoteRead, DiscoveryStatus,
+    DiscoveryStatus,
     KbIngest, KbSearchResult, GithubVerify, PRRead,
     KbFileIngest,
 )
 from .graph import run_delivery_cycle, ensure_discovery_and_gate
-from .discovery import dor_check, upsert_discovery_artifacts  # ensure import
-from .kb import ingest_text as kb_ingest, search as kb_search
+from .discovery import upsert_discovery_artifacts  # ensure import
+from .discovery import item_with_latest_artifacts, dor_check_from_objs
+from .kb import ingest_text as kb_ingest, search_cached as kb_search_cached
 from .kb import ingest_document, markdown_to_text, pdf_to_text_bytes
+from .list_cache import projects_cache, roadmap_items_cache
 from .integrations.github import verify_repo_access, open_pr_for_run
 from .integrations.github import upsert_pr_summary_comment_for_run
 from .webhooks import router as webhooks_router
@@ -35,25 +46,52 @@ from .blueprints.registry import registry as _bp_registry
 from .integrations.github import ensure_and_update_for_branch_event
 from .integrations.github import approve_pr_for_run, refresh_dor_status_for_run, statuses_for_run, merge_pr_for_run, set_status_for_run
 from .security import audit_event
+from .services.alerts import AlertsService
+from .services.budget import BudgetService
 
-app = FastAPI(title="AI C-suite Orchestrator (Phase 17)")
+# JSON bodies are rendered with orjson (C-backed) instead of stdlib json
+app = FastAPI(title="AI C-suite Orchestrator (Phase 17)", default_response_class=ORJSONResponse)
 
 # --- Startup: ensure tables exist (tolerant if DB not ready yet) ---
-@app.on_event("startup")
-def on_startup():
-    # CI may start app before Postgres is ready. Try briefly, then defer to lazy init in get_db().
-    for _ in range(30):
+_DB_INIT_TASK: Optional[asyncio.Task] = None
+
+async def _init_db_with_backoff() -> None:
+    # CI may start app before Postgres is ready. Retry with exponential backoff off the
+    # event loop; requests that arrive first fall back to the lazy init in get_db().
+    delay = 0.25
+    for _ in range(10):
         try:
-            Base.metadata.create_all(bind=engine)
-            break
+            await asyncio.to_thread(init_db)
+            await asyncio.to_thread(_sweep_orphaned_runs)
+            return
         except Exception:
-            try:
-                import time as _t
-                _t.sleep(1)
-            except Exception:
-                break
-    # Validate and cache blueprint manifests (fail fast on invalid)
-    _bp_registry().load()
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 5.0)
+
+@app.on_event("startup")
+async def on_startup():
+    # Validate and cache blueprint manifests (fail fast on invalid); the registry
+    # singleton loads once on first access, so this does not re-parse manifests.
+    _bp_registry()
+    # Table creation runs in the background so startup (and /healthz) is not held up
+    global _DB_INIT_TASK
+    _DB_INIT_TASK = asyncio.create_task(_init_db_with_backoff())
+
+@app.on_event("startup")
+async def configure_threadpool():
+    # Sync `def` endpoints (all DB handlers) run on anyio's worker threads (default 40).
+    # THREADPOOL_SIZE lets deployments size it alongside the DB connection pool so
+    # concurrent requests are not parked waiting for a thread.
+    raw = os.getenv("THREADPOOL_SIZE", "").strip()
+    if not raw:
+        return
+    try:
+        size = int(raw)
+    except ValueError:
+        return
+    if size > 0:
+        from anyio import to_thread
+        to_thread.current_default_thread_limiter().total_tokens = size
 
 app.include_router(webhooks_router)
 app.include_router(blueprints_router)
@@ -70,11 +108,41 @@ app.include_router(postmortem_router)
 def healthz():
     return {"ok": True}
 
+# ---------- Conditional GET (ETag) ----------
+def _values_etag(values) -> str:
+    h = hashlib.blake2b(digest_size=12)
+    for v in values:
+        h.update(repr(v).encode("utf-8"))
+        h.update(b"\x1f")
+    return f'W/"{h.hexdigest()}"'
+
+def _rows_etag(*rows) -> str:
+    """
+    Weak ETag over the column values of the given ORM rows. Cheap to compute
+    (no Pydantic/JSON encode) and changes on any field update, including PATCH.
+    """
+    return _values_etag(getattr(row, col.key) for row in rows for col in row.__table__.columns)
+
+def _not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Set the ETag header; return a bodiless 304 when If-None-Match matches (weak comparison).
+    """
+    response.headers["ETag"] = etag
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    inm = request.headers.get("if-none-match")
+    if not inm:
+        return False
+    opaque = etag.removeprefix("W/")
+    return any(t == "*" or t.removeprefix("W/") == opaque for t in (t.strip() for t in inm.split(",")))
+
 # ---------- Runs ----------
 @app.post("/runs", response_model=RunRead)
 def create_run(payload: RunCreate, db: Session = Depends(get_db)):
     run_id = str(uuid.uuid4())
-    now = dt.datetime.utcnow()
     db_obj = RunDB(
         id=run_id,
         tenant_id=payload.tenant_id,
@@ -82,19 +150,35 @@ def create_run(payload: RunCreate, db: Session = Depends(get_db)):
         roadmap_item_id=payload.roadmap_item_id,
         phase=payload.phase,
         status="pending",
-        created_at=now,
     )
     db.add(db_obj)
     db.commit()
-    return RunRead(id=run_id, status=db_obj.status, created_at=now)
+    return db_obj
 
-@app.post("/runs/{run_id}/start")
-def start_run(run_id: str, db: Session = Depends(get_db)):
-    run = db.get(RunDB, run_id)
-    if not run:
-        raise HTTPException(404, "run not found")
+@app.post("/runs/batch", response_model=List[RunRead])
+def create_runs_batch(payload: List[RunCreate] = Body(..., max_length=500), db: Session = Depends(get_db)):
+    # One executemany INSERT and one commit for the whole batch; results keep request order
+    now = utcnow()
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "tenant_id": p.tenant_id,
+            "project_id": p.project_id,
+            "roadmap_item_id": p.roadmap_item_id,
+            "phase": p.phase,
+            "status": "pending",
+            "created_at": now,
+        }
+        for p in payload
+    ]
+    if rows:
+        db.execute(insert(RunDB), rows)
+        db.commit()
+    return rows
 
+def _deliver_run(db: Session, run_id: str) -> dict:
     # 1) Auto-ensure discovery & DoR gate (never returns 'missing' just because artifacts didn't exist)
+    run = db.get(RunDB, run_id)
     ok, missing = ensure_discovery_and_gate(db, run)
     if not ok:
         run.status = "blocked"
@@ -114,159 +198,181 @@ def start_run(run_id: str, db: Session = Depends(get_db)):
             resp["pr_skipped"] = pr_info["skipped"]
     return resp
 
+@app.post("/runs/{run_id}/start")
+def start_run(run_id: str, background: bool = Query(False), db: Session = Depends(get_db)):
+    # With ?background=true delivery runs on the graph pool; poll GET /runs/{run_id} for status
+    run = db.get(RunDB, run_id)
+    if not run:
+        raise HTTPException(404, "run not found")
+    if background:
+        # Same atomic claim as graph_start: a run already running (an earlier background
+        # start or a graph pass) is not delivered twice
+        if not _claim_run(db, run_id):
+            raise HTTPException(409, "run is already running")
+        _in_background(_deliver_run, run_id)
+        return _accepted(run_id, poll=f"/runs/{run_id}")
+    return _deliver_run(db, run_id)
+
 @app.get("/runs/{run_id}", response_model=RunRead)
-def get_run(run_id: str, db: Session = Depends(get_db)):
+def get_run(run_id: str, request: Request, response: Response, db: Session = Depends(get_db)):
     db_obj = db.get(RunDB, run_id)
     if not db_obj:
         raise HTTPException(404, "run not found")
-    return RunRead(id=db_obj.id, status=db_obj.status, created_at=db_obj.created_at)
+    return _not_modified(request, response, _rows_etag(db_obj)) or db_obj
 
 @app.get("/runs/{run_id}/pr", response_model=PRRead)
-def get_run_pr(run_id: str, db: Session = Depends(get_db)):
-    row = (
-        db.query(PullRequest)
-        .filter(PullRequest.run_id == run_id)
+def get_run_pr(run_id: str, request: Request, response: Response, db: Session = Depends(get_db)):
+    row = db.execute(
+        select(PullRequest)
+        .where(PullRequest.run_id == run_id)
         .order_by(PullRequest.created_at.desc())
-        .first()
-    )
+        .limit(1)
+    ).scalar_one_or_none()
     if not row:
         raise HTTPException(404, "no PR recorded for this run")
-    return PRRead(
-        id=row.id, run_id=row.run_id, project_id=row.project_id,
-        repo=row.repo, branch=row.branch, number=row.number,
-        url=row.url, state=row.state, created_at=row.created_at
-    )
+    return _not_modified(request, response, _rows_etag(row)) or row
 
 # ---------- Projects ----------
+def _patch_returning(db: Session, model, pk: str, patch):
+    """
+    Apply a partial update in one UPDATE ... RETURNING round-trip.
+    Unset and null fields are left untouched; returns None when the row does not exist.
+    """
+    values = patch.model_dump(exclude_unset=True, exclude_none=True)
+    if not values:
+        return db.get(model, pk)
+    stmt = update(model).where(model.id == pk).values(**values).returning(model)
+    row = db.execute(stmt).scalar_one_or_none()
+    db.commit()
+    return row
+
+# Whole pages are validated from the ORM rows (from_attributes) in one core call; the
+# resulting models outlive the request session, so list_cache can hold them as-is.
+_PROJECT_LIST = TypeAdapter(List[ProjectRead])
+_ROADMAP_ITEM_LIST = TypeAdapter(List[RoadmapItemRead])
+
 @app.post("/projects", response_model=ProjectRead)
 def create_project(payload: ProjectCreate, db: Session = Depends(get_db)):
-    proj = Project(
-        id=str(uuid.uuid4()),
-        tenant_id=payload.tenant_id,
-        name=payload.name,
-        description=payload.description,
-        repo_url=payload.repo_url,
-    )
-    db.add(proj)
+    # Insert-only: a Core INSERT skips the unit of work, and the row we sent is the response
+    row = {
+        "id": str(uuid.uuid4()),
+        "tenant_id": payload.tenant_id,
+        "name": payload.name,
+        "description": payload.description,
+        "repo_url": payload.repo_url,
+        "created_at": utcnow(),
+    }
+    db.execute(insert(Project).values(row))
     db.commit()
-    db.refresh(proj)
-    return ProjectRead(
-        id=proj.id, tenant_id=proj.tenant_id, name=proj.name,
-        description=proj.description, repo_url=proj.repo_url,
-        created_at=proj.created_at,
-    )
+    projects_cache.invalidate()
+    return row
 
 @app.get("/projects", response_model=List[ProjectRead])
-def list_projects(tenant_id: Optional[str] = Query(default=None), db: Session = Depends(get_db)):
-    q = db.query(Project)
-    if tenant_id:
-        q = q.filter(Project.tenant_id == tenant_id)
-    items = q.order_by(Project.created_at.desc()).all()
-    return [ProjectRead(
-        id=p.id, tenant_id=p.tenant_id, name=p.name,
-        description=p.description, repo_url=p.repo_url,
-        created_at=p.created_at
-    ) for p in items]
+def list_projects(
+    tenant_id: Optional[str] = Query(default=None),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None, description="id of the last project from the previous page"),
+    db: Session = Depends(get_db),
+):
+    def load():
+        stmt = select(Project)
+        if tenant_id:
+            stmt = stmt.where(Project.tenant_id == tenant_id)
+        if cursor:
+            last = db.get(Project, cursor)
+            if not last:
+                raise HTTPException(400, "invalid cursor")
+            # Keyset on (created_at DESC, id DESC)
+            stmt = stmt.where(or_(
+                Project.created_at < last.created_at,
+                and_(Project.created_at == last.created_at, Project.id < last.id),
+            ))
+        stmt = stmt.order_by(Project.created_at.desc(), Project.id.desc()).limit(limit)
+        return _PROJECT_LIST.validate_python(db.execute(stmt).scalars().all())
+
+    return projects_cache.get_or_load((tenant_id, limit, cursor), load)
 
 @app.get("/projects/{project_id}", response_model=ProjectRead)
-def get_project(project_id: str, db: Session = Depends(get_db)):
+def get_project(project_id: str, request: Request, response: Response, db: Session = Depends(get_db)):
     p = db.get(Project, project_id)
     if not p:
         raise HTTPException(404, "project not found")
-    return ProjectRead(
-        id=p.id, tenant_id=p.tenant_id, name=p.name,
-        description=p.description, repo_url=p.repo_url,
-        created_at=p.created_at
-    )
+    return _not_modified(request, response, _rows_etag(p)) or p
 
 # NEW: project update
 @app.patch("/projects/{project_id}", response_model=ProjectRead)
 def update_project(project_id: str, patch: ProjectUpdate, db: Session = Depends(get_db)):
-    p = db.get(Project, project_id)
+    p = _patch_returning(db, Project, project_id, patch)
     if not p:
         raise HTTPException(404, "project not found")
-    if patch.name is not None: p.name = patch.name
-    if patch.description is not None: p.description = patch.description
-    if patch.repo_url is not None: p.repo_url = patch.repo_url
-    db.commit()
-    db.refresh(p)
-    return ProjectRead(
-        id=p.id, tenant_id=p.tenant_id, name=p.name,
-        description=p.description, repo_url=p.repo_url, created_at=p.created_at
-    )
+    projects_cache.invalidate()
+    return p
 
 # ---------- Roadmap Items ----------
 @app.post("/roadmap-items", response_model=RoadmapItemRead)
 def create_roadmap_item(payload: RoadmapItemCreate, db: Session = Depends(get_db)):
     if not db.get(Project, payload.project_id):
         raise HTTPException(400, "project_id not found")
-    rm = RoadmapItem(
-        id=str(uuid.uuid4()),
-        tenant_id=payload.tenant_id,
-        project_id=payload.project_id,
-        title=payload.title,
-        description=payload.description,
-        status="planned",
-        priority=payload.priority,
-        target_release=payload.target_release,
-    )
-    db.add(rm)
+    row = {
+        "id": str(uuid.uuid4()),
+        "tenant_id": payload.tenant_id,
+        "project_id": payload.project_id,
+        "title": payload.title,
+        "description": payload.description,
+        "status": "planned",
+        "priority": payload.priority,
+        "target_release": payload.target_release,
+    }
+    db.execute(insert(RoadmapItem).values(row))
     db.commit()
-    db.refresh(rm)
-    return RoadmapItemRead(
-        id=rm.id, tenant_id=rm.tenant_id, project_id=rm.project_id,
-        title=rm.title, description=rm.description, status=rm.status,
-        priority=rm.priority, target_release=rm.target_release
-    )
+    roadmap_items_cache.invalidate()
+    return row
 
 @app.get("/roadmap-items", response_model=List[RoadmapItemRead])
 def list_roadmap_items(
     tenant_id: Optional[str] = Query(default=None),
     project_id: Optional[str] = Query(default=None),
     status: Optional[str] = Query(default=None),
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = Query(default=None, description="id of the last roadmap item from the previous page"),
     db: Session = Depends(get_db),
 ):
-    q = db.query(RoadmapItem)
-    if tenant_id:
-        q = q.filter(RoadmapItem.tenant_id == tenant_id)
-    if project_id:
-        q = q.filter(RoadmapItem.project_id == project_id)
-    if status:
-        q = q.filter(RoadmapItem.status == status)
-    items = q.order_by(RoadmapItem.priority.asc()).all()
-    return [RoadmapItemRead(
-        id=i.id, tenant_id=i.tenant_id, project_id=i.project_id,
-        title=i.title, description=i.description,
-        status=i.status, priority=i.priority, target_release=i.target_release
-    ) for i in items]
+    def load():
+        stmt = select(RoadmapItem)
+        if tenant_id:
+            stmt = stmt.where(RoadmapItem.tenant_id == tenant_id)
+        if project_id:
+            stmt = stmt.where(RoadmapItem.project_id == project_id)
+        if status:
+            stmt = stmt.where(RoadmapItem.status == status)
+        if cursor:
+            last = db.get(RoadmapItem, cursor)
+            if not last:
+                raise HTTPException(400, "invalid cursor")
+            # Keyset on (priority ASC, id ASC)
+            stmt = stmt.where(or_(
+                RoadmapItem.priority > last.priority,
+                and_(RoadmapItem.priority == last.priority, RoadmapItem.id > last.id),
+            ))
+        stmt = stmt.order_by(RoadmapItem.priority.asc(), RoadmapItem.id.asc()).limit(limit)
+        return _ROADMAP_ITEM_LIST.validate_python(db.execute(stmt).scalars().all())
+
+    return roadmap_items_cache.get_or_load((tenant_id, project_id, status, limit, cursor), load)
 
 @app.get("/roadmap-items/{item_id}", response_model=RoadmapItemRead)
-def get_roadmap_item(item_id: str, db: Session = Depends(get_db)):
+def get_roadmap_item(item_id: str, request: Request, response: Response, db: Session = Depends(get_db)):
     i = db.get(RoadmapItem, item_id)
     if not i:
         raise HTTPException(404, "roadmap item not found")
-    return RoadmapItemRead(
-        id=i.id, tenant_id=i.tenant_id, project_id=i.project_id,
-        title=i.title, description=i.description,
-        status=i.status, priority=i.priority, target_release=i.target_release
-    )
+    return _not_modified(request, response, _rows_etag(i)) or i
 
 @app.patch("/roadmap-items/{item_id}", response_model=RoadmapItemRead)
 def update_roadmap_item(item_id: str, patch: RoadmapItemUpdate, db: Session = Depends(get_db)):
-    i = db.get(RoadmapItem, item_id)
+    i = _patch_returning(db, RoadmapItem, item_id, patch)
     if not i:
         raise HTTPException(404, "roadmap item not found")
-    if patch.title is not None: i.title = patch.title
-    if patch.description is not None: i.description = patch.description
-    if patch.status is not None: i.status = patch.status
-    if patch.priority is not None: i.priority = patch.priority
-    db.commit()
-    db.refresh(i)
-    return RoadmapItemRead(
-        id=i.id, tenant_id=i.tenant_id, project_id=i.project_id,
-        title=i.title, description=i.description,
-        status=i.status, priority=i.priority, target_release=i.target_release
-    )
+    roadmap_items_cache.invalidate()
+    return i
 
 # ---------- KB (RAG) ----------
 @app.post("/kb/ingest")
@@ -289,13 +395,58 @@ def kb_search_endpoint(
     k: int = Query(5, ge=1, le=20),
     db: Session = Depends(get_db)
 ):
-    hits = kb_search(db, tenant_id=tenant_id, project_id=project_id, query=q, k=k)
+    hits = kb_search_cached(db, tenant_id, project_id, q, k=k)
     return [KbSearchResult(**h) for h in hits]
 
 # --- Phase 13: File ingestion (markdown, pdf, text) ---
 import base64
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 from typing import Literal
 
+# PDF extraction is CPU-bound; PDF_WORKERS>0 moves it to worker processes so it does not
+# hold the GIL against other handlers. Default (0) extracts inline on the request thread.
+# Read once at import, like the other pool sizes. PDF_TIMEOUT_SECONDS bounds how long a
+# request waits on a worker.
+_PDF_WORKERS = _env_int("PDF_WORKERS", 0)
+_PDF_TIMEOUT_SECONDS = max(1, _env_int("PDF_TIMEOUT_SECONDS", 60))
+_PDF_POOL: Optional[ProcessPoolExecutor] = None
+_PDF_POOL_LOCK = threading.Lock()
+
+def _pdf_pool() -> ProcessPoolExecutor:
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is None:
+            _PDF_POOL = ProcessPoolExecutor(max_workers=_PDF_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _PDF_POOL
+
+def _drop_pdf_pool(pool: ProcessPoolExecutor) -> None:
+    # The next call starts a fresh pool. A worker stuck on a timed-out PDF is not killed;
+    # it exits once that extraction returns.
+    global _PDF_POOL
+    with _PDF_POOL_LOCK:
+        if _PDF_POOL is pool:
+            _PDF_POOL = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _pdf_to_text(pdf_bytes: bytes) -> str:
+    if _PDF_WORKERS <= 0:
+        return pdf_to_text_bytes(pdf_bytes)
+    # A dead worker (OOM, a pypdf crash on a hostile file) breaks the whole pool. Retry once
+    # on a fresh pool; never fall back inline, where the same file could take down the server.
+    for _ in range(2):
+        pool = _pdf_pool()
+        try:
+            return pool.submit(pdf_to_text_bytes, pdf_bytes).result(timeout=_PDF_TIMEOUT_SECONDS)
+        except BrokenProcessPool:
+            _drop_pdf_pool(pool)
+        except FutureTimeoutError:
+            _drop_pdf_pool(pool)
+            raise HTTPException(400, "PDF extraction timed out")
+    raise HTTPException(400, "PDF extraction failed (worker crashed)")
+
 @app.post("/kb/ingest-file")
 def kb_ingest_file_endpoint(payload: KbFileIngest, db: Session = Depends(get_db)):
     # Validate project exists
@@ -313,7 +464,7 @@ def kb_ingest_file_endpoint(payload: KbFileIngest, db: Session = Depends(get_db)
         src = payload.text
         if (not src) and payload.content_b64:
             try:
-                src = base64.b64decode(payload.content_b64.encode("utf-8")).decode("utf-8", errors="ignore")
+                src = base64.b64decode(payload.content_b64).decode("utf-8", errors="ignore")
             except Exception:
                 raise HTTPException(400, "invalid base64 for markdown text")
         if not src:
@@ -324,7 +475,7 @@ def kb_ingest_file_endpoint(payload: KbFileIngest, db: Session = Depends(get_db)
         src = payload.text
         if (not src) and payload.content_b64:
             try:
-                src = base64.b64decode(payload.content_b64.encode("utf-8")).decode("utf-8", errors="ignore")
+                src = base64.b64decode(payload.content_b64).decode("utf-8", errors="ignore")
             except Exception:
                 raise HTTPException(400, "invalid base64 for text")
         if not src:
@@ -335,10 +486,10 @@ def kb_ingest_file_endpoint(payload: KbFileIngest, db: Session = Depends(get_db)
         if not payload.content_b64:
             raise HTTPException(400, "pdf requires content_b64")
         try:
-            pdf_bytes = base64.b64decode(payload.content_b64.encode("utf-8"))
+            pdf_bytes = base64.b64decode(payload.content_b64)
         except Exception:
             raise HTTPException(400, "invalid base64 for pdf")
-        text = pdf_to_text_bytes(pdf_bytes)
+        text = _pdf_to_text(pdf_bytes)
         if not text:
             raise HTTPException(400, "empty or invalid PDF (no extractable text)")
         kind = "file-pdf"
@@ -350,43 +501,27 @@ def kb_ingest_file_endpoint(payload: KbFileIngest, db: Session = Depends(get_db)
     return {"chunks": count, "kind": kind, "ref_id": ref_id, "filename": filename}
 
 # ---------- Discovery status (with related) ----------
+def _discovery_response(ok, missing, prd, design, research, related) -> Response:
+    # Validate once (ORM rows via from_attributes) and serialize straight to JSON bytes.
+    # Returning a Response skips FastAPI's response_model re-validation and encoding;
+    # response_model stays on the routes for the OpenAPI schema.
+    status = DiscoveryStatus.model_validate({
+        "dor_pass": ok, "missing": missing,
+        "prd": prd, "design": design, "research": research,
+        "related": related,
+    })
+    return Response(content=status.model_dump_json(), media_type="application/json")
+
 @app.get("/roadmap-items/{item_id}/discovery", response_model=DiscoveryStatus)
 def discovery_status(item_id: str, db: Session = Depends(get_db)):
-    item = db.get(RoadmapItem, item_id)
+    item, prd, design, research = item_with_latest_artifacts(db, item_id)
     if not item:
         raise HTTPException(404, "roadmap item not found")
-    ok, missing, details = dor_check(db, item.tenant_id, item.project_id, item_id)
-
-    prd = db.get(PRD, details.get("prd_id")) if "prd_id" in details else None
-    design = db.get(DesignCheck, details.get("design_id")) if "design_id" in details else None
-    research = db.get(ResearchNote, details.get("research_id")) if "research_id" in details else None
-
-    related = kb_search(db, item.tenant_id, item.project_id, f"{item.title}", k=5)
-
-    prd_read = PRDRead(
-        id=prd.id, tenant_id=prd.tenant_id, project_id=prd.project_id,
-        roadmap_item_id=prd.roadmap_item_id, version=prd.version,
-        prd=prd.prd_json, created_at=prd.created_at
-    ) if prd else None
-
-    design_read = DesignCheckRead(
-        id=design.id, tenant_id=design.tenant_id, project_id=design.project_id,
-        roadmap_item_id=design.roadmap_item_id, passes=design.passes,
-        heuristics_score=design.heuristics_score, a11y_notes=design.a11y_notes,
-        created_at=design.created_at
-    ) if design else None
-
-    research_read = ResearchNoteRead(
-        id=research.id, tenant_id=research.tenant_id, project_id=research.project_id,
-        roadmap_item_id=research.roadmap_item_id, summary=research.summary,
-        evidence=research.evidence, created_at=research.created_at
-    ) if research else None
-
-    return DiscoveryStatus(
-        dor_pass=ok, missing=missing,
-        prd=prd_read, design=design_read, research=research_read,
-        related=[KbSearchResult(**r) for r in related]
-    )
+    ok, missing, _ = dor_check_from_objs(prd, design, research)
+
+    related = kb_search_cached(db, item.tenant_id, item.project_id, f"{item.title}", k=5)
+
+    return _discovery_response(ok, missing, prd, design, research, related)
 
 # NEW: discovery ensure endpoint (idempotent; may create artifacts)
 @app.post("/roadmap-items/{item_id}/discovery/ensure", response_model=DiscoveryStatus)
@@ -395,40 +530,15 @@ def discovery_ensure(item_id: str, force: bool = Query(False), db: Session = Dep
     if not item:
         raise HTTPException(404, "roadmap item not found")
 
-    # ensure artifacts exist (or refresh if force)
-    upsert_discovery_artifacts(db, item.tenant_id, item.project_id, item_id, force=force)
+    # ensure artifacts exist (or refresh if force); returns the current latest rows
+    res = upsert_discovery_artifacts(db, item.tenant_id, item.project_id, item_id, force=force)
 
     # recompute DoR and related
-    ok, missing, details = dor_check(db, item.tenant_id, item.project_id, item_id)
-    prd = db.get(PRD, details.get("prd_id")) if "prd_id" in details else None
-    design = db.get(DesignCheck, details.get("design_id")) if "design_id" in details else None
-    research = db.get(ResearchNote, details.get("research_id")) if "research_id" in details else None
-    related = kb_search(db, item.tenant_id, item.project_id, f"{item.title}", k=5)
-
-    prd_read = PRDRead(
-        id=prd.id, tenant_id=prd.tenant_id, project_id=prd.project_id,
-        roadmap_item_id=prd.roadmap_item_id, version=prd.version,
-        prd=prd.prd_json, created_at=prd.created_at
-    ) if prd else None
-
-    design_read = DesignCheckRead(
-        id=design.id, tenant_id=design.tenant_id, project_id=design.project_id,
-        roadmap_item_id=design.roadmap_item_id, passes=design.passes,
-        heuristics_score=design.heuristics_score, a11y_notes=design.a11y_notes,
-        created_at=design.created_at
-    ) if design else None
-
-    research_read = ResearchNoteRead(
-        id=research.id, tenant_id=research.tenant_id, project_id=research.project_id,
-        roadmap_item_id=research.roadmap_item_id, summary=research.summary,
-        evidence=research.evidence, created_at=research.created_at
-    ) if research else None
-
-    return DiscoveryStatus(
-        dor_pass=ok, missing=missing,
-        prd=prd_read, design=design_read, research=research_read,
-        related=[KbSearchResult(**r) for r in related]
-    )
+    prd, design, research = res["artifacts"]
+    ok, missing, _ = dor_check_from_objs(prd, design, research)
+    related = kb_search_cached(db, item.tenant_id, item.project_id, f"{item.title}", k=5)
+
+    return _discovery_response(ok, missing, prd, design, research, related)
 
 # ---------- GitHub integration ----------
 @app.post("/integrations/github/verify")
@@ -479,10 +589,7 @@ def github_pr_approve(run_id: str, db: Session = Depends(get_db)):
     res = approve_pr_for_run(db, run_id)
     if "error" in res or "skipped" in res:
         raise HTTPException(400, res.get("error") or res.get("skipped"))
-    try:
-        audit_event(db, actor="api", event_type="github.approve", run_id=run_id, request_id=f"{run_id}:gh:approve", details={"result": res})
-    except Exception:
-        pass
+    # approve_pr_for_run already recorded the github.approve audit event
     # return updated status summary
     return statuses_for_run(db, run_id)
 
@@ -505,10 +612,7 @@ def github_pr_merge(run_id: str, method: str = Query("squash"), db: Session = De
         raise HTTPException(400, f"merge blocked: {res.get('reason')}")
     if "error" in res or "skipped" in res:
         raise HTTPException(400, res.get("error") or res.get("skipped"))
-    try:
-        audit_event(db, actor="api", event_type="github.merge", run_id=run_id, request_id=f"{run_id}:gh:merge", details={"method": method, "result": res})
-    except Exception:
-        pass
+    # merge_pr_for_run commits the github.merge audit event with the PR state
     return res
 
 @app.post("/integrations/github/pr/{run_id}/comment/refresh")
@@ -518,25 +622,6 @@ def github_pr_comment_refresh(run_id: str, db: Session = Depends(get_db)):
         raise HTTPException(400, res.get("error") or res.get("skipped"))
     return res
 
-@app.patch("/roadmap-items/{item_id}", response_model=RoadmapItemRead)
-def update_roadmap_item(item_id: str, patch: RoadmapItemUpdate, db: Session = Depends(get_db)):
-    i = db.get(RoadmapItem, item_id)
-    if not i:
-        raise HTTPException(404, "roadmap item not found")
-    if patch.title is not None: i.title = patch.title
-    if patch.description is not None: i.description = patch.description
-    if patch.status is not None: i.status = patch.status
-    if patch.priority is not None: i.priority = patch.priority
-    db.commit()
-    db.refresh(i)
-    return RoadmapItemRead(
-        id=i.id, tenant_id=i.tenant_id, project_id=i.project_id,
-        title=i.title, description=i.description,
-        status=i.status, priority=i.priority, target_release=i.target_release
-    )
-
-
-
 # --------- Phase 10: LangGraph run endpoints ---------
 class GraphStartBody(BaseModel):
     force_qa_fail: bool = False
@@ -544,36 +629,94 @@ class GraphStartBody(BaseModel):
     inject_failures: Dict[str, int] = {}
     stop_after: Optional[str] = None
 
+# Opt-in background execution (?background=true) for run start and graph start/resume. Threads, not
+# processes: graph state is kept in-process (_GRAPH_STATE) and read back by /graph/state.
+_GRAPH_POOL = ThreadPoolExecutor(
+    max_workers=max(1, _env_int("GRAPH_WORKERS", 2)),
+    thread_name_prefix="graph",
+)
+
+def _mark_run_partial(db: Session, run_id: str) -> None:
+    # mark run as partial on failure (retry exhausted or unexpected error)
+    try:
+        run = db.get(RunDB, run_id)
+        if run:
+            run.status = "partial"
+            db.commit()
+    except Exception:
+        db.rollback()
+
+def _claim_run(db: Session, run_id: str) -> bool:
+    # One conditional UPDATE, so two concurrent starts cannot both pass a read-then-write check
+    res = db.execute(
+        update(RunDB).where(RunDB.id == run_id, RunDB.status != "running").values(status="running")
+    )
+    db.commit()
+    return res.rowcount == 1
+
+def _sweep_orphaned_runs() -> int:
+    # Passes live in this process (_GRAPH_POOL or a request thread), so a run still "running" at
+    # boot lost its job to a restart, redeploy or OOM. Marking it partial lets graph/resume or a
+    # new start pick it up. uvicorn boots all workers together; a worker respawned on its own may
+    # also sweep a sibling's live run, which that sibling's final status write then overwrites.
+    with SessionLocal() as db:
+        res = db.execute(update(RunDB).where(RunDB.status == "running").values(status="partial"))
+        db.commit()
+        return res.rowcount
+
+def _in_background(fn, run_id: str, *args) -> None:
+    # Each background job owns its session; failures surface via run status + history
+    def _job() -> None:
+        db = SessionLocal()
+        try:
+            fn(db, run_id, *args)
+        except Exception:
+            _mark_run_partial(db, run_id)
+        finally:
+            db.close()
+    _GRAPH_POOL.submit(_job)
+
+def _accepted(run_id: str, poll: Optional[str] = None) -> ORJSONResponse:
+    return ORJSONResponse(
+        status_code=202,
+        content={"run_id": run_id, "status": "accepted", "poll": poll or f"/runs/{run_id}/graph/state"},
+    )
+
+def _start_graph(db: Session, run_id: str, body: GraphStartBody):
+    return start_graph_run(
+        db,
+        run_id,
+        force_qa_fail=body.force_qa_fail,
+        max_qa_loops=body.max_qa_loops,
+        inject_failures=body.inject_failures,
+        stop_after=body.stop_after,
+    )
+
 @app.post("/runs/{run_id}/graph/start")
-def graph_start(run_id: str, body: GraphStartBody, db: Session = Depends(get_db)):
+def graph_start(run_id: str, body: GraphStartBody, background: bool = Query(False), db: Session = Depends(get_db)):
     # Runs a full graph pass synchronously (stub LLMs). Returns final state.
+    # With ?background=true the pass runs on the graph pool and 202 is returned immediately.
     # Pre-checks for clearer errors and to avoid misclassifying downstream ValueErrors
     run = db.get(RunDB, run_id)
     if not run:
         raise HTTPException(404, "run not found")
     if not run.roadmap_item_id:
         raise HTTPException(400, "run has no roadmap_item_id")
+    # A pass already in flight (e.g. an earlier ?background=true call) owns this run
+    if not _claim_run(db, run_id):
+        raise HTTPException(409, "run is already running")
+    if background:
+        _in_background(_start_graph, run_id, body)
+        return _accepted(run_id)
     try:
-        result = start_graph_run(
-            db,
-            run_id,
-            force_qa_fail=body.force_qa_fail,
-            max_qa_loops=body.max_qa_loops,
-            inject_failures=body.inject_failures,
-            stop_after=body.stop_after,
-        )
+        result = _start_graph(db, run_id, body)
     except ValueError as e:
-        # Treat unexpected ValueErrors during execution as bad request
+        # Treat unexpected ValueErrors during execution as bad request; like the
+        # background path, the run is marked partial rather than left running
+        _mark_run_partial(db, run_id)
         raise HTTPException(400, str(e))
     except Exception as e:
-        # mark run as partial on failure (retry exhausted or unexpected error)
-        try:
-            run = db.get(RunDB, run_id)
-            if run:
-                run.status = "partial"
-                db.commit()
-        except Exception:
-            db.rollback()
+        _mark_run_partial(db, run_id)
         last = repo_get_last(db, run_id)
         failed_step = last.step_name if last else "unknown"
         attempts = last.attempt if last else 3
@@ -611,7 +754,11 @@ def graph_state(run_id: str, db: Session = Depends(get_db)):
     except Exception:
         pass
     if not state:
-        raise HTTPException(404, "no graph state recorded for this run")
+        # Background passes are polled here before their first node has recorded state
+        run = db.get(RunDB, run_id)
+        if not run:
+            raise HTTPException(404, "run not found")
+        return {"run_id": run_id, "status": run.status}
     return state
 
 # --------- Phase 11: resume + history ---------
@@ -619,8 +766,27 @@ class GraphResumeBody(BaseModel):
     inject_failures: Dict[str, int] = {}
     stop_after: Optional[str] = None
 
+def _resume_graph(db: Session, run_id: str, state):
+    app_graph = build_graph(db)
+    result = app_graph.invoke(state, config={"configurable": {"thread_id": run_id}})
+    # Update in-memory state for visibility
+    try:
+        set_graph_state(run_id, result)
+    except Exception:
+        pass
+    # Update DB run status based on result
+    try:
+        run = db.get(RunDB, run_id)
+        hist2 = result.get("history", [])
+        is_completed = len(hist2) > 0 and hist2[-1] == "release"
+        run.status = "succeeded" if is_completed else "paused"
+        db.commit()
+    except Exception:
+        db.rollback()
+    return result
+
 @app.post("/runs/{run_id}/graph/resume")
-def graph_resume(run_id: str, body: GraphResumeBody, db: Session = Depends(get_db)):
+def graph_resume(run_id: str, body: GraphResumeBody, background: bool = Query(False), db: Session = Depends(get_db)):
     # Load last persisted state and resume execution from next step
     run = db.get(RunDB, run_id)
     if not run:
@@ -656,18 +822,14 @@ def graph_resume(run_id: str, body: GraphResumeBody, db: Session = Depends(get_d
     # Transition to running for this resume pass
     run.status = "running"
     db.commit()
-    app_graph = build_graph(db)
+    if background:
+        _in_background(_resume_graph, run_id, state)
+        return _accepted(run_id)
     try:
-        result = app_graph.invoke(state, config={"configurable": {"thread_id": run_id}})
+        result = _resume_graph(db, run_id, state)
     except Exception as e:
         # mark run as partial on failure during resume
-        try:
-            run = db.get(RunDB, run_id)
-            if run:
-                run.status = "partial"
-                db.commit()
-        except Exception:
-            db.rollback()
+        _mark_run_partial(db, run_id)
         last = repo_get_last(db, run_id)
         failed_step = last.step_name if last else "unknown"
         attempts = last.attempt if last else 3
@@ -679,19 +841,6 @@ def graph_resume(run_id: str, body: GraphResumeBody, db: Session = Depends(get_d
             "error": str(e),
         }
         raise HTTPException(400, detail=detail)
-    # Update in-memory state for visibility
-    try:
-        set_graph_state(run_id, result)
-    except Exception:
-        pass
-    # Update DB run status based on result
-    try:
-        hist2 = result.get("history", [])
-        is_completed = len(hist2) > 0 and hist2[-1] == "release"
-        run.status = "succeeded" if is_completed else "paused"
-        db.commit()
-    except Exception:
-        db.rollback()
     return {
         "run_id": run_id,
         "status": "completed",
@@ -702,8 +851,15 @@ def graph_resume(run_id: str, body: GraphResumeBody, db: Session = Depends(get_d
     }
 
 @app.get("/runs/{run_id}/graph/history")
-def graph_history(run_id: str, db: Session = Depends(get_db)):
+def graph_history(run_id: str, request: Request, response: Response, db: Session = Depends(get_db)):
     hist = repo_get_history(db, run_id)
+    etag = _values_etag(tuple(h.values()) for h in hist)
+    not_modified = _not_modified(request, response, etag)
+    if not_modified:
+        return not_modified
+    return _history_payload(hist)
+
+def _history_payload(hist: list[dict]) -> list[dict]:
     return [
         {
             "step_index": h["step_index"],
@@ -726,34 +882,174 @@ def graph_metrics(run_id: str, db: Session = Depends(get_db)):
         raise HTTPException(404, "run not found")
     return compute_run_metrics(db, run_id)
 
+@app.get("/runs/{run_id}/cockpit")
+def run_cockpit(run_id: str, db: Session = Depends(get_db)):
+    """
+    Everything the run cockpit page shows, in one round-trip on one session.
+    Each panel degrades to {"error": ...} on its own, mirroring the
+    standalone endpoints, so one failing section does not blank the page.
+    """
+    run = db.get(RunDB, run_id)
+    if not run:
+        raise HTTPException(404, "run not found")
+
+    def section(fn):
+        try:
+            return fn()
+        except Exception as e:
+            # Sections share this session; on Postgres a failed query aborts its transaction
+            # until rolled back, which would fail every later section too
+            db.rollback()
+            return {"error": str(e)}
+
+    def pr():
+        res = statuses_for_run(db, run_id)
+        if "error" in res or "skipped" in res:
+            return {"error": res.get("error") or res.get("skipped")}
+        return res
+
+    return {
+        "run": {"id": run.id, "status": run.status, "created_at": run.created_at},
+        "pr": section(pr),
+        "history": section(lambda: _history_payload(repo_get_history(db, run_id))),
+        "metrics": section(lambda: compute_run_metrics(db, run_id)),
+        "budget": section(lambda: BudgetService().get(db, run_id)),
+        "alerts": section(lambda: AlertsService().get_snapshot(db, run_id)),
+    }
+
 
 # --------- Phase 16: Minimal Founder Cockpit UI ---------
 def _github_write_enabled() -> bool:
+    return os.getenv("GITHUB_WRITE_ENABLED", "1").strip().lower() not in {"0", "false", "no"}
+
+
+def _minify_html(src: str) -> str:
+    """
+    Strip indentation, blank lines, HTML comments and whole-line // comments.
+    Newlines are kept so inline scripts never depend on semicolon insertion
+    across a joined line. UI_DEV=1 serves the pages as written.
+    """
+    if os.getenv("UI_DEV", "0").strip().lower() in {"1", "true", "yes"}:
+        return src
+    src = re.sub(r"<!--.*?-->", "", src, flags=re.S)
+    lines = (line.strip() for line in src.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+def _html_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=8).hexdigest() + '"'
+
+
+# Static pages are immutable for the life of the process, so their validator
+# timestamp is the moment the module was imported
+_UI_LAST_MODIFIED_TS = int(time.time())
+_UI_LAST_MODIFIED = formatdate(_UI_LAST_MODIFIED_TS, usegmt=True)
+
+
+def _not_modified_since(request: Request, last_modified_ts: int) -> bool:
+    # Only consulted without If-None-Match (RFC 9110 13.2.2)
+    if request.headers.get("if-none-match"):
+        return False
+    ims = request.headers.get("if-modified-since")
+    if not ims:
+        return False
     try:
-        val = os.getenv("GITHUB_WRITE_ENABLED", "1").strip().lower()
-    except Exception:
-        val = "1"
-    return val not in {"0", "false", "no"}
+        return int(parsedate_to_datetime(ims).timestamp()) >= last_modified_ts
+    except (TypeError, ValueError):
+        return False
+
+
+def _gzip_page(body: bytes) -> bytes:
+    # mtime=0 keeps the compressed bytes (and so their ETag) stable across restarts
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+
+def _accepts_gzip(request: Request) -> bool:
+    for part in request.headers.get("accept-encoding", "").split(","):
+        coding, _, params = part.partition(";")
+        if coding.strip().lower() in {"gzip", "*"}:
+            q = params.strip().lower()
+            return not (q.startswith("q=") and q[2:].strip() in {"0", "0.0", "0.00", "0.000"})
+    return False
+
+
+def _html_response(
+    request: Request,
+    body: bytes,
+    etag: str,
+    cache_control: str = "public, max-age=60",
+    last_modified: bool = False,
+    gz: bytes | None = None,
+    media_type: str = "text/html",
+) -> Response:
+    """
+    Serve a pre-encoded page (HTML unless media_type says otherwise) with its ETag;
+    bodiless 304 when If-None-Match matches.
+    Parameterized pages pass cache_control="no-cache" so browsers always revalidate.
+    Static pages pass last_modified=True to also honor If-Modified-Since.
+    When a precompressed gz body is given and the client accepts gzip it is sent
+    as-is under its own ETag, so nothing is compressed per request.
+    """
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if gz is not None:
+        headers["Vary"] = "Accept-Encoding"
+        if _accepts_gzip(request):
+            body = gz
+            etag = headers["ETag"] = etag[:-1] + '-gz"'
+            headers["Content-Encoding"] = "gzip"
+    if last_modified:
+        headers["Last-Modified"] = _UI_LAST_MODIFIED
+    if _etag_matches(request, etag) or (last_modified and _not_modified_since(request, _UI_LAST_MODIFIED_TS)):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
+# Rules every cockpit page shares; pages keep only their overrides inline
+_COCKPIT_CSS: bytes = _minify_html("""
+    body { font-family: -apple-system, BlinkMacSystemFont, Segoe UI, Roboto, Helvetica, Arial, sans-serif; margin: 24px; color: #111; }
+    h1 { margin: 0 0 12px 0; }
+    .muted { color: #6b7280; font-size: 12px; }
+    .card { border: 1px solid #e5e7eb; border-radius: 8px; padding: 12px; }
+    .row { display: flex; gap: 8px; align-items: center; flex-wrap: wrap; }
+    table { border-collapse: collapse; width: 100%; }
+    th, td { border: 1px solid #e5e7eb; padding: 6px 8px; text-align: left; }
+    button { padding: 8px 12px; border: 1px solid #d1d5db; background: #f9fafb; border-radius: 6px; cursor: pointer; }
+    button:hover { background: #f3f4f6; }
+    button[disabled] { opacity: 0.5; cursor: not-allowed; }
+    """).encode("utf-8")
+_COCKPIT_CSS_ETAG = _html_etag(_COCKPIT_CSS)
+_COCKPIT_CSS_GZ = _gzip_page(_COCKPIT_CSS)
+# Content-versioned URL, so the stylesheet can be cached long-term and still change on deploy
+_COCKPIT_CSS_LINK = '<link rel="stylesheet" href="/ui/static/cockpit.css?v=' + _COCKPIT_CSS_ETAG.strip('"') + '" />'
+
+
+@app.get("/ui/static/cockpit.css")
+def ui_cockpit_css(request: Request):
+    return _html_response(
+        request,
+        _COCKPIT_CSS,
+        _COCKPIT_CSS_ETAG,
+        cache_control="public, max-age=604800",
+        last_modified=True,
+        gz=_COCKPIT_CSS_GZ,
+        media_type="text/css",
+    )
 
 
-@app.get("/ui", response_class=HTMLResponse)
-def ui_index():
-    # Minimal landing page with nav to run view
-    html = f"""
+# Static pages are built and encoded once at import and served as-is per request
+_UI_INDEX_HTML: bytes = _minify_html("""
     <!doctype html>
     <html lang=\"en\">
     <head>
       <meta charset=\"utf-8\" />
       <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
       <title>Founder Cockpit · AI‑CSuite</title>
+      """ + _COCKPIT_CSS_LINK + """
       <style>
-        body {{ font-family: -apple-system, BlinkMacSystemFont, Segoe UI, Roboto, Helvetica, Arial, sans-serif; margin: 24px; color: #111; }}
-        h1 {{ margin-top: 0; }}
-        .card {{ border: 1px solid #e5e7eb; border-radius: 8px; padding: 16px; max-width: 720px; }}
-        .row {{ display: flex; gap: 8px; align-items: center; }}
-        input[type=text] {{ padding: 8px 10px; border: 1px solid #d1d5db; border-radius: 6px; width: 360px; }}
-        button {{ padding: 8px 12px; border: 1px solid #d1d5db; background: #f9fafb; border-radius: 6px; cursor: pointer; }}
-        button:hover {{ background: #f3f4f6; }}
+        h1 { margin: 0 0 0.67em 0; }
+        .card { padding: 16px; max-width: 720px; }
+        .row { flex-wrap: nowrap; }
+        input[type=text] { padding: 8px 10px; border: 1px solid #d1d5db; border-radius: 6px; width: 360px; }
       </style>
     </head>
     <body>
@@ -771,36 +1067,35 @@ def ui_index():
         <p style=\"margin-top:8px;\">Example: <code>/ui/run/&lt;run_id&gt;</code></p>
       </div>
       <script>
-        document.getElementById('goBtn').addEventListener('click', function() {{
+        document.getElementById('goBtn').addEventListener('click', function() {
           var v = document.getElementById('runId').value.trim();
           if (v) window.location.href = '/ui/run/' + encodeURIComponent(v);
-        }});
+        });
       </script>
     </body>
     </html>
-    """
-    return HTMLResponse(content=html)
+    """).encode("utf-8")
+_UI_INDEX_ETAG = _html_etag(_UI_INDEX_HTML)
+_UI_INDEX_GZ = _gzip_page(_UI_INDEX_HTML)
 
 
-@app.get("/ui/integrations", response_class=HTMLResponse)
-def ui_integrations():
-    # Minimal deterministic UI for partner integrations
-    html = """
+@app.get("/ui", response_class=HTMLResponse)
+def ui_index(request: Request):
+    # Minimal landing page with nav to run view
+    return _html_response(request, _UI_INDEX_HTML, _UI_INDEX_ETAG, last_modified=True, gz=_UI_INDEX_GZ)
+
+
+_UI_INTEGRATIONS_HTML: bytes = _minify_html("""
     <!doctype html>
     <html lang=\"en\">
     <head>
       <meta charset=\"utf-8\" />
       <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
       <title>Founder Cockpit · Integrations</title>
+      """ + _COCKPIT_CSS_LINK + """
       <style>
-        body { font-family: -apple-system, BlinkMacSystemFont, Segoe UI, Roboto, Helvetica, Arial, sans-serif; margin: 24px; color: #111; }
-        h1 { margin: 0 0 12px 0; }
-        table { border-collapse: collapse; width: 100%; max-width: 900px; }
-        th, td { border: 1px solid #e5e7eb; padding: 6px 8px; text-align: left; }
-        .row { display: flex; gap: 8px; align-items: center; flex-wrap: wrap; margin: 8px 0; }
-        .muted { color: #6b7280; font-size: 12px; }
-        button { padding: 8px 12px; border: 1px solid #d1d5db; background: #f9fafb; border-radius: 6px; cursor: pointer; }
-        button:hover { background: #f3f4f6; }
+        table { max-width: 900px; }
+        .row { margin: 8px 0; }
         input[type=text] { padding: 6px 8px; border: 1px solid #d1d5db; border-radius: 6px; }
       </style>
     </head>
@@ -808,8 +1103,8 @@ def ui_integrations():
       <a href=\"/ui\" class=\"muted\">← Back</a>
       <h1>Partners</h1>
       <div class=\"row\">
-        <button id=\"refreshBtn\">Refresh</button>
-        <button id=\"tickBtn\">Tick</button>
+        <button data-action=\"refresh\" id=\"refreshBtn\">Refresh</button>
+        <button data-action=\"tick\" id=\"tickBtn\">Tick</button>
         <span id=\"msg\" class=\"muted\"></span>
       </div>
       <table>
@@ -827,31 +1122,31 @@ def ui_integrations():
         <input id=\"payload\" type=\"text\" value=\"{\\\"payload\\\":\\\"hi\\\"}\" />
         <label class=\"muted\">idempotency_key</label>
         <input id=\"ikey\" type=\"text\" />
-        <button id=\"callBtn\">Call</button>
+        <button data-action=\"call\" id=\"callBtn\">Call</button>
       </div>
       <pre id=\"out\" class=\"muted\" style=\"white-space:pre-wrap;\"></pre>
       <script>
       (function() {
         function setText(id, txt) { var el = document.getElementById(id); if (el) el.textContent = txt; }
+        function esc(v) { return v == null ? '' : String(v).replace(/[&<>"]/g, function(c) { return {'&':'&amp;','<':'&lt;','>':'&gt;','"':'&quot;'}[c]; }); }
+        function rowHtml(cols) { return '<tr><td>' + cols.map(esc).join('</td><td>') + '</td></tr>'; }
+        // Column order of the flat rows served by /integrations/partners?format=flat
+        var PARTNER_COLS = ['partner_id', 'circuit_state', 'rate_remaining', 'calls', 'retries', 'failures', 'deduped'];
         function render(list) {
-          var tb = document.getElementById('tbody');
-          tb.innerHTML='';
-          var items = Array.isArray(list) ? list.slice() : [];
-          // deterministic order guaranteed from API; iterate in order
-          items.forEach(function(it) {
-            var tr = document.createElement('tr');
-            var cols = [it.partner_id, it.state.circuit_state, String(it.state.rate_remaining), String(it.counters.calls), String(it.counters.retries), String(it.counters.failures), String(it.counters.deduped)];
-            cols.forEach(function(text){ var td = document.createElement('td'); td.textContent = text; tr.appendChild(td); });
-            tb.appendChild(tr);
-          });
+          var items = Array.isArray(list) ? list : [];
+          // deterministic order guaranteed from API; one innerHTML write per render
+          document.getElementById('tbody').innerHTML = items.map(function(it) {
+            return rowHtml(PARTNER_COLS.map(function(k) { return it[k]; }));
+          }).join('');
         }
-        function refresh() { fetch('/integrations/partners').then(r => r.json()).then(render).catch(function() { setText('msg','Load error'); }); }
-        document.getElementById('refreshBtn').addEventListener('click', refresh);
-        document.getElementById('tickBtn').addEventListener('click', function() {
+        function refresh() { fetch('/integrations/partners?format=flat').then(r => r.json()).then(render).catch(function() { setText('msg','Load error'); }); }
+        var actions = {};
+        actions.refresh = refresh;
+        actions.tick = function() {
           setText('msg','Ticking…');
           fetch('/integrations/partners/tick', { method: 'POST' }).then(r => r.json()).then(function() { setText('msg','Ticked'); refresh(); }).catch(function() { setText('msg','Tick failed'); });
-        });
-        document.getElementById('callBtn').addEventListener('click', function() {
+        };
+        actions.call = function() {
           var pid = document.getElementById('pid').value.trim();
           var op = document.getElementById('op').value.trim();
           var payloadText = document.getElementById('payload').value.trim();
@@ -867,54 +1162,51 @@ def ui_integrations():
               setText('msg', res.status === 200 ? 'OK' : 'Error');
               refresh();
             }).catch(function() { setText('msg','Call failed'); });
+        };
+        // One delegated listener; buttons name their handler via data-action
+        document.addEventListener('click', function(e) {
+          var el = e.target.closest('[data-action]');
+          if (el && !el.disabled && actions[el.dataset.action]) actions[el.dataset.action](e);
         });
         refresh();
       })();
       </script>
     </body>
     </html>
-    """
-    return HTMLResponse(content=html)
-@app.get("/ui/blueprints", response_class=HTMLResponse)
-def ui_blueprints():
-    # Deterministic create-from-blueprint page; client fetches existing endpoints only
-    write_enabled = _github_write_enabled()
-    dry_banner = "" if write_enabled else "<div id=\"dry\" style=\"background:#fff7ed;border:1px solid #fdba74;color:#9a3412;padding:8px 12px;border-radius:6px;margin:0 0 12px 0;\">Dry‑run: GitHub writes disabled (GITHUB_WRITE_ENABLED=0). Owner/Repo optional.</div>"
-    try:
-        items = _bp_registry().list()
-    except Exception:
-        items = []
-    ids = sorted([getattr(b, "id", str(b)) for b in items])
-    options_html = "".join([f"<option value=\"{bid}\">{bid}</option>" for bid in ids])
-    html = f"""
+    """).encode("utf-8")
+_UI_INTEGRATIONS_ETAG = _html_etag(_UI_INTEGRATIONS_HTML)
+_UI_INTEGRATIONS_GZ = _gzip_page(_UI_INTEGRATIONS_HTML)
+
+@app.get("/ui/integrations", response_class=HTMLResponse)
+def ui_integrations(request: Request):
+    # Minimal deterministic UI for partner integrations
+    return _html_response(request, _UI_INTEGRATIONS_HTML, _UI_INTEGRATIONS_ETAG, last_modified=True, gz=_UI_INTEGRATIONS_GZ)
+
+
+# Per-request values are substituted into a template compiled once at import
+_UI_BLUEPRINTS_TMPL = string.Template(_minify_html("""
     <!doctype html>
     <html lang=\"en\">
     <head>
       <meta charset=\"utf-8\" />
       <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
       <title>Founder Cockpit · Create from Blueprint</title>
+      """ + _COCKPIT_CSS_LINK + """
       <style>
-        body {{ font-family: -apple-system, BlinkMacSystemFont, Segoe UI, Roboto, Helvetica, Arial, sans-serif; margin: 24px; color: #111; }}
-        h1 {{ margin: 0 0 12px 0; }}
-        .card {{ border: 1px solid #e5e7eb; border-radius: 8px; padding: 12px; max-width: 760px; }}
-        .row {{ display: flex; gap: 8px; align-items: center; flex-wrap: wrap; }}
-        label {{ font-size: 12px; color: #374151; display:block; margin: 8px 0 4px 0; }}
-        select, input[type=text] {{ padding: 8px 10px; border: 1px solid #d1d5db; border-radius: 6px; min-width: 240px; }}
-        button {{ padding: 8px 12px; border: 1px solid #d1d5db; background: #f9fafb; border-radius: 6px; cursor: pointer; }}
-        button:hover {{ background: #f3f4f6; }}
-        button[disabled] {{ opacity: 0.5; cursor: not-allowed; }}
-        .muted {{ color: #6b7280; font-size: 12px; }}
+        .card { max-width: 760px; }
+        label { font-size: 12px; color: #374151; display:block; margin: 8px 0 4px 0; }
+        select, input[type=text] { padding: 8px 10px; border: 1px solid #d1d5db; border-radius: 6px; min-width: 240px; }
       </style>
     </head>
     <body>
       <a href=\"/ui\" class=\"muted\">← Back</a>
       <h1>Create from Blueprint</h1>
-      {dry_banner}
+      ${dry_banner}
       <div class=\"card\">
         <div class=\"row\" style=\"margin-bottom:8px;\">
           <div>
             <label for=\"bpSelect\">Blueprint</label>
-            <select id=\"bpSelect\">{options_html}</select>
+            <select id=\"bpSelect\">${options_html}</select>
           </div>
           <div>
             <label for=\"owner\">Target Owner</label>
@@ -937,82 +1229,88 @@ def ui_blueprints():
       </div>
 
       <script>
-      (function() {{
+      (function() {
         var sel = document.getElementById('bpSelect');
         var msg = document.getElementById('msg');
         var out = document.getElementById('result');
-        function loadBlueprints() {{
-          fetch('/blueprints').then(r => r.json()).then(list => {{
+        function loadBlueprints() {
+          fetch('/blueprints').then(r => r.json()).then(list => {
             if (!Array.isArray(list)) list = [];
-            list.sort(function(a,b) {{ return String(a.id).localeCompare(String(b.id)); }});
+            list.sort(function(a,b) { return String(a.id).localeCompare(String(b.id)); });
             sel.innerHTML = '';
-            list.forEach(function(b) {{
+            list.forEach(function(b) {
               var opt = document.createElement('option');
               opt.value = b.id; opt.textContent = b.id; sel.appendChild(opt);
-            }});
-          }}).catch(function() {{ /* keep server-rendered options */ }});
-        }}
-        document.getElementById('scaffoldBtn').addEventListener('click', function() {{
+            });
+          }).catch(function() { /* keep server-rendered options */ });
+        }
+        document.getElementById('scaffoldBtn').addEventListener('click', function() {
           var id = sel.value;
           var owner = document.getElementById('owner').value.trim();
           var repo = document.getElementById('repo').value.trim();
           var branch = document.getElementById('branch').value.trim() || 'main';
           msg.textContent = 'Submitting…'; out.textContent='';
-          fetch('/app-factory/scaffold', {{
+          fetch('/app-factory/scaffold', {
             method: 'POST',
-            headers: {{ 'content-type': 'application/json' }},
-            body: JSON.stringify({{
+            headers: { 'content-type': 'application/json' },
+            body: JSON.stringify({
               blueprint_id: id,
-              target: {{ mode: 'existing_repo', owner: owner || null, name: repo || null, default_branch: branch }}
-            }})
-          }}).then(r => r.json()).then(res => {{
-            try {{ out.textContent = JSON.stringify(res); }} catch(e) {{ out.textContent = String(res); }}
+              target: { mode: 'existing_repo', owner: owner || null, name: repo || null, default_branch: branch }
+            })
+          }).then(r => r.json()).then(res => {
+            try { out.textContent = JSON.stringify(res); } catch(e) { out.textContent = String(res); }
             msg.textContent = (res && res.op_id) ? 'Done' : 'Completed';
-          }}).catch(function() {{ msg.textContent = 'Error'; }});
-        }});
+          }).catch(function() { msg.textContent = 'Error'; });
+        });
         loadBlueprints();
-      }})();
+      })();
       </script>
     </body>
     </html>
-    """
-    return HTMLResponse(content=html)
+    """))
+
+@lru_cache(maxsize=16)
+def _render_ui_blueprints(write_enabled: bool, options_html: str) -> tuple[bytes, bytes, str]:
+    dry_banner = "" if write_enabled else "<div id=\"dry\" style=\"background:#fff7ed;border:1px solid #fdba74;color:#9a3412;padding:8px 12px;border-radius:6px;margin:0 0 12px 0;\">Dry‑run: GitHub writes disabled (GITHUB_WRITE_ENABLED=0). Owner/Repo optional.</div>"
+    body = _UI_BLUEPRINTS_TMPL.substitute(dry_banner=dry_banner, options_html=options_html).encode("utf-8")
+    return body, _gzip_page(body), _html_etag(body)
 
+@lru_cache(maxsize=4)
+def _blueprint_options_html(ids: tuple[str, ...]) -> str:
+    # Keyed on the registry's sorted id tuple, so a reload that changes ids rebuilds the snippet
+    return "".join(f"<option value=\"{html.escape(bid)}\">{html.escape(bid)}</option>" for bid in ids)
 
-@app.get("/ui/run/{run_id}", response_class=HTMLResponse)
-def ui_run(run_id: str, dry_run: bool | None = Query(default=None)):
-    # Render a minimal, deterministic run view; hydrate via existing JSON endpoints
-    write_enabled = _github_write_enabled() if dry_run is None else (not dry_run)
-    dry_banner = "" if write_enabled else "<div id=\"dry\" style=\"background:#fff7ed;border:1px solid #fdba74;color:#9a3412;padding:8px 12px;border-radius:6px;margin:0 0 12px 0;\">Dry‑run: GitHub writes disabled (GITHUB_WRITE_ENABLED=0)</div>"
-    approve_disabled = "" if write_enabled else " disabled"
-    merge_disabled = "" if write_enabled else " disabled"
+@app.get("/ui/blueprints", response_class=HTMLResponse)
+def ui_blueprints(request: Request):
+    # Deterministic create-from-blueprint page; client fetches existing endpoints only
+    write_enabled = _github_write_enabled()
+    try:
+        options_html = _blueprint_options_html(_bp_registry().sorted_ids)
+    except Exception:
+        options_html = ""
+    body, gz, etag = _render_ui_blueprints(write_enabled, options_html)
+    return _html_response(request, body, etag, cache_control="no-cache", gz=gz)
 
-    html = f"""
+
+_UI_RUN_TMPL = string.Template(_minify_html("""
     <!doctype html>
     <html lang=\"en\">
     <head>
       <meta charset=\"utf-8\" />
       <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
-      <title>Founder Cockpit · Run {run_id}</title>
+      <title>Founder Cockpit · Run ${safe_id}</title>
+      """ + _COCKPIT_CSS_LINK + """
       <style>
-        body {{ font-family: -apple-system, BlinkMacSystemFont, Segoe UI, Roboto, Helvetica, Arial, sans-serif; margin: 24px; color: #111; }}
-        h1 {{ margin: 0 0 12px 0; }}
-        .grid {{ display: grid; grid-template-columns: 1fr 1fr; gap: 16px; }}
-        .card {{ border: 1px solid #e5e7eb; border-radius: 8px; padding: 12px; }}
-        .muted {{ color: #6b7280; font-size: 12px; }}
-        button {{ padding: 8px 12px; border: 1px solid #d1d5db; background: #f9fafb; border-radius: 6px; cursor: pointer; }}
-        button:hover {{ background: #f3f4f6; }}
-        button[disabled] {{ opacity: 0.5; cursor: not-allowed; }}
-        code {{ background: #f3f4f6; padding: 1px 4px; border-radius: 4px; }}
-        ul {{ margin: 8px 0; padding-left: 18px; }}
-        .row {{ display: flex; gap: 8px; align-items: center; flex-wrap: wrap; }}
+        .grid { display: grid; grid-template-columns: 1fr 1fr; gap: 16px; }
+        code { background: #f3f4f6; padding: 1px 4px; border-radius: 4px; }
+        ul { margin: 8px 0; padding-left: 18px; }
       </style>
     </head>
     <body>
       <a href=\"/ui\" class=\"muted\">← Back</a>
-      <h1>Run <code>{run_id}</code></h1>
-      {dry_banner}
-      <div id=\"app\" data-run-id=\"{run_id}\" data-write-enabled=\"{1 if write_enabled else 0}\"></div>
+      <h1>Run <code>${safe_id}</code></h1>
+      ${dry_banner}
+      <div id=\"app\" data-run-id=\"${safe_id}\" data-quoted-id=\"${quoted_id}\" data-write-enabled=\"${write_flag}\"></div>
 
       <div class=\"grid\">
         <div class=\"card\">
@@ -1020,10 +1318,10 @@ def ui_run(run_id: str, dry_run: bool | None = Query(default=None)):
           <div id=\"runSummary\" class=\"muted\">Loading…</div>
           <div id="budget" class="muted" style="margin-top:6px;">Budget: Loading…</div>
           <div class="row" style="margin-top:8px;">
-            <button id="refreshBtn">Refresh</button>
-            <button id="approveBtn"{approve_disabled}>Approve</button>
-            <button id="mergeBtn"{merge_disabled}>Merge</button>
-            <button id=\"computeBudgetBtn\">Compute Budget</button>
+            <button data-action="refresh" id="refreshBtn">Refresh</button>
+            <button data-action="approve" id="approveBtn"${approve_disabled}>Approve</button>
+            <button data-action="merge" id="mergeBtn"${merge_disabled}>Merge</button>
+            <button data-action=\"compute-budget\" id=\"computeBudgetBtn\">Compute Budget</button>
           </div>
           <div id="actionMsg" class="muted" style="margin-top:8px;"></div>
         </div>
@@ -1050,122 +1348,175 @@ def ui_run(run_id: str, dry_run: bool | None = Query(default=None)):
       </div>
 
       <script>
-      (function() {{
+      (function() {
         var root = document.getElementById('app');
-        var runId = root.getAttribute('data-run-id');
+        // Path-safe id, quoted server-side once per render
+        var runId = root.getAttribute('data-quoted-id');
         var writeEnabled = root.getAttribute('data-write-enabled') === '1';
         var msg = document.getElementById('actionMsg');
-        function setText(id, text) {{ var el = document.getElementById(id); if (el) el.textContent = text; }}
-        function fmtDate(s) {{ try {{ return new Date(s).toLocaleString(); }} catch(e) {{ return s; }} }}
-
-        function refresh() {{
-          fetch('/runs/' + runId).then(r => r.json()).then(data => {{
-            setText('runSummary', 'Status: ' + data.status + ' · Created: ' + fmtDate(data.created_at));
-          }}).catch(() => setText('runSummary', 'Run not found'));
-
-          fetch('/integrations/github/pr/' + runId + '/statuses').then(r => r.json()).then(st => {{
+        // Panel writes are queued and flushed together in the next animation frame
+        var pendingText = new Map();
+        var flushQueued = false;
+        function flushText() {
+          pendingText.forEach(function(text, id) { var el = document.getElementById(id); if (el) el.textContent = text; });
+          pendingText.clear();
+          flushQueued = false;
+        }
+        function setText(id, text) {
+          pendingText.set(id, text);
+          if (!flushQueued) { flushQueued = true; requestAnimationFrame(flushText); }
+        }
+        function fmtDate(s) { try { return new Date(s).toLocaleString(); } catch(e) { return s; } }
+
+        // A newer refresh aborts the one still in flight so its response is never parsed
+        var inflight = null;
+        async function refresh() {
+          if (inflight) inflight.abort();
+          var ctl = inflight = new AbortController();
+          var d;
+          try {
+            var r = await fetch('/runs/' + runId + '/cockpit', { signal: ctl.signal });
+            if (!r.ok) throw new Error(r.status);
+            d = await r.json();
+          } catch (e) {
+            if (ctl.signal.aborted) return;
+            setText('runSummary', 'Run not found');
+            ['ghStatuses', 'timeline', 'metrics', 'budget', 'alerts'].forEach(function(id) { setText(id, 'n/a'); });
+            return;
+          } finally {
+            if (inflight === ctl) inflight = null;
+          }
+          setText('runSummary', 'Status: ' + d.run.status + ' · Created: ' + fmtDate(d.run.created_at));
+
+          var st = d.pr;
+          if (st.error) { setText('ghStatuses', 'No PR recorded or error'); }
+          else {
             var lines = [];
-            if (Array.isArray(st.statuses)) {{
-              st.statuses.forEach(function(s) {{ lines.push(s.context + ': ' + s.state); }});
-            }}
+            if (Array.isArray(st.statuses)) {
+              st.statuses.forEach(function(s) { lines.push(s.context + ': ' + s.state); });
+            }
             if (st.can_merge !== undefined) lines.push('Can merge: ' + st.can_merge);
-            document.getElementById('ghStatuses').textContent = lines.join(' \u00b7 ') || 'No PR recorded';
-          }}).catch(() => setText('ghStatuses', 'No PR recorded or error'));
+            setText('ghStatuses', lines.join(' \u00b7 ') || 'No PR recorded');
+          }
 
-          fetch('/runs/' + runId + '/graph/history').then(r => r.json()).then(hist => {{
-            if (!Array.isArray(hist) || hist.length === 0) {{ setText('timeline', 'No history yet'); return; }}
-            var txt = hist.map(function(h) {{ return h.step_name + ' (' + h.status + ' #' + h.attempt + ')'; }}).join(' \u2192 ');
-            setText('timeline', txt);
-          }}).catch(() => setText('timeline', 'No history yet'));
+          var hist = d.history;
+          if (!Array.isArray(hist) || hist.length === 0) { setText('timeline', 'No history yet'); }
+          else {
+            setText('timeline', hist.map(function(h) { return h.step_name + ' (' + h.status + ' #' + h.attempt + ')'; }).join(' \u2192 '));
+          }
 
-          fetch('/runs/' + runId + '/metrics').then(r => r.json()).then(m => {{
-            try {{ setText('metrics', JSON.stringify(m)); }} catch(e) {{ setText('metrics', 'n/a'); }}
-          }}).catch(() => setText('metrics', 'n/a'));
+          if (d.metrics.error) { setText('metrics', 'n/a'); }
+          else { try { setText('metrics', JSON.stringify(d.metrics)); } catch(e) { setText('metrics', 'n/a'); } }
 
-          fetch('/integrations/budget/' + runId).then(r => r.json()).then(b => {{
+          var b = d.budget;
+          if (b.error) { setText('budget', 'Budget: n/a'); }
+          else {
             var pct = Math.round((b.totals && b.totals.pct_used ? b.totals.pct_used*100 : 0));
-            var limit = (b.totals && b.totals.budget_cents ? ('$' + (b.totals.budget_cents/100).toFixed(2)) : 'n/a');
+            var limit = (b.totals && b.totals.budget_cents ? ('$$' + (b.totals.budget_cents/100).toFixed(2)) : 'n/a');
             setText('budget', 'Budget: ' + pct + '% of ' + limit + ' · Status: ' + b.status);
-          }}).catch(() => setText('budget', 'Budget: n/a'));
+          }
 
-          fetch('/integrations/alerts/' + runId).then(r => r.json()).then(a => {{
+          var a = d.alerts;
+          if (a.error) { setText('alerts', 'n/a'); }
+          else {
             var parts = [];
             parts.push('Status: ' + a.status);
-            if (Array.isArray(a.alerts) && a.alerts.length > 0) {{
-              parts.push('Active: ' + a.alerts.map(function(x) {{ return x.type + (x.key ? '(' + x.key + ')' : ''); }}).join(', '));
-            }} else {{
+            if (Array.isArray(a.alerts) && a.alerts.length > 0) {
+              parts.push('Active: ' + a.alerts.map(function(x) { return x.type + (x.key ? '(' + x.key + ')' : ''); }).join(', '));
+            } else {
               parts.push('Active: none');
-            }}
+            }
             setText('alerts', parts.join(' · '));
-          }}).catch(() => setText('alerts', 'n/a'));
-        }}
+          }
+        }
 
-        document.getElementById('refreshBtn').addEventListener('click', refresh);
-        document.getElementById('approveBtn').addEventListener('click', function() {{
-          if (!writeEnabled) {{ msg.textContent = 'Dry‑run: GitHub writes disabled (GITHUB_WRITE_ENABLED=0)'; return; }}
+        // Fixed request body for Compute Budget, serialized once rather than per click
+        var BUDGET_BODY = '{"warn_pct":0.8,"block_pct":1.0,"rate":{"usd_per_1k_tokens":0.01}}';
+        var actions = {};
+        actions.refresh = refresh;
+        actions.approve = function() {
+          if (!writeEnabled) { msg.textContent = 'Dry‑run: GitHub writes disabled (GITHUB_WRITE_ENABLED=0)'; return; }
           msg.textContent = 'Approving…';
-          fetch('/integrations/github/pr/' + runId + '/approve', {{ method: 'POST' }})
-            .then(r => r.json()).then(() => {{ msg.textContent = 'Approved'; refresh(); }})
-            .catch(() => {{ msg.textContent = 'Approve failed'; }});
-        }});
-        document.getElementById('mergeBtn').addEventListener('click', function() {{
-          if (!writeEnabled) {{ msg.textContent = 'Dry‑run: GitHub writes disabled (GITHUB_WRITE_ENABLED=0)'; return; }}
+          fetch('/integrations/github/pr/' + runId + '/approve', { method: 'POST' })
+            .then(r => r.json()).then(() => { msg.textContent = 'Approved'; refresh(); })
+            .catch(() => { msg.textContent = 'Approve failed'; });
+        };
+        actions.merge = function() {
+          if (!writeEnabled) { msg.textContent = 'Dry‑run: GitHub writes disabled (GITHUB_WRITE_ENABLED=0)'; return; }
           msg.textContent = 'Merging…';
-          fetch('/integrations/github/pr/' + runId + '/merge', {{ method: 'POST' }})
-            .then(r => r.json()).then(res => {{ msg.textContent = res && res.merged ? 'Merged' : 'Merge attempted'; refresh(); }})
-            .catch(() => {{ msg.textContent = 'Merge failed'; }});
-        }});
+          fetch('/integrations/github/pr/' + runId + '/merge', { method: 'POST' })
+            .then(r => r.json()).then(res => { msg.textContent = res && res.merged ? 'Merged' : 'Merge attempted'; refresh(); })
+            .catch(() => { msg.textContent = 'Merge failed'; });
+        };
 
-        document.getElementById('computeBudgetBtn').addEventListener('click', function() {{
+        actions['compute-budget'] = function() {
           msg.textContent = 'Computing budget…';
-          fetch('/integrations/budget/' + runId + '/compute', {{
+          fetch('/integrations/budget/' + runId + '/compute', {
             method: 'POST',
-            headers: {{ 'content-type': 'application/json' }},
-            body: JSON.stringify({{ warn_pct: 0.8, block_pct: 1.0, rate: {{ usd_per_1k_tokens: 0.01 }} }})
-          }})
-            .then(r => r.json()).then(() => {{ msg.textContent = 'Budget computed'; refresh(); }})
-            .catch(() => {{ msg.textContent = 'Budget compute failed'; }});
-        }});
+            headers: { 'content-type': 'application/json' },
+            body: BUDGET_BODY
+          })
+            .then(r => r.json()).then(() => { msg.textContent = 'Budget computed'; refresh(); })
+            .catch(() => { msg.textContent = 'Budget compute failed'; });
+        };
+        // One delegated listener; buttons name their handler via data-action
+        document.addEventListener('click', function(e) {
+          var el = e.target.closest('[data-action]');
+          if (el && !el.disabled && actions[el.dataset.action]) actions[el.dataset.action](e);
+        });
 
         // Initial load
         refresh();
-      }})();
+      })();
       </script>
     </body>
     </html>
-    """
-    return HTMLResponse(content=html)
+    """))
 
+@lru_cache(maxsize=1024)
+def _render_ui_run(run_id: str, write_enabled: bool) -> tuple[bytes, bytes, str]:
+    dry_banner = "" if write_enabled else "<div id=\"dry\" style=\"background:#fff7ed;border:1px solid #fdba74;color:#9a3412;padding:8px 12px;border-radius:6px;margin:0 0 12px 0;\">Dry‑run: GitHub writes disabled (GITHUB_WRITE_ENABLED=0)</div>"
+    approve_disabled = "" if write_enabled else " disabled"
+    merge_disabled = "" if write_enabled else " disabled"
 
-@app.get("/ui/scheduler", response_class=HTMLResponse)
-def ui_scheduler():
-    # Minimal deterministic UI for scheduler
-    html = """
+    body = _UI_RUN_TMPL.substitute(
+        safe_id=html.escape(run_id, quote=True),
+        quoted_id=urllib.parse.quote(run_id, safe=""),
+        dry_banner=dry_banner,
+        write_flag=1 if write_enabled else 0,
+        approve_disabled=approve_disabled,
+        merge_disabled=merge_disabled,
+    ).encode("utf-8")
+    return body, _gzip_page(body), _html_etag(body)
+
+@app.get("/ui/run/{run_id}", response_class=HTMLResponse)
+def ui_run(request: Request, run_id: str, dry_run: bool | None = Query(default=None)):
+    # Render a minimal, deterministic run view; hydrate via existing JSON endpoints
+    write_enabled = _github_write_enabled() if dry_run is None else (not dry_run)
+    body, gz, etag = _render_ui_run(run_id, write_enabled)
+    return _html_response(request, body, etag, cache_control="no-cache", gz=gz)
+
+
+_UI_SCHEDULER_HTML: bytes = _minify_html("""
     <!doctype html>
     <html lang=\"en\">
     <head>
       <meta charset=\"utf-8\" />
       <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
       <title>Founder Cockpit · Scheduler</title>
+      """ + _COCKPIT_CSS_LINK + """
       <style>
-        body { font-family: -apple-system, BlinkMacSystemFont, Segoe UI, Roboto, Helvetica, Arial, sans-serif; margin: 24px; color: #111; }
-        h1 { margin: 0 0 12px 0; }
-        table { border-collapse: collapse; width: 100%; max-width: 900px; }
-        th, td { border: 1px solid #e5e7eb; padding: 6px 8px; text-align: left; }
-        .row { display: flex; gap: 8px; align-items: center; flex-wrap: wrap; margin: 8px 0; }
-        .muted { color: #6b7280; font-size: 12px; }
-        button { padding: 8px 12px; border: 1px solid #d1d5db; background: #f9fafb; border-radius: 6px; cursor: pointer; }
-        button:hover { background: #f3f4f6; }
-        button[disabled] { opacity: 0.5; cursor: not-allowed; }
-        .card { border: 1px solid #e5e7eb; border-radius: 8px; padding: 12px; max-width: 960px; }
+        table { max-width: 900px; }
+        .row { margin: 8px 0; }
+        .card { max-width: 960px; }
       </style>
     </head>
     <body>
       <a href=\"/ui\" class=\"muted\">← Back</a>
       <h1>Scheduler</h1>
       <div class=\"row\">
-        <button id=\"refreshBtn\">Refresh</button>
-        <button id=\"stepBtn\">Step</button>
+        <button data-action=\"refresh\" id=\"refreshBtn\">Refresh</button>
+        <button data-action=\"step\" id=\"stepBtn\">Step</button>
         <span id=\"msg\" class=\"muted\"></span>
       </div>
       <div class=\"card\">
@@ -1189,6 +1540,8 @@ def ui_scheduler():
       <script>
       (function() {
         function setText(id, txt) { var el = document.getElementById(id); if (el) el.textContent = txt; }
+        function esc(v) { return v == null ? '' : String(v).replace(/[&<>"]/g, function(c) { return {'&':'&amp;','<':'&lt;','>':'&gt;','"':'&quot;'}[c]; }); }
+        function rowHtml(cols) { return '<tr><td>' + cols.map(esc).join('</td><td>') + '</td></tr>'; }
         function loadPolicy() {
           fetch('/scheduler/policy').then(r => r.json()).then(p => {
             setText('policy', 'enabled=' + p.enabled + ' · global_concurrency=' + p.global_concurrency + ' · tenant_max_active=' + p.tenant_max_active + ' · queue_max=' + p.queue_max);
@@ -1202,57 +1555,57 @@ def ui_scheduler():
         function loadQueue() {
           fetch('/scheduler/queue').then(r => r.json()).then(q => {
             setText('counts', 'queued=' + q.queued + ' · active=' + q.active + ' · completed=' + q.completed);
-            var tb = document.getElementById('tbody');
-            tb.innerHTML = '';
-            var items = Array.isArray(q.items) ? q.items.slice() : [];
-            // stable sort already from API; re-affirm deterministic order
-            items.forEach(function(it, idx) {
-              var tr = document.createElement('tr');
-              var tds = [String(idx), String(it.run_id), String(it.tenant_id), String(it.priority), String(it.state)];
-              tds.forEach(function(text){ var td = document.createElement('td'); td.textContent = text; tr.appendChild(td); });
-              tb.appendChild(tr);
-            });
+            var items = Array.isArray(q.items) ? q.items : [];
+            // stable sort already from API; one innerHTML write per render
+            document.getElementById('tbody').innerHTML = items.map(function(it, idx) {
+              return rowHtml([String(idx), String(it.run_id), String(it.tenant_id), String(it.priority), String(it.state)]);
+            }).join('');
             var stepBtn = document.getElementById('stepBtn');
             stepBtn.disabled = (items.length === 0);
           }).catch(() => setText('counts', 'n/a'));
         }
         function refreshAll() { loadPolicy(); loadStats(); loadQueue(); }
-        document.getElementById('refreshBtn').addEventListener('click', refreshAll);
-        document.getElementById('stepBtn').addEventListener('click', function() {
+        var actions = {};
+        actions.refresh = refreshAll;
+        actions.step = function() {
           var msg = document.getElementById('msg');
           msg.textContent = 'Stepping…';
           fetch('/scheduler/step', { method: 'POST' }).then(r => r.json()).then(res => {
             msg.textContent = res.leased ? ('Leased ' + res.leased) : (res.status || 'done');
             refreshAll();
           }).catch(() => { msg.textContent = 'Step failed'; });
+        };
+        // One delegated listener; buttons name their handler via data-action
+        document.addEventListener('click', function(e) {
+          var el = e.target.closest('[data-action]');
+          if (el && !el.disabled && actions[el.dataset.action]) actions[el.dataset.action](e);
         });
         refreshAll();
       })();
       </script>
     </body>
     </html>
-    """
-    return HTMLResponse(content=html)
+    """).encode("utf-8")
+_UI_SCHEDULER_ETAG = _html_etag(_UI_SCHEDULER_HTML)
+_UI_SCHEDULER_GZ = _gzip_page(_UI_SCHEDULER_HTML)
+
+@app.get("/ui/scheduler", response_class=HTMLResponse)
+def ui_scheduler(request: Request):
+    # Minimal deterministic UI for scheduler
+    return _html_response(request, _UI_SCHEDULER_HTML, _UI_SCHEDULER_ETAG, last_modified=True, gz=_UI_SCHEDULER_GZ)
 
 # --------- Phase 30: Postmortems Cockpit ---------
-@app.get("/ui/postmortems", response_class=HTMLResponse)
-def ui_postmortems():
-    html = """
+_UI_POSTMORTEMS_HTML: bytes = _minify_html("""
     <!doctype html>
     <html lang=\"en\">
     <head>
       <meta charset=\"utf-8\" />
       <meta name=\"viewport\" content=\"width=device-width, initial-scale=1\" />
       <title>Founder Cockpit · Postmortems</title>
+      """ + _COCKPIT_CSS_LINK + """
       <style>
-        body { font-family: -apple-system, BlinkMacSystemFont, Segoe UI, Roboto, Helvetica, Arial, sans-serif; margin: 24px; color: #111; }
-        h1 { margin: 0 0 12px 0; }
-        table { border-collapse: collapse; width: 100%; max-width: 960px; }
-        th, td { border: 1px solid #e5e7eb; padding: 6px 8px; text-align: left; }
-        .row { display: flex; gap: 8px; align-items: center; flex-wrap: wrap; margin: 8px 0; }
-        .muted { color: #6b7280; font-size: 12px; }
-        button { padding: 8px 12px; border: 1px solid #d1d5db; background: #f9fafb; border-radius: 6px; cursor: pointer; }
-        button:hover { background: #f3f4f6; }
+        table { max-width: 960px; }
+        .row { margin: 8px 0; }
         input[type=text] { padding: 6px 8px; border: 1px solid #d1d5db; border-radius: 6px; }
       </style>
     </head>
@@ -1260,13 +1613,13 @@ def ui_postmortems():
       <a href=\"/ui\" class=\"muted\">← Back</a>
       <h1>Postmortems</h1>
       <div class=\"row\">
-        <button id=\"refreshBtn\">Refresh</button>
+        <button data-action=\"refresh\" id=\"refreshBtn\">Refresh</button>
         <label class=\"muted\">Generate: run_id</label>
         <input id=\"genRun\" type=\"text\" />
-        <button id=\"genBtn\">Generate</button>
+        <button data-action=\"generate\" id=\"genBtn\">Generate</button>
         <label class=\"muted\">Ingest to KB: run_id</label>
         <input id=\"kbRun\" type=\"text\" />
-        <button id=\"kbBtn\">Ingest</button>
+        <button data-action=\"ingest-kb\" id=\"kbBtn\">Ingest</button>
       </div>
       <table>
         <thead>
@@ -1284,59 +1637,46 @@ def ui_postmortems():
       </table>
       <script>
       (function() {
+        function esc(v) { return v == null ? '' : String(v).replace(/[&<>"]/g, function(c) { return {'&':'&amp;','<':'&lt;','>':'&gt;','"':'&quot;'}[c]; }); }
+        function rowHtml(cols) { return '<tr><td>' + cols.map(esc).join('</td><td>') + '</td></tr>'; }
         function render(list) {
-          var tb = document.getElementById('tbody');
-          tb.innerHTML='';
-          var items = Array.isArray(list) ? list.slice() : [];
-          items.forEach(function(it) {
-            var tr = document.createElement('tr');
-            var cols = [it.run_id, it.status, (it.failed_step||'-'), String(it.retries||0), String(it.alerts_count||0), (it.budget_status||'n/a'), (Array.isArray(it.tags)?it.tags.join(','):'')];
-            cols.forEach(function(text){ var td = document.createElement('td'); td.textContent = text; tr.appendChild(td); });
-            tb.appendChild(tr);
-          });
+          var items = Array.isArray(list) ? list : [];
+          document.getElementById('tbody').innerHTML = items.map(function(it) {
+            return rowHtml([it.run_id, it.status, (it.failed_step||'-'), String(it.retries||0), String(it.alerts_count||0), (it.budget_status||'n/a'), (Array.isArray(it.tags)?it.tags.join(','):'')]);
+          }).join('');
         }
         function load() {
-          // Fetch search results; then hydrate rows with full artifact
-          fetch('/postmortems/search?q=').then(r=>r.json()).then(function(results){
-            // Base rows with minimal fields
-            var out = results.map(function(r){ return { run_id: r.run_id, status: r.status, failed_step: '-', retries: 0, alerts_count: 0, budget_status: 'n/a', tags: r.tags }; });
-            var pending = out.length;
-            if (pending === 0) { render(out); return; }
-            out.forEach(function(row, idx){
-              fetch('/postmortems/' + encodeURIComponent(row.run_id))
-                .then(function(resp){ return resp.ok ? resp.json() : null; })
-                .then(function(art){
-                  if (art && art.meta) {
-                    out[idx].status = art.meta.status || row.status;
-                    out[idx].retries = art.meta.retries || 0;
-                    out[idx].failed_step = art.meta.failed_step || '-';
-                    var ac = (((art.alerts||{}).counts||{}).total)||0;
-                    out[idx].alerts_count = ac;
-                    out[idx].budget_status = (art.budget||{}).status || 'n/a';
-                    out[idx].tags = art.tags||row.tags||[];
-                  }
-                }).catch(function(){ /* keep defaults */ })
-                .finally(function(){ pending -= 1; if (pending === 0) render(out); });
-            });
-          }).catch(function(){ render([]); });
+          // Rows arrive already hydrated; one request regardless of row count
+          fetch('/postmortems/list').then(r=>r.json()).then(render).catch(function(){ render([]); });
         }
-        document.getElementById('refreshBtn').addEventListener('click', load);
-        document.getElementById('genBtn').addEventListener('click', function(){
+        var actions = {};
+        actions.refresh = load;
+        actions.generate = function(){
           var v = document.getElementById('genRun').value.trim();
           if (!v) return;
           fetch('/postmortems/' + encodeURIComponent(v) + '/generate', { method: 'POST' })
             .then(function(){ load(); }).catch(function(){});
-        });
-        document.getElementById('kbBtn').addEventListener('click', function(){
+        };
+        actions['ingest-kb'] = function(){
           var v = document.getElementById('kbRun').value.trim();
           if (!v) return;
           fetch('/postmortems/' + encodeURIComponent(v) + '/ingest-kb', { method: 'POST' })
             .then(function(){ load(); }).catch(function(){});
+        };
+        // One delegated listener; buttons name their handler via data-action
+        document.addEventListener('click', function(e) {
+          var el = e.target.closest('[data-action]');
+          if (el && !el.disabled && actions[el.dataset.action]) actions[el.dataset.action](e);
         });
         load();
       })();
       </script>
     </body>
     </html>
-    """
-    return HTMLResponse(content=html)
+    """).encode("utf-8")
+_UI_POSTMORTEMS_ETAG = _html_etag(_UI_POSTMORTEMS_HTML)
+_UI_POSTMORTEMS_GZ = _gzip_page(_UI_POSTMORTEMS_HTML)
+
+@app.get("/ui/postmortems", response_class=HTMLResponse)
+def ui_postmortems(request: Request):
+    return _html_response(request, _UI_POSTMORTEMS_HTML, _UI_POSTMORTEMS_ETAG, last_modified=True, gz=_UI_POSTMORTEMS_GZ)
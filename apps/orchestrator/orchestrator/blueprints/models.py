@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from typing import List, Literal, Optional
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, field_validator
 
 
 AllowedStep = Literal[
@@ -58,13 +58,15 @@ class BlueprintManifest(BaseModel):
     scaffold: List[ScaffoldStep]
     deploy_targets: List[Literal["preview", "staging", "prod"]]
 
-    @validator("id")
+    @field_validator("id")
+    @classmethod
     def _validate_id(cls, v: str) -> str:
         if not v or " " in v:
             raise ValueError("id must be non-empty and contain no spaces")
         return v
 
-    @validator("version")
+    @field_validator("version")
+    @classmethod
     def _validate_version(cls, v: str) -> str:
         parts = v.split(".")
         if len(parts) != 3 or not all(p.isdigit() for p in parts):
@@ -1,8 +1,7 @@
 from __future__ import annotations
 
-import json
 import os
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
 from .models import BlueprintManifest, BlueprintSummary, summarize
 
@@ -12,28 +11,45 @@ class BlueprintRegistry:
         # Default to repo-level blueprints directory
         self.base_dir = base_dir or os.path.abspath(os.path.join(os.getcwd(), "blueprints"))
         self._manifests: Dict[str, BlueprintManifest] = {}
+        # Recomputed on every successful load; also a ready-made cache key for callers
+        self.sorted_ids: Tuple[str, ...] = ()
+        # file name -> ((mtime_ns, size), manifest) from the last successful load
+        self._parsed: Dict[str, Tuple[Tuple[int, int], BlueprintManifest]] = {}
 
     def load(self) -> None:
         if not os.path.isdir(self.base_dir):
             raise RuntimeError(f"Blueprints directory not found: {self.base_dir}")
         manifests: Dict[str, BlueprintManifest] = {}
-        for fname in sorted(os.listdir(self.base_dir)):
+        parsed: Dict[str, Tuple[Tuple[int, int], BlueprintManifest]] = {}
+        with os.scandir(self.base_dir) as it:
+            entries = sorted((e for e in it if e.is_file()), key=lambda e: e.name)
+        for entry in entries:
+            fname = entry.name
             if not fname.endswith(".json"):
                 continue
             if fname == "report.json":
                 continue
-            path = os.path.join(self.base_dir, fname)
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                manifest = BlueprintManifest(**data)
-            except Exception as e:
-                raise RuntimeError(f"Invalid blueprint manifest {fname}: {e}") from e
+            st = entry.stat()
+            stamp = (st.st_mtime_ns, st.st_size)
+            cached = self._parsed.get(fname)
+            if cached and cached[0] == stamp:
+                # Unchanged since the last load: reuse the validated manifest
+                manifest = cached[1]
+            else:
+                try:
+                    # Parse and validate in one pass inside pydantic-core (no intermediate dict)
+                    with open(entry.path, "rb") as f:
+                        manifest = BlueprintManifest.model_validate_json(f.read())
+                except Exception as e:
+                    raise RuntimeError(f"Invalid blueprint manifest {fname}: {e}") from e
             if manifest.id in manifests:
                 raise RuntimeError(f"Duplicate blueprint id: {manifest.id}")
             manifests[manifest.id] = manifest
+            parsed[fname] = (stamp, manifest)
         # If all valid, install atomically
         self._manifests = manifests
+        self._parsed = parsed
+        self.sorted_ids = tuple(sorted(manifests))
 
     def list(self) -> List[BlueprintSummary]:
         return [summarize(m) for m in self._manifests.values()]
@@ -1,4 +1,5 @@
 import os
+import threading
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 
@@ -19,24 +20,106 @@ def _database_url() -> str:
 
 DATABASE_URL = _database_url()
 
+def _env_int(name: str, default: int) -> int:
+    raw = os.getenv(name, "").strip()
+    try:
+        return int(raw) if raw else default
+    except ValueError:
+        return default
+
+def _engine_kwargs(url: str) -> dict:
+    """
+    Connection pool settings for server databases. Tunable per deployment:
+      DB_POOL_SIZE (20), DB_MAX_OVERFLOW (40), DB_POOL_TIMEOUT seconds (30),
+      DB_POOL_RECYCLE seconds (1800). Size pool_size + max_overflow to at least
+      THREADPOOL_SIZE so sync handlers are not parked waiting for a connection.
+    """
+    # SQLite (CI/local) keeps SQLAlchemy's default pooling
+    if url.startswith("sqlite"):
+        return {}
+    # Server databases: the default 5+10 QueuePool stalls under bursts of concurrent
+    # requests; size it explicitly, pre-ping stale connections and recycle periodically.
+    kwargs: dict = {
+        "pool_size": _env_int("DB_POOL_SIZE", 20),
+        "max_overflow": _env_int("DB_MAX_OVERFLOW", 40),
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT", 30),
+        "pool_pre_ping": True,
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+    }
+    if url.startswith("postgresql"):
+        # Keep a single runaway query from holding a pooled connection indefinitely
+        kwargs["connect_args"] = {"options": "-c statement_timeout=5000"}
+    return kwargs
+
 # Synchronous SQLAlchemy engine/session (simple & reliable for MVP)
-engine = create_engine(DATABASE_URL, echo=False, future=True)
+engine = create_engine(DATABASE_URL, echo=False, future=True, **_engine_kwargs(DATABASE_URL))
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
 Base = declarative_base()
 
 _tables_initialized = False
+_tables_lock = threading.Lock()
+
+def init_db() -> None:
+    """
+    Create tables once per process. Safe to call from the startup task and from
+    get_db() concurrently; raises if the database is not reachable yet.
+    """
+    global _tables_initialized
+    if _tables_initialized:
+        return
+    with _tables_lock:
+        if _tables_initialized:
+            return
+        # Import models to ensure metadata is populated
+        from . import models  # noqa: F401
+        Base.metadata.create_all(bind=engine)
+        _tables_initialized = True
+
+def ensure_indexes(bind) -> list:
+    """
+    create_all() skips tables that already exist, so indexes declared on a model
+    after its table was created would never be built. Create any that are missing
+    and return their names.
+
+    Not called on the request path: index builds on large tables are slow, so this
+    runs as a one-off step (scripts/db_ensure_indexes.py). On Postgres each index is
+    built CONCURRENTLY, which does not block writes, on an autocommit connection with
+    the pool's statement_timeout lifted.
+    """
+    from sqlalchemy import inspect, text
+    from sqlalchemy.schema import CreateIndex
+    from . import models  # noqa: F401
+
+    created = []
+    with bind.connect() as conn:
+        if conn.dialect.name == "postgresql":
+            conn = conn.execution_options(isolation_level="AUTOCOMMIT")
+            conn.execute(text("SET statement_timeout = 0"))
+        insp = inspect(conn)
+        for table in Base.metadata.sorted_tables:
+            if not insp.has_table(table.name):
+                continue
+            existing = {i["name"] for i in insp.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name in existing:
+                    continue
+                if conn.dialect.name == "postgresql":
+                    ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=conn.dialect))
+                    conn.execute(text(ddl.replace("INDEX", "INDEX CONCURRENTLY", 1)))
+                else:
+                    index.create(bind=conn)
+                    conn.commit()
+                created.append(index.name)
+    return created
 
 def get_db():
+    # Lazy init covers requests that arrive before the startup task finished (or
+    # apps driven without startup events, e.g. a bare TestClient). Once tables
+    # exist this is a single module-global read per request.
+    if not _tables_initialized:
+        init_db()
     db = SessionLocal()
     try:
-        global _tables_initialized
-        if not _tables_initialized:
-            # Import models to ensure metadata is populated, then create tables lazily
-            from . import models  # noqa: F401
-            Base.metadata.create_all(bind=engine)
-            _tables_initialized = True
         yield db
     finally:
         db.close()
-
-
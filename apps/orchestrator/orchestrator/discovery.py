@@ -1,19 +1,14 @@
 import uuid
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 from .models import Project, RoadmapItem, PRD, DesignCheck, ResearchNote
 from .agents import product as product_agent
 from .agents import design as design_agent
 from .agents import research as research_agent
-from .kb import search as kb_search, ingest_text as kb_ingest
+from .kb import search_cached as kb_search_cached, ingest_text as kb_ingest
 
-def _next_version(db: Session, tenant_id: str, project_id: str, item_id: str) -> str:
+def _next_version(last) -> str:
     # very simple vN incrementer for PRD only (others don't track versions yet)
-    last = (
-        db.query(PRD)
-        .filter(PRD.tenant_id == tenant_id, PRD.project_id == project_id, PRD.roadmap_item_id == item_id)
-        .order_by(PRD.created_at.desc())
-        .first()
-    )
     if not last:
         return "v0"
     try:
@@ -25,7 +20,8 @@ def _next_version(db: Session, tenant_id: str, project_id: str, item_id: str) ->
 def upsert_discovery_artifacts(db: Session, tenant_id: str, project_id: str, roadmap_item_id: str, *, force: bool = False):
     """
     Ensure PRD/Design/Research exist. If 'force' is True, create a new version instead of no-op.
-    Returns: dict(created={prd,design,research}, ids={prd,design,research})
+    Returns: dict(created={prd,design,research}, ids={prd,design,research},
+    artifacts=(prd, design, research)) where artifacts are the current latest rows.
     """
     created = {"prd": False, "design": False, "research": False}
     ids = {"prd": None, "design": None, "research": None}
@@ -33,19 +29,22 @@ def upsert_discovery_artifacts(db: Session, tenant_id: str, project_id: str, roa
     proj = db.get(Project, project_id)
     item = db.get(RoadmapItem, roadmap_item_id)
     if not proj or not item:
-        return {"created": created, "ids": ids}
+        return {"created": created, "ids": ids, "artifacts": (None, None, None)}
+
+    # Current latest artifacts in one round-trip
+    prd, design, research = latest_discovery_artifacts(db, tenant_id, project_id, roadmap_item_id)
 
-    # Pull related context from KB
-    related = kb_search(db, tenant_id, project_id, f"{proj.name} {item.title}", k=3)
-    related_snippets = [r["text"] for r in related]
+    # Pull related context from KB, only when something is about to be drafted
+    related_snippets = []
+    if force or not (prd and design and research):
+        related = kb_search_cached(db, tenant_id, project_id, f"{proj.name} {item.title}", k=3)
+        related_snippets = [r["text"] for r in related]
+
+    # Draft everything first (the agents are local and side-effect free), then write the
+    # new rows and their KB chunks in a single transaction.
+    drafted = []  # (row, kind, kb_text)
 
     # PRD
-    prd = (
-        db.query(PRD)
-        .filter(PRD.tenant_id == tenant_id, PRD.project_id == project_id, PRD.roadmap_item_id == roadmap_item_id)
-        .order_by(PRD.created_at.desc())
-        .first()
-    )
     if not prd or force:
         prd_json = product_agent.draft_prd(proj.name, item.title, references=related_snippets)
         prd = PRD(
@@ -53,22 +52,12 @@ def upsert_discovery_artifacts(db: Session, tenant_id: str, project_id: str, roa
             tenant_id=tenant_id,
             project_id=project_id,
             roadmap_item_id=roadmap_item_id,
-            version=_next_version(db, tenant_id, project_id, roadmap_item_id) if force else (prd.version if prd else "v0"),
+            version=_next_version(prd) if force else (prd.version if prd else "v0"),
             prd_json=prd_json,
         )
-        db.add(prd)
-        db.commit()
-        kb_ingest(db, tenant_id, project_id, kind="prd", ref_id=prd.id, text=f"{prd_json}")
-        created["prd"] = True
-    ids["prd"] = prd.id if prd else None
+        drafted.append((prd, "prd", f"{prd_json}"))
 
     # Design check
-    design = (
-        db.query(DesignCheck)
-        .filter(DesignCheck.tenant_id == tenant_id, DesignCheck.project_id == project_id, DesignCheck.roadmap_item_id == roadmap_item_id)
-        .order_by(DesignCheck.created_at.desc())
-        .first()
-    )
     if not design or force:
         d = design_agent.review_ui(proj.name, item.title)
         design = DesignCheck(
@@ -76,19 +65,9 @@ def upsert_discovery_artifacts(db: Session, tenant_id: str, project_id: str, roa
             tenant_id=tenant_id, project_id=project_id, roadmap_item_id=roadmap_item_id,
             passes=d["passes"], heuristics_score=d["heuristics_score"], a11y_notes=d["a11y_notes"]
         )
-        db.add(design)
-        db.commit()
-        kb_ingest(db, tenant_id, project_id, kind="design", ref_id=design.id, text=f"{d}")
-        created["design"] = True
-    ids["design"] = design.id if design else None
+        drafted.append((design, "design", f"{d}"))
 
     # Research note
-    research = (
-        db.query(ResearchNote)
-        .filter(ResearchNote.tenant_id == tenant_id, ResearchNote.project_id == project_id, ResearchNote.roadmap_item_id == roadmap_item_id)
-        .order_by(ResearchNote.created_at.desc())
-        .first()
-    )
     if not research or force:
         r = research_agent.synthesize(proj.name, item.title, related_snippets=related_snippets)
         research = ResearchNote(
@@ -96,60 +75,133 @@ def upsert_discovery_artifacts(db: Session, tenant_id: str, project_id: str, roa
             tenant_id=tenant_id, project_id=project_id, roadmap_item_id=roadmap_item_id,
             summary=r["summary"], evidence=r["evidence"]
         )
-        db.add(research)
-        db.commit()
-        kb_ingest(db, tenant_id, project_id, kind="research", ref_id=research.id, text=f"{r}")
-        created["research"] = True
+        drafted.append((research, "research", f"{r}"))
+
+    if drafted:
+        try:
+            db.add_all([row for row, _, _ in drafted])
+            for row, kind, kb_text in drafted:
+                kb_ingest(db, tenant_id, project_id, kind=kind, ref_id=row.id, text=kb_text, commit=False)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        for _, kind, _ in drafted:
+            created[kind] = True
+    ids["prd"] = prd.id if prd else None
+    ids["design"] = design.id if design else None
     ids["research"] = research.id if research else None
 
-    return {"created": created, "ids": ids}
+    return {"created": created, "ids": ids, "artifacts": (prd, design, research)}
 
-def dor_check(db: Session, tenant_id: str, project_id: str, roadmap_item_id: str):
-    """(Unchanged) See earlier implementation."""
-    from .models import PRD, DesignCheck, ResearchNote  # local import to avoid cycles
-    missing = []
-    details = {}
+def _latest_id(model, tenant_id: str, project_id: str, roadmap_item_id: str):
+    return (
+        select(model.id)
+        .where(model.tenant_id == tenant_id, model.project_id == project_id, model.roadmap_item_id == roadmap_item_id)
+        .order_by(model.created_at.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
 
-    prd = (
-        db.query(PRD)
-        .filter(PRD.tenant_id == tenant_id, PRD.project_id == project_id, PRD.roadmap_item_id == roadmap_item_id)
-        .order_by(PRD.created_at.desc())
-        .first()
+def _with_latest_artifacts(stmt):
+    # Outer-join each artifact table on its latest row id for the item. Filters are
+    # bindparams, so the statement is built once and executed with per-call values.
+    tenant_id, project_id, roadmap_item_id = bindparam("tenant_id"), bindparam("project_id"), bindparam("roadmap_item_id")
+    return (
+        stmt.select_from(RoadmapItem)
+        .outerjoin(PRD, PRD.id == _latest_id(PRD, tenant_id, project_id, roadmap_item_id))
+        .outerjoin(DesignCheck, DesignCheck.id == _latest_id(DesignCheck, tenant_id, project_id, roadmap_item_id))
+        .outerjoin(ResearchNote, ResearchNote.id == _latest_id(ResearchNote, tenant_id, project_id, roadmap_item_id))
+        .where(RoadmapItem.id == roadmap_item_id)
     )
-    design = (
-        db.query(DesignCheck)
-        .filter(DesignCheck.tenant_id == tenant_id, DesignCheck.project_id == project_id, DesignCheck.roadmap_item_id == roadmap_item_id)
-        .order_by(DesignCheck.created_at.desc())
-        .first()
+
+def _item_with_latest_artifacts_stmt():
+    latest = [
+        _latest_id(m, RoadmapItem.tenant_id, RoadmapItem.project_id, RoadmapItem.id).correlate(RoadmapItem)
+        for m in (PRD, DesignCheck, ResearchNote)
+    ]
+    return (
+        select(RoadmapItem, PRD, DesignCheck, ResearchNote)
+        .outerjoin(PRD, PRD.id == latest[0])
+        .outerjoin(DesignCheck, DesignCheck.id == latest[1])
+        .outerjoin(ResearchNote, ResearchNote.id == latest[2])
+        .where(RoadmapItem.id == bindparam("roadmap_item_id"))
     )
-    research = (
-        db.query(ResearchNote)
-        .filter(ResearchNote.tenant_id == tenant_id, ResearchNote.project_id == project_id, ResearchNote.roadmap_item_id == roadmap_item_id)
-        .order_by(ResearchNote.created_at.desc())
-        .first()
+
+# Built once at import: constructing these joins costs about as much as running them on SQLite
+_LATEST_ARTIFACTS = _with_latest_artifacts(select(PRD, DesignCheck, ResearchNote))
+_DOR_COLUMNS = _with_latest_artifacts(
+    select(PRD.id, PRD.prd_json, DesignCheck.id, DesignCheck.passes, ResearchNote.id, ResearchNote.summary)
+)
+_ITEM_WITH_LATEST_ARTIFACTS = _item_with_latest_artifacts_stmt()
+
+def latest_discovery_artifacts(db: Session, tenant_id: str, project_id: str, roadmap_item_id: str):
+    """
+    Latest PRD/DesignCheck/ResearchNote for a roadmap item in a single round-trip.
+    Returns (prd, design, research); each is None when missing.
+    """
+    params = {"tenant_id": tenant_id, "project_id": project_id, "roadmap_item_id": roadmap_item_id}
+    row = db.execute(_LATEST_ARTIFACTS, params).first()
+    if row is None:
+        return None, None, None
+    return row[0], row[1], row[2]
+
+def item_with_latest_artifacts(db: Session, roadmap_item_id: str):
+    """
+    Roadmap item plus its latest PRD/DesignCheck/ResearchNote in one SELECT; the
+    latest-row subqueries are correlated to the item's tenant/project columns.
+    Returns (item, prd, design, research); item is None when it does not exist.
+    """
+    row = db.execute(_ITEM_WITH_LATEST_ARTIFACTS, {"roadmap_item_id": roadmap_item_id}).first()
+    if row is None:
+        return None, None, None, None
+    return row[0], row[1], row[2], row[3]
+
+def dor_check(db: Session, tenant_id: str, project_id: str, roadmap_item_id: str):
+    """
+    DoR gate for a roadmap item in a single query. Only the columns the gate reads
+    are selected, so design notes and research evidence never leave the database.
+    """
+    params = {"tenant_id": tenant_id, "project_id": project_id, "roadmap_item_id": roadmap_item_id}
+    row = db.execute(_DOR_COLUMNS, params).first()
+    return _dor_evaluate(*(row or (None,) * 6))
+
+def dor_check_from_objs(prd, design, research):
+    """
+    Definition-of-Ready evaluation over already-loaded artifacts (no queries).
+    Returns (ok, missing, details) with the same shape as dor_check.
+    """
+    return _dor_evaluate(
+        prd.id if prd else None, prd.prd_json if prd else None,
+        design.id if design else None, design.passes if design else None,
+        research.id if research else None, research.summary if research else None,
     )
 
-    if not prd:
+def _dor_evaluate(prd_id, prd_json, design_id, design_passes, research_id, research_summary):
+    missing = []
+    details = {}
+
+    if prd_id is None:
         missing.append("prd")
     else:
-        ac = prd.prd_json.get("acceptance_criteria") if isinstance(prd.prd_json, dict) else None
+        ac = prd_json.get("acceptance_criteria") if isinstance(prd_json, dict) else None
         if not ac or len(ac) == 0:
             missing.append("prd.acceptance_criteria")
-        details["prd_id"] = prd.id
+        details["prd_id"] = prd_id
 
-    if not design:
+    if design_id is None:
         missing.append("design")
     else:
-        if not design.passes:
+        if not design_passes:
             missing.append("design.passes")
-        details["design_id"] = design.id
+        details["design_id"] = design_id
 
-    if not research:
+    if research_id is None:
         missing.append("research")
     else:
-        if not research.summary:
+        if not research_summary:
             missing.append("research.summary")
-        details["research_id"] = research.id
+        details["research_id"] = research_id
 
     return (len(missing) == 0), missing, details
 
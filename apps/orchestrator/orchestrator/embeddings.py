@@ -1,32 +1,90 @@
 import os, hashlib
+from functools import lru_cache
 import numpy as np
+import orjson
 from typing import List
 
 EMBED_DIM = int(os.getenv("EMBED_DIM", "384"))
 
+# SplitMix64 constants
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+_SHIFT30, _SHIFT27, _SHIFT31 = np.uint64(30), np.uint64(27), np.uint64(31)
+# int32 -> uniform on [-sqrt(3), sqrt(3)): unit variance, like the normal it replaced
+_UNIT_SCALE = np.float32(np.sqrt(3.0) / 2**31)
+
+
+@lru_cache(maxsize=8)
+def _counters(n: int) -> np.ndarray:
+    return np.arange(1, n + 1, dtype=np.uint64) * _GOLDEN
+
+
+def _noise(seed: int, dim: int) -> np.ndarray:
+    """
+    Counter-based SplitMix64 stream: each output word depends only on (seed, index),
+    so the whole vector is a few array ops with no generator construction.
+    """
+    z = _counters((dim + 1) // 2) + np.uint64(seed)
+    # In place on the one fresh buffer; only the shifts need a temporary
+    z ^= z >> _SHIFT30
+    z *= _MIX1
+    z ^= z >> _SHIFT27
+    z *= _MIX2
+    z ^= z >> _SHIFT31
+    v = z.view(np.int32)[:dim].astype(np.float32)
+    v *= _UNIT_SCALE
+    return v
+
+def _embed(text: str, dim: int) -> np.ndarray:
+    data = text.encode("utf-8")
+    seed = int.from_bytes(hashlib.sha256(data).digest()[:8], "little")
+    v = _noise(seed, dim)
+
+    if data:
+        # Byte histogram in one C pass (bytes fold onto dim buckets via b % dim)
+        buf = np.frombuffer(data, dtype=np.uint8).astype(np.intp)
+        v += np.bincount(buf % dim, minlength=dim).astype(np.float32)
+
+    # sqrt(v.v) is what np.linalg.norm computes for a 1-D float vector, minus its wrapper overhead
+    v /= np.float32(np.sqrt(v.dot(v)) + 1e-8)  # in place: v is already a fresh buffer
+    return v
+
 def embed_text_local(text: str, dim: int = EMBED_DIM) -> List[float]:
     """
     Deterministic 'good-enough' local embedding (no external calls).
     - Seeded by SHA-256 of the text.
-    - Combines a random normal vector with a simple byte-histogram signal.
+    - Combines a unit-variance pseudorandom vector with a simple byte-histogram signal.
     - Normalized to unit length for cosine similarity via dot product.
     NOT semantic-quality; swap with a real provider later (BYOK).
     """
-    seed = int(hashlib.sha256(text.encode("utf-8")).hexdigest(), 16) % (2**32)
-    rng = np.random.default_rng(seed)
-    v = rng.normal(size=(dim,)).astype(np.float32)
+    # orjson writes float32 components in their shortest round-trip form, so these floats
+    # serialize to ~40% less JSON in kb_chunks.emb than tolist()'s float64 digits while
+    # reading back as the exact same float32 vector.
+    return orjson.loads(orjson.dumps(_embed(text, dim), option=orjson.OPT_SERIALIZE_NUMPY))
 
-    if text:
-        hist = np.zeros(dim, dtype=np.float32)
-        for b in text.encode("utf-8"):
-            hist[b % dim] += 1.0
-        v += hist
-
-    norm = float(np.linalg.norm(v) + 1e-8)
-    return (v / norm).tolist()
+@lru_cache(maxsize=4096)
+def embed_query(text: str, dim: int = EMBED_DIM) -> np.ndarray:
+    """
+    embed_text_local for search queries, memoized per (text, dim) since the same
+    titles are looked up repeatedly. Ingested chunks rarely repeat and stay uncached.
+    The returned array is shared between callers and read-only.
+    """
+    v = _embed(text, dim)
+    v.setflags(write=False)
+    return v
 
 def cosine(a: np.ndarray, b: np.ndarray) -> float:
+    # General form for vectors of any length; embed_text_local output can use cosine_unit
     denom = (np.linalg.norm(a) + 1e-8) * (np.linalg.norm(b) + 1e-8)
     return float(np.dot(a, b) / denom)
 
+def cosine_unit(a: np.ndarray, b: np.ndarray) -> float:
+    """Cosine similarity of unit-length vectors (embed_text_local output): a plain dot."""
+    return float(np.dot(a, b))
+
+def cosine_batch(q: np.ndarray, mat: np.ndarray) -> np.ndarray:
+    """Similarity of a unit query to each unit row of mat, as one float32 matrix-vector product."""
+    return np.ascontiguousarray(mat, dtype=np.float32) @ np.asarray(q, dtype=np.float32)
+
 
@@ -1,14 +1,71 @@
-import base64, json, os, re, uuid
-from typing import Optional, Tuple, Dict, Any, List
+import atexit, hashlib, json, os, re, threading, uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple, Dict, Any, Iterable, Iterator, List
 import httpx
 from sqlalchemy.orm import Session
 
-from ..models import Project, RoadmapItem, PRD, DesignCheck, ResearchNote, RunDB, PullRequest
+from ..models import Project, RoadmapItem, RunDB, PullRequest
 from ..security import audit_event
-from ..discovery import dor_check
+from ..discovery import dor_check, dor_check_from_objs, latest_discovery_artifacts
 
 GITHUB_API_BASE = os.getenv("GITHUB_API_BASE", "https://api.github.com")
 
+# One pooled client per process: PR flows make many calls to the same host, and a
+# fresh Client per helper paid a new TCP+TLS handshake each time. Created lazily so
+# tests can patch _client before any request.
+_CLIENT: Optional[httpx.Client] = None
+_CLIENT_LOCK = threading.Lock()
+
+def _client() -> httpx.Client:
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = httpx.Client(limits=httpx.Limits(max_keepalive_connections=20, max_connections=100))
+                atexit.register(_CLIENT.close)
+    return _CLIENT
+
+# Publishes a head SHA's commit statuses (at most four contexts) concurrently; threads share
+# the pooled client, which is safe for concurrent use.
+_STATUS_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="github-status")
+
+# Conditional-GET cache: (token digest, url, params) -> (etag, raw body, next page url). LRU-bounded.
+_ETAG_CACHE: "OrderedDict[tuple, Tuple[str, bytes, Optional[str]]]" = OrderedDict()
+_ETAG_CACHE_LOCK = threading.Lock()
+_ETAG_CACHE_MAXSIZE = 1024
+
+def _cached_get_page(client: httpx.Client, url: str, headers: dict, params: Optional[dict] = None) -> Tuple[Any, Optional[str]]:
+    """
+    GET that replays the stored ETag as If-None-Match. GitHub answers an unchanged resource
+    with 304, which does not count against the rate limit. Bodies are kept raw and parsed
+    per call so callers never share mutable results. Keys include a digest of the token so
+    one tenant's view is never served to another. Returns the body and the Link "next" URL.
+    """
+    auth = hashlib.sha256(headers.get("Authorization", "").encode("utf-8")).hexdigest()
+    key = (auth, url, tuple(sorted((params or {}).items())))
+    with _ETAG_CACHE_LOCK:
+        hit = _ETAG_CACHE.get(key)
+    r = client.get(url, headers=({**headers, "If-None-Match": hit[0]} if hit else headers), params=params, timeout=30)
+    if r.status_code == 304 and hit:
+        with _ETAG_CACHE_LOCK:
+            if key in _ETAG_CACHE:
+                _ETAG_CACHE.move_to_end(key)
+        return json.loads(hit[1]), hit[2]
+    r.raise_for_status()
+    next_url = r.links.get("next", {}).get("url")
+    etag = r.headers.get("ETag")
+    if etag:
+        with _ETAG_CACHE_LOCK:
+            _ETAG_CACHE[key] = (etag, r.content, next_url)
+            _ETAG_CACHE.move_to_end(key)
+            while len(_ETAG_CACHE) > _ETAG_CACHE_MAXSIZE:
+                _ETAG_CACHE.popitem(last=False)
+    return r.json(), next_url
+
+def _cached_get(client: httpx.Client, url: str, headers: dict, params: Optional[dict] = None) -> Any:
+    return _cached_get_page(client, url, headers, params)[0]
+
 CTX_DOR = "ai-csuite/dor"
 CTX_HUMAN = "ai-csuite/human-approval"
 CTX_ARTIFACTS = "ai-csuite/artifacts"
@@ -41,10 +98,14 @@ _Updated automatically by AI‑CSuite on branch `{branch}`._
 {marker}
 """
 
-def _list_issue_comments(client: httpx.Client, owner: str, repo: str, number: int, headers: dict) -> list[dict]:
-    r = client.get(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/issues/{number}/comments", headers=headers, timeout=30)
-    r.raise_for_status()
-    return r.json()
+def _iter_issue_comments(client: httpx.Client, owner: str, repo: str, number: int, headers: dict) -> Iterator[dict]:
+    # Lazily follows Link: rel="next", so a consumer that stops early never fetches later pages
+    url: Optional[str] = f"{GITHUB_API_BASE}/repos/{owner}/{repo}/issues/{number}/comments"
+    params: Optional[dict] = {"per_page": 100}
+    while url:
+        page, url = _cached_get_page(client, url, headers, params)
+        params = None  # the next link already carries per_page and page
+        yield from page
 
 def _create_issue_comment(client: httpx.Client, owner: str, repo: str, number: int, body: str, headers: dict) -> dict:
     r = client.post(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/issues/{number}/comments", headers=headers, json={"body": body}, timeout=30)
@@ -56,7 +117,7 @@ def _update_issue_comment(client: httpx.Client, owner: str, repo: str, comment_i
     r.raise_for_status()
     return r.json()
 
-def _find_marker_comment_id(comments: list[dict], branch: str) -> int | None:
+def _find_marker_comment_id(comments: Iterable[dict], branch: str) -> int | None:
     marker = f"{COMMENT_MARKER_PREFIX}:{branch}"
     for c in comments:
         if isinstance(c.get("body"), str) and marker in c["body"]:
@@ -78,9 +139,6 @@ def _parse_repo_url(url: str) -> Optional[Tuple[str, str]]:
     owner, repo = m.group(1), m.group(2)
     return owner, repo
 
-def _b64(content: bytes) -> str:
-    return base64.b64encode(content).decode("ascii")
-
 def _headers(token: str) -> dict:
     return {
         "Authorization": f"Bearer {token}",
@@ -89,14 +147,10 @@ def _headers(token: str) -> dict:
     }
 
 def _get_repo(client: httpx.Client, owner: str, repo: str, headers: dict):
-    r = client.get(f"{GITHUB_API_BASE}/repos/{owner}/{repo}", headers=headers, timeout=30)
-    r.raise_for_status()
-    return r.json()
+    return _cached_get(client, f"{GITHUB_API_BASE}/repos/{owner}/{repo}", headers)
 
 def _get_ref(client: httpx.Client, owner: str, repo: str, branch: str, headers: dict):
-    r = client.get(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/git/ref/heads/{branch}", headers=headers, timeout=30)
-    r.raise_for_status()
-    return r.json()
+    return _cached_get(client, f"{GITHUB_API_BASE}/repos/{owner}/{repo}/git/ref/heads/{branch}", headers)
 
 def _create_branch(client: httpx.Client, owner: str, repo: str, new_branch: str, base_sha: str, headers: dict):
     body = {"ref": f"refs/heads/{new_branch}", "sha": base_sha}
@@ -108,21 +162,52 @@ def _create_branch(client: httpx.Client, owner: str, repo: str, new_branch: str,
     r.raise_for_status()
     return r.json()
 
-def _get_file_sha_if_exists(client: httpx.Client, owner: str, repo: str, path: str, branch: str, headers: dict) -> Optional[str]:
-    r = client.get(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/contents/{path}", headers=headers, params={"ref": branch}, timeout=30)
-    if r.status_code == 200:
-        return r.json().get("sha")
-    return None
+def _create_tree(client: httpx.Client, owner: str, repo: str, base_tree_sha: str, files: List[tuple[str, bytes]], headers: dict) -> str:
+    # Artifacts are UTF-8 text, so contents go inline in the tree instead of one blob POST per file
+    entries = [{"path": path, "mode": "100644", "type": "blob", "content": content.decode("utf-8")} for path, content in files]
+    r = client.post(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/git/trees", headers=headers, json={"base_tree": base_tree_sha, "tree": entries}, timeout=30)
+    r.raise_for_status()
+    return r.json()["sha"]
 
-def _put_file(client: httpx.Client, owner: str, repo: str, path: str, content: bytes, message: str, branch: str, headers: dict):
-    sha = _get_file_sha_if_exists(client, owner, repo, path, branch, headers)
-    body = {"message": message, "content": _b64(content), "branch": branch}
-    if sha:
-        body["sha"] = sha
-    r = client.put(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/contents/{path}", headers=headers, json=body, timeout=30)
+def _create_commit(client: httpx.Client, owner: str, repo: str, message: str, tree_sha: str, parent_sha: str, headers: dict) -> str:
+    r = client.post(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/git/commits", headers=headers, json={"message": message, "tree": tree_sha, "parents": [parent_sha]}, timeout=30)
+    r.raise_for_status()
+    return r.json()["sha"]
+
+def _update_ref(client: httpx.Client, owner: str, repo: str, branch: str, commit_sha: str, headers: dict):
+    # Fast-forward only: a concurrent push to the branch surfaces as a 422 instead of being overwritten
+    r = client.patch(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/git/refs/heads/{branch}", headers=headers, json={"sha": commit_sha, "force": False}, timeout=30)
     r.raise_for_status()
     return r.json()
 
+def _commit_files(client: httpx.Client, owner: str, repo: str, branch: str, files: List[tuple[str, bytes]], message: str, headers: dict, *, base_branch: Optional[str] = None) -> str:
+    """
+    Commit all files to the branch as a single commit through the Git Data API (ref, parent
+    commit, tree, commit, ref write: a fixed call count whatever the files). When the branch does
+    not exist yet and base_branch is given, it is created directly at the new commit on top of
+    base_branch. Returns the new head SHA, or the current one when the files are up to date.
+    """
+    create = False
+    try:
+        head_sha = _get_ref(client, owner, repo, branch, headers)["object"]["sha"]
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code != 404 or not base_branch:
+            raise
+        head_sha = _get_ref(client, owner, repo, base_branch, headers)["object"]["sha"]
+        create = True
+    r = client.get(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/git/commits/{head_sha}", headers=headers, timeout=30)
+    r.raise_for_status()
+    base_tree_sha = r.json()["tree"]["sha"]
+    tree_sha = _create_tree(client, owner, repo, base_tree_sha, files, headers)
+    commit_sha = head_sha if tree_sha == base_tree_sha else _create_commit(client, owner, repo, message, tree_sha, head_sha, headers)
+    if create:
+        if "object" not in _create_branch(client, owner, repo, branch, commit_sha, headers):
+            # Another writer created the branch first; commit on top of it instead
+            return _commit_files(client, owner, repo, branch, files, message, headers)
+    elif commit_sha != head_sha:
+        _update_ref(client, owner, repo, branch, commit_sha, headers)
+    return commit_sha
+
 def _create_pr(client: httpx.Client, owner: str, repo: str, head: str, base: str, title: str, body: str, headers: dict):
     r = client.post(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls",
                     headers=headers,
@@ -140,10 +225,12 @@ def _set_status(client: httpx.Client, owner: str, repo: str, sha: str, *, contex
     r.raise_for_status()
     return r.json()
 
+def _set_statuses(client: httpx.Client, owner: str, repo: str, sha: str, statuses: List[dict], headers: dict) -> List[dict]:
+    # Each context is an independent POST to /statuses/{sha}; publish them together
+    return list(_STATUS_POOL.map(lambda st: _set_status(client, owner, repo, sha, headers=headers, **st), statuses))
+
 def _get_combined_status(client: httpx.Client, owner: str, repo: str, sha: str, headers: dict) -> dict:
-    r = client.get(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/commits/{sha}/status", headers=headers, timeout=30)
-    r.raise_for_status()
-    return r.json()
+    return _cached_get(client, f"{GITHUB_API_BASE}/repos/{owner}/{repo}/commits/{sha}/status", headers)
 
 def _merge_pr(client: httpx.Client, owner: str, repo: str, number: int, *, method: str = "squash", commit_title: Optional[str] = None, commit_message: Optional[str] = None, headers: dict = {}):
     body: Dict[str, Any] = {"merge_method": method}
@@ -173,12 +260,12 @@ def verify_repo_access(repo_url: str) -> dict:
     if not parsed:
         return {"ok": False, "reason": "Unsupported repo_url (must be GitHub)"}
     owner, repo = parsed
-    with httpx.Client() as c:
-        try:
-            info = _get_repo(c, owner, repo, _headers(token))
-            return {"ok": True, "repo": f"{owner}/{repo}", "default_branch": info.get("default_branch", "main")}
-        except httpx.HTTPStatusError as e:
-            return {"ok": False, "reason": f"GitHub API error: {e.response.status_code} {e.response.text[:200]}"}
+    c = _client()
+    try:
+        info = _get_repo(c, owner, repo, _headers(token))
+        return {"ok": True, "repo": f"{owner}/{repo}", "default_branch": info.get("default_branch", "main")}
+    except httpx.HTTPStatusError as e:
+        return {"ok": False, "reason": f"GitHub API error: {e.response.status_code} {e.response.text[:200]}"}
 
 def open_pr_for_run(db: Session, run_id: str) -> dict:
     """
@@ -209,28 +296,13 @@ def open_pr_for_run(db: Session, run_id: str) -> dict:
         return {"skipped": "non-GitHub repo_url"}
     owner, repo = parsed
 
-    # Gather artifacts
-    prd = (
-        db.query(PRD)
-        .filter(PRD.project_id == run.project_id, PRD.roadmap_item_id == run.roadmap_item_id)
-        .order_by(PRD.created_at.desc())
-        .first()
-    )
-    design = (
-        db.query(DesignCheck)
-        .filter(DesignCheck.project_id == run.project_id, DesignCheck.roadmap_item_id == run.roadmap_item_id)
-        .order_by(DesignCheck.created_at.desc())
-        .first()
-    )
-    research = (
-        db.query(ResearchNote)
-        .filter(ResearchNote.project_id == run.project_id, ResearchNote.roadmap_item_id == run.roadmap_item_id)
-        .order_by(ResearchNote.created_at.desc())
-        .first()
-    )
-
-    # DoR summary (for PR + status)
-    ok, missing, _ = dor_check(db, run.tenant_id, run.project_id, run.roadmap_item_id) if run.roadmap_item_id else (True, [], {})
+    # Gather artifacts (one query) and derive the DoR summary from them (for PR + status)
+    if run.roadmap_item_id:
+        prd, design, research = latest_discovery_artifacts(db, run.tenant_id, run.project_id, run.roadmap_item_id)
+        ok, missing, _ = dor_check_from_objs(prd, design, research)
+    else:
+        prd = design = research = None
+        ok, missing = True, []
     item_title = (item.title if item else "Change")
     proj_name = project.name
 
@@ -285,70 +357,38 @@ _Accessibility notes:_
     files.append((run_meta_path, json.dumps(run_meta, indent=2).encode("utf-8")))
 
     headers = _headers(token)
-    with httpx.Client() as c:
-        # Repo & base branch
-        repo_info = _get_repo(c, owner, repo, headers)
-        base_branch = repo_info.get("default_branch", "main")
-        base_ref = _get_ref(c, owner, repo, base_branch, headers)
-        base_sha = base_ref["object"]["sha"]
-
-        # Create branch (idempotent)
-        _create_branch(c, owner, repo, branch, base_sha, headers)
-
-        # Commit files (one PUT per file)
-        for path, content in files:
-            _put_file(c, owner, repo, path, content, f"chore(ai-csuite): add artifacts for {item_title} (run {run.id[:8]})", branch, headers)
-
-        # Create PR (idempotent-ish)
-        try:
-            pr = _create_pr(c, owner, repo, head=branch, base=base_branch, title=pr_title, body=pr_body, headers=headers)
-        except httpx.HTTPStatusError as e:
-            r = c.get(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls", headers=headers, params={"state":"open","head":f"{owner}:{branch}"}, timeout=30)
-            if r.status_code == 200 and r.json():
-                pr = r.json()[0]
-            else:
-                raise
-
-        # Get head SHA of branch
-        head_ref = _get_ref(c, owner, repo, branch, headers)
-        head_sha = head_ref["object"]["sha"]
-
-        # Publish commit statuses
-        _set_status(
-            c, owner, repo, head_sha,
-            context=CTX_DOR,
-            state=("success" if ok else "failure"),
-            description=("DoR passed" if ok else "DoR blocked"),
-            headers=headers,
-        )
-        _set_status(
-            c, owner, repo, head_sha,
-            context=CTX_HUMAN,
-            state="pending",
-            description="Waiting for human approval",
-            headers=headers,
-        )
-        _set_status(
-            c, owner, repo, head_sha,
-            context=CTX_ARTIFACTS,
-            state="success",
-            description="Artifacts committed by AI‑CSuite",
-            headers=headers,
-        )
+    c = _client()
+    # Repo & base branch (ETag-revalidated, so repeat runs cost no rate limit)
+    repo_info = _get_repo(c, owner, repo, headers)
+    base_branch = repo_info.get("default_branch", "main")
+
+    # Commit files as one commit; a missing branch is created at that commit off the base branch
+    head_sha = _commit_files(c, owner, repo, branch, files, f"chore(ai-csuite): add artifacts for {item_title} (run {run.id[:8]})", headers, base_branch=base_branch)
+
+    # Create PR (idempotent-ish)
+    try:
+        pr = _create_pr(c, owner, repo, head=branch, base=base_branch, title=pr_title, body=pr_body, headers=headers)
+    except httpx.HTTPStatusError as e:
+        r = c.get(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls", headers=headers, params={"state":"open","head":f"{owner}:{branch}"}, timeout=30)
+        if r.status_code == 200 and r.json():
+            pr = r.json()[0]
+        else:
+            raise
+
+    # Publish commit statuses on the artifacts commit (the branch head)
+    _set_statuses(c, owner, repo, head_sha, [
+        {"context": CTX_DOR, "state": ("success" if ok else "failure"), "description": ("DoR passed" if ok else "DoR blocked")},
+        {"context": CTX_HUMAN, "state": "pending", "description": "Waiting for human approval"},
+        {"context": CTX_ARTIFACTS, "state": "success", "description": "Artifacts committed by AI‑CSuite"},
         # Initialize preview smoke gate as pending; real success set by preview smoke endpoint
-        _set_status(
-            c, owner, repo, head_sha,
-            context=CTX_PREVIEW,
-            state="pending",
-            description="Preview pending",
-            headers=headers,
-        )
+        {"context": CTX_PREVIEW, "state": "pending", "description": "Preview pending"},
+    ], headers)
 
-        # After publishing statuses, upsert summary comment (best-effort)
-        try:
-            _ = upsert_pr_summary_comment_for_run(db, run.id)
-        except Exception:
-            pass
+    # After publishing statuses, upsert summary comment (best-effort)
+    try:
+        _ = upsert_pr_summary_comment_for_run(db, run.id)
+    except Exception:
+        pass
 
     # Persist PR metadata
     pr_row = PullRequest(
@@ -380,21 +420,21 @@ def _pr_info_for_run(db: Session, run_id: str):
         return None, {"error": "no PR recorded for this run"}
     owner, repo = row.repo.split("/", 1)
     headers = _headers(token)
-    with httpx.Client() as c:
-        pr = c.get(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls/{row.number}", headers=headers, timeout=30)
-        pr.raise_for_status()
-        prj = pr.json()
-        head_sha = prj["head"]["sha"]
-        return {"owner": owner, "repo": repo, "number": row.number, "head_sha": head_sha, "branch": row.branch}, None
+    c = _client()
+    pr = c.get(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls/{row.number}", headers=headers, timeout=30)
+    pr.raise_for_status()
+    prj = pr.json()
+    head_sha = prj["head"]["sha"]
+    return {"owner": owner, "repo": repo, "number": row.number, "head_sha": head_sha, "branch": row.branch}, None
 
 def set_status_for_run(db: Session, run_id: str, *, context: str, state: str, description: str = "") -> dict:
     info, err = _pr_info_for_run(db, run_id)
     if err:
         return err
     headers = _headers(os.getenv("GITHUB_TOKEN",""))
-    with httpx.Client() as c:
-        res = _set_status(c, info["owner"], info["repo"], info["head_sha"], context=context, state=state, description=description, headers=headers)
-        return {"ok": True, "context": context, "state": state, "status_id": res.get("id")}
+    c = _client()
+    res = _set_status(c, info["owner"], info["repo"], info["head_sha"], context=context, state=state, description=description, headers=headers)
+    return {"ok": True, "context": context, "state": state, "status_id": res.get("id")}
 
 # ---- Phase 18 helpers: preview smoke status + marker upsert for branch (dry-run aware) ----
 def set_preview_status_for_branch(owner: str, repo: str, branch: str, *, state: str, description: str = "", target_url: str | None = None) -> dict:
@@ -405,15 +445,15 @@ def set_preview_status_for_branch(owner: str, repo: str, branch: str, *, state:
     if not token:
         return {"skipped": "GITHUB_TOKEN not set"}
     headers = _headers(token)
-    with httpx.Client() as c:
-        # Resolve head SHA for branch
-        try:
-            ref = _get_ref(c, owner, repo, branch, headers)
-            sha = ref["object"]["sha"]
-        except httpx.HTTPStatusError as e:
-            return {"error": f"cannot resolve branch '{branch}': {e.response.status_code}"}
-        res = _set_status(c, owner, repo, sha, context=CTX_PREVIEW, state=state, description=description, target_url=target_url, headers=headers)
-        return {"ok": True, "status_id": res.get("id"), "context": CTX_PREVIEW, "state": state}
+    c = _client()
+    # Resolve head SHA for branch
+    try:
+        ref = _get_ref(c, owner, repo, branch, headers)
+        sha = ref["object"]["sha"]
+    except httpx.HTTPStatusError as e:
+        return {"error": f"cannot resolve branch '{branch}': {e.response.status_code}"}
+    res = _set_status(c, owner, repo, sha, context=CTX_PREVIEW, state=state, description=description, target_url=target_url, headers=headers)
+    return {"ok": True, "status_id": res.get("id"), "context": CTX_PREVIEW, "state": state}
 
 def upsert_marker_comment_for_branch(owner: str, repo: str, branch: str, body: str) -> dict:
     # Dry-run aware; only attempts when token available
@@ -423,19 +463,18 @@ def upsert_marker_comment_for_branch(owner: str, repo: str, branch: str, body: s
     if not token:
         return {"skipped": "GITHUB_TOKEN not set"}
     headers = _headers(token)
-    with httpx.Client() as c:
-        # Find open PR by head
-        prs = c.get(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls", headers=headers, params={"state": "open", "head": f"{owner}:{branch}"}, timeout=30)
-        if prs.status_code != 200 or not prs.json():
-            return {"skipped": "no open PR for branch"}
-        number = prs.json()[0]["number"]
-        comments = _list_issue_comments(c, owner, repo, number, headers)
-        cid = _find_marker_comment_id(comments, branch)
-        if cid:
-            res = _update_issue_comment(c, owner, repo, cid, body, headers)
-        else:
-            res = _create_issue_comment(c, owner, repo, number, body, headers)
-        return {"ok": True, "comment_id": res.get("id"), "number": number}
+    c = _client()
+    # Find open PR by head
+    prs = c.get(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls", headers=headers, params={"state": "open", "head": f"{owner}:{branch}"}, timeout=30)
+    if prs.status_code != 200 or not prs.json():
+        return {"skipped": "no open PR for branch"}
+    number = prs.json()[0]["number"]
+    cid = _find_marker_comment_id(_iter_issue_comments(c, owner, repo, number, headers), branch)
+    if cid:
+        res = _update_issue_comment(c, owner, repo, cid, body, headers)
+    else:
+        res = _create_issue_comment(c, owner, repo, number, body, headers)
+    return {"ok": True, "comment_id": res.get("id"), "number": number}
 
 def approve_pr_for_run(db: Session, run_id: str) -> dict:
     res = set_status_for_run(db, run_id, context=CTX_HUMAN, state="success", description="Approved by human")
@@ -462,35 +501,38 @@ def statuses_for_run(db: Session, run_id: str) -> dict:
     info, err = _pr_info_for_run(db, run_id)
     if err:
         return err
+    return _statuses_for_info(info)
+
+def _statuses_for_info(info: dict) -> dict:
     headers = _headers(os.getenv("GITHUB_TOKEN",""))
-    with httpx.Client() as c:
-        comb = _get_combined_status(c, info["owner"], info["repo"], info["head_sha"], headers)
-        contexts = []
-        for s in comb.get("statuses", []):
-            contexts.append({
-                "context": s.get("context"),
-                "state": s.get("state"),
-                "description": s.get("description"),
-                "target_url": s.get("target_url"),
-                "updated_at": s.get("updated_at"),
-            })
-        req = _required_contexts()
-        # compute merge readiness
-        state_map = {s["context"]: s["state"] for s in contexts}
-        missing_ctx = [c for c in req if c not in state_map]
-        not_green = [c for c in req if state_map.get(c) != "success"]
-        can_merge = (len(missing_ctx) == 0 and len(not_green) == 0)
-        return {
-            "repo": f'{info["owner"]}/{info["repo"]}',
-            "number": info["number"],
-            "head_sha": info["head_sha"],
-            "state": comb.get("state"),  # overall state
-            "required_contexts": req,
-            "statuses": contexts,
-            "can_merge": can_merge,
-            "missing_contexts": missing_ctx,
-            "not_green": not_green,
-        }
+    c = _client()
+    comb = _get_combined_status(c, info["owner"], info["repo"], info["head_sha"], headers)
+    contexts = []
+    for s in comb.get("statuses", []):
+        contexts.append({
+            "context": s.get("context"),
+            "state": s.get("state"),
+            "description": s.get("description"),
+            "target_url": s.get("target_url"),
+            "updated_at": s.get("updated_at"),
+        })
+    req = _required_contexts()
+    # compute merge readiness
+    state_map = {s["context"]: s["state"] for s in contexts}
+    missing_ctx = [c for c in req if c not in state_map]
+    not_green = [c for c in req if state_map.get(c) != "success"]
+    can_merge = (len(missing_ctx) == 0 and len(not_green) == 0)
+    return {
+        "repo": f'{info["owner"]}/{info["repo"]}',
+        "number": info["number"],
+        "head_sha": info["head_sha"],
+        "state": comb.get("state"),  # overall state
+        "required_contexts": req,
+        "statuses": contexts,
+        "can_merge": can_merge,
+        "missing_contexts": missing_ctx,
+        "not_green": not_green,
+    }
 
 def upsert_pr_summary_comment_for_run(db: Session, run_id: str) -> dict:
     if not _write_enabled():
@@ -527,14 +569,13 @@ def upsert_pr_summary_comment_for_run(db: Session, run_id: str) -> dict:
     )
 
     headers = _headers(token)
-    with httpx.Client() as c:
-        comments = _list_issue_comments(c, owner, repo, number, headers)
-        cid = _find_marker_comment_id(comments, branch)
-        if cid:
-            res = _update_issue_comment(c, owner, repo, cid, body, headers)
-        else:
-            res = _create_issue_comment(c, owner, repo, number, body, headers)
-        return {"ok": True, "comment_id": res.get("id")}
+    c = _client()
+    cid = _find_marker_comment_id(_iter_issue_comments(c, owner, repo, number, headers), branch)
+    if cid:
+        res = _update_issue_comment(c, owner, repo, cid, body, headers)
+    else:
+        res = _create_issue_comment(c, owner, repo, number, body, headers)
+    return {"ok": True, "comment_id": res.get("id")}
 
 
 # ---- Phase 19: Budget status + summary append ----
@@ -546,15 +587,15 @@ def set_budget_status_for_branch(owner: str, repo: str, branch: str, *, state: s
     if not token:
         return {"skipped": "GITHUB_TOKEN not set"}
     headers = _headers(token)
-    with httpx.Client() as c:
-        # Resolve head SHA for branch
-        try:
-            ref = _get_ref(c, owner, repo, branch, headers)
-            sha = ref["object"]["sha"]
-        except httpx.HTTPStatusError as e:
-            return {"error": f"cannot resolve branch '{branch}': {e.response.status_code}"}
-        res = _set_status(c, owner, repo, sha, context=CTX_BUDGET, state=state, description=description, target_url=target_url, headers=headers)
-        return {"ok": True, "status_id": res.get("id"), "context": CTX_BUDGET, "state": state}
+    c = _client()
+    # Resolve head SHA for branch
+    try:
+        ref = _get_ref(c, owner, repo, branch, headers)
+        sha = ref["object"]["sha"]
+    except httpx.HTTPStatusError as e:
+        return {"error": f"cannot resolve branch '{branch}': {e.response.status_code}"}
+    res = _set_status(c, owner, repo, sha, context=CTX_BUDGET, state=state, description=description, target_url=target_url, headers=headers)
+    return {"ok": True, "status_id": res.get("id"), "context": CTX_BUDGET, "state": state}
 
 
 def upsert_pr_summary_comment_for_run_with_budget(db: Session, run_id: str, budget_md: str) -> dict:
@@ -596,14 +637,13 @@ def upsert_pr_summary_comment_for_run_with_budget(db: Session, run_id: str, budg
         body = base_body + "\n" + budget_md + "\n" + marker
 
     headers = _headers(token)
-    with httpx.Client() as c:
-        comments = _list_issue_comments(c, owner, repo, number, headers)
-        cid = _find_marker_comment_id(comments, branch)
-        if cid:
-            res = _update_issue_comment(c, owner, repo, cid, body, headers)
-        else:
-            res = _create_issue_comment(c, owner, repo, number, body, headers)
-        return {"ok": True, "comment_id": res.get("id")}
+    c = _client()
+    cid = _find_marker_comment_id(_iter_issue_comments(c, owner, repo, number, headers), branch)
+    if cid:
+        res = _update_issue_comment(c, owner, repo, cid, body, headers)
+    else:
+        res = _create_issue_comment(c, owner, repo, number, body, headers)
+    return {"ok": True, "comment_id": res.get("id")}
 
 # ---- Phase 20: Alerts status + summary append (dry-run aware) ----
 def set_alerts_status_for_branch(owner: str, repo: str, branch: str, *, state: str, description: str = "", target_url: str | None = None) -> dict:
@@ -613,14 +653,14 @@ def set_alerts_status_for_branch(owner: str, repo: str, branch: str, *, state: s
     if not token:
         return {"skipped": "GITHUB_TOKEN not set"}
     headers = _headers(token)
-    with httpx.Client() as c:
-        try:
-            ref = _get_ref(c, owner, repo, branch, headers)
-            sha = ref["object"]["sha"]
-        except httpx.HTTPStatusError as e:
-            return {"error": f"cannot resolve branch '{branch}': {e.response.status_code}"}
-        res = _set_status(c, owner, repo, sha, context=CTX_ALERTS, state=state, description=description, target_url=target_url, headers=headers)
-        return {"ok": True, "status_id": res.get("id"), "context": CTX_ALERTS, "state": state}
+    c = _client()
+    try:
+        ref = _get_ref(c, owner, repo, branch, headers)
+        sha = ref["object"]["sha"]
+    except httpx.HTTPStatusError as e:
+        return {"error": f"cannot resolve branch '{branch}': {e.response.status_code}"}
+    res = _set_status(c, owner, repo, sha, context=CTX_ALERTS, state=state, description=description, target_url=target_url, headers=headers)
+    return {"ok": True, "status_id": res.get("id"), "context": CTX_ALERTS, "state": state}
 
 def upsert_pr_summary_comment_for_run_with_ops(db: Session, run_id: str, ops_md: str) -> dict:
     if not _write_enabled():
@@ -659,85 +699,71 @@ def upsert_pr_summary_comment_for_run_with_ops(db: Session, run_id: str, ops_md:
         body = base_body + "\n" + ops_md + "\n" + marker
 
     headers = _headers(token)
-    with httpx.Client() as c:
-        comments = _list_issue_comments(c, owner, repo, number, headers)
-        cid = _find_marker_comment_id(comments, branch)
-        if cid:
-            res = _update_issue_comment(c, owner, repo, cid, body, headers)
-        else:
-            res = _create_issue_comment(c, owner, repo, number, body, headers)
-        return {"ok": True, "comment_id": res.get("id")}
+    c = _client()
+    cid = _find_marker_comment_id(_iter_issue_comments(c, owner, repo, number, headers), branch)
+    if cid:
+        res = _update_issue_comment(c, owner, repo, cid, body, headers)
+    else:
+        res = _create_issue_comment(c, owner, repo, number, body, headers)
+    return {"ok": True, "comment_id": res.get("id")}
 
 def merge_pr_for_run(db: Session, run_id: str, method: str = "squash") -> dict:
     info, err = _pr_info_for_run(db, run_id)
     if err:
         return err
-    # Check required statuses
-    st = statuses_for_run(db, run_id)
+    # Check required statuses (reuses the PR lookup above)
+    st = _statuses_for_info(info)
     if not st.get("can_merge"):
         return {"blocked": True, "reason": "required contexts not green", "details": st}
     headers = _headers(os.getenv("GITHUB_TOKEN",""))
-    with httpx.Client() as c:
-        res = _merge_pr(c, info["owner"], info["repo"], info["number"], method=method, headers=headers)
-        # update DB state
-        row = (
-            db.query(PullRequest)
-            .filter(PullRequest.run_id == run_id)
-            .order_by(PullRequest.created_at.desc())
-            .first()
-        )
-        if row:
-            row.state = "merged" if res.get("merged") else row.state
-            db.commit()
-        result = {"merged": bool(res.get("merged")), "message": res.get("message"), "sha": res.get("sha")}
-        try:
-            audit_event(db, actor="service", event_type="github.merge", run_id=run_id, request_id=f"{run_id}:gh:merge", details={"method": method, "result": result})
-        except Exception:
-            pass
-        return result
+    c = _client()
+    res = _merge_pr(c, info["owner"], info["repo"], info["number"], method=method, headers=headers)
+    # update DB state
+    row = (
+        db.query(PullRequest)
+        .filter(PullRequest.run_id == run_id)
+        .order_by(PullRequest.created_at.desc())
+        .first()
+    )
+    if row:
+        row.state = "merged" if res.get("merged") else row.state
+    result = {"merged": bool(res.get("merged")), "message": res.get("message"), "sha": res.get("sha")}
+    try:
+        audit_event(db, actor="service", event_type="github.merge", run_id=run_id, request_id=f"{run_id}:gh:merge", details={"method": method, "result": result}, commit=False)
+    except Exception:
+        pass
+    # PR state and audit row land in one transaction
+    db.commit()
+    return result
 
 # --- Phase 8 helpers: refresh artifacts for any PR branch ---
 import os, re, json
 from typing import Optional, Dict, Any, List
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 import httpx
 
-from ..models import Project, RoadmapItem, PRD, DesignCheck, ResearchNote
-from ..discovery import upsert_discovery_artifacts, dor_check
+from ..models import Project, RoadmapItem
+from ..discovery import upsert_discovery_artifacts, dor_check, dor_check_from_objs
 
 def _owner_repo_from_url(url: str) -> Optional[tuple[str, str]]:
     m = re.search(r"github\.com[:/]+([^/]+)/([^/.]+)", url or "")
     return (m.group(1), m.group(2)) if m else None
 
 def _project_for_owner_repo(db: Session, owner: str, repo: str) -> Optional[Project]:
-    # Fuzzy match on repo_url
-    candidates = db.query(Project).all()
-    for p in candidates:
-        pair = _owner_repo_from_url(p.repo_url or "")
-        if pair and pair == (owner, repo):
-            return p
+    # Fuzzy match on repo_url: every matching URL contains "owner/repo", so the database narrows
+    # the candidates and only those few are parsed; the full row is loaded for the match alone
+    candidates = db.execute(
+        select(Project.id, Project.repo_url).where(Project.repo_url.contains(f"{owner}/{repo}", autoescape=True))
+    ).all()
+    for pid, url in candidates:
+        if _owner_repo_from_url(url) == (owner, repo):
+            return db.get(Project, pid)
     return None
 
-def _commit_artifacts_to_branch(db: Session, owner: str, repo: str, branch: str, project: Project, item: RoadmapItem, headers: dict):
-    # Fetch latest artifacts for item
-    prd = (
-        db.query(PRD)
-        .filter(PRD.project_id == project.id, PRD.roadmap_item_id == item.id)
-        .order_by(PRD.created_at.desc())
-        .first()
-    )
-    design = (
-        db.query(DesignCheck)
-        .filter(DesignCheck.project_id == project.id, DesignCheck.roadmap_item_id == item.id)
-        .order_by(DesignCheck.created_at.desc())
-        .first()
-    )
-    research = (
-        db.query(ResearchNote)
-        .filter(ResearchNote.project_id == project.id, ResearchNote.roadmap_item_id == item.id)
-        .order_by(ResearchNote.created_at.desc())
-        .first()
-    )
+def _commit_artifacts_to_branch(owner: str, repo: str, branch: str, project: Project, item: RoadmapItem, artifacts: tuple, headers: dict) -> str:
+    # artifacts: latest (prd, design, research) rows, as returned by upsert_discovery_artifacts
+    prd, design, research = artifacts
 
     files: List[tuple[str, bytes]] = []
     base_dir = f"docs/roadmap/{item.id[:8]}-{_slug(item.title)}"
@@ -766,9 +792,7 @@ _Accessibility notes:_
     refresh_meta = {"project_id": project.id, "roadmap_item_id": item.id, "branch": branch}
     files.append((run_meta_path, json.dumps(refresh_meta, indent=2).encode("utf-8")))
 
-    with httpx.Client() as c:
-        for path, content in files:
-            _put_file(c, owner, repo, path, content, f"chore(ai-csuite): refresh artifacts for {item.title}", branch, headers)
+    return _commit_files(_client(), owner, repo, branch, files, f"chore(ai-csuite): refresh artifacts for {item.title}", headers)
 
 def _summarize_statuses(client: httpx.Client, owner: str, repo: str, sha: str) -> Dict[str, Any]:
     comb = _get_combined_status(client, owner, repo, sha, _headers(os.getenv("GITHUB_TOKEN","")))
@@ -832,54 +856,50 @@ def ensure_and_update_for_branch_event(db: Session, owner: str, repo: str, branc
             return {"skipped": f"no roadmap item with id prefix {prefix}"}
 
     # Ensure artifacts (force refresh)
-    upsert_discovery_artifacts(db, item.tenant_id, project.id, item.id, force=True)
+    ensured = upsert_discovery_artifacts(db, item.tenant_id, project.id, item.id, force=True)
+    # The refreshed rows are the latest ones; gate on them instead of re-selecting
+    ok, missing, _ = dor_check_from_objs(*ensured["artifacts"])
 
     headers = _headers(token)
     base_dir = f"docs/roadmap/{item.id[:8]}-{_slug(item.title)}"
-    with httpx.Client() as c:
-        # If writes are disabled OR token missing, return a dry-run summary
-        if not _write_enabled() or not token:
-            ok, missing, _ = dor_check(db, item.tenant_id, project.id, item.id)
-            return {
-                "dry_run": True,
-                "owner": owner, "repo": repo, "branch": branch,
-                "dor_pass": ok, "missing": missing, "base_dir": base_dir
-            }
-
-        _commit_artifacts_to_branch(db, owner, repo, branch, project, item, headers)
-        head_ref = _get_ref(c, owner, repo, branch, headers)
-        head_sha = head_ref["object"]["sha"]
-
-        ok, missing, _ = dor_check(db, item.tenant_id, project.id, item.id)
-        _set_status(c, owner, repo, head_sha, context=CTX_DOR,
-                    state=("success" if ok else "failure"),
-                    description=("DoR passed" if ok else f"DoR blocked: {', '.join(missing)}"),
-                    headers=headers)
-        _set_status(c, owner, repo, head_sha, context=CTX_ARTIFACTS,
-                    state="success", description="Artifacts refreshed by AI‑CSuite", headers=headers)
-
-        # Upsert summary comment (best-effort)
-        try:
-            # Try to find PR by head ref; if provided as 'number', prefer that
-            pr_num = number
-            if not pr_num:
-                prs = c.get(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls", headers=headers,
-                            params={"state": "open", "head": f"{owner}:{branch}"}, timeout=30)
-                if prs.status_code == 200 and prs.json():
-                    pr_num = prs.json()[0]["number"]
-            if pr_num:
-                comments = _list_issue_comments(c, owner, repo, pr_num, headers)
-                cid = _find_marker_comment_id(comments, branch)
-                body = build_pr_summary_md(project_name=project.name, item_title=item.title,
-                                           branch=branch, dor_pass=ok, missing=missing,
-                                           owner=owner, repo=repo, base_dir=base_dir)
-                if cid:
-                    _update_issue_comment(c, owner, repo, cid, body, headers)
-                else:
-                    _create_issue_comment(c, owner, repo, pr_num, body, headers)
-        except Exception:
-            pass
-
-        summary = _summarize_statuses(c, owner, repo, head_sha)
-        summary.update({"owner": owner, "repo": repo, "branch": branch, "head_sha": head_sha, "pr_number": number})
-        return summary
+    c = _client()
+    # If writes are disabled OR token missing, return a dry-run summary
+    if not _write_enabled() or not token:
+        return {
+            "dry_run": True,
+            "owner": owner, "repo": repo, "branch": branch,
+            "dor_pass": ok, "missing": missing, "base_dir": base_dir
+        }
+
+    head_sha = _commit_artifacts_to_branch(owner, repo, branch, project, item, ensured["artifacts"], headers)
+
+    _set_statuses(c, owner, repo, head_sha, [
+        {"context": CTX_DOR, "state": ("success" if ok else "failure"),
+         "description": ("DoR passed" if ok else f"DoR blocked: {', '.join(missing)}")},
+        {"context": CTX_ARTIFACTS, "state": "success", "description": "Artifacts refreshed by AI‑CSuite"},
+    ], headers)
+
+    # Upsert summary comment (best-effort)
+    try:
+        # Try to find PR by head ref; if provided as 'number', prefer that
+        pr_num = number
+        if not pr_num:
+            prs = c.get(f"{GITHUB_API_BASE}/repos/{owner}/{repo}/pulls", headers=headers,
+                        params={"state": "open", "head": f"{owner}:{branch}"}, timeout=30)
+            if prs.status_code == 200 and prs.json():
+                pr_num = prs.json()[0]["number"]
+        if pr_num:
+            cid = _find_marker_comment_id(_iter_issue_comments(c, owner, repo, pr_num, headers), branch)
+            body = build_pr_summary_md(project_name=project.name, item_title=item.title,
+                                       branch=branch, dor_pass=ok, missing=missing,
+                                       owner=owner, repo=repo, base_dir=base_dir)
+            if cid:
+                _update_issue_comment(c, owner, repo, cid, body, headers)
+            else:
+                _create_issue_comment(c, owner, repo, pr_num, body, headers)
+    except Exception:
+        pass
+
+    summary = _summarize_statuses(c, owner, repo, head_sha)
+    summary.update({"owner": owner, "repo": repo, "branch": branch, "head_sha": head_sha, "pr_number": number})
+    return summary
@@ -170,6 +170,24 @@ def list_partners() -> List[Dict[str, Any]]:
     return out
 
 
+def list_partners_flat() -> List[Dict[str, Any]]:
+    # One flat row per partner in the cockpit table's column order; reads entries directly
+    _ensure_registry()
+    out: List[Dict[str, Any]] = []
+    for pid, e in sorted(_REGISTRY.items(), key=lambda kv: kv[0]):
+        c = e.state.counters
+        out.append({
+            "partner_id": pid,
+            "circuit_state": e.state.circuit_state,
+            "rate_remaining": e.state.tokens,
+            "calls": int(c.calls),
+            "retries": int(c.retries),
+            "failures": int(c.failures),
+            "deduped": int(c.deduped),
+        })
+    return out
+
+
 def _get(pid: str) -> _Entry:
     _ensure_registry()
     if pid not in _REGISTRY:
@@ -1,10 +1,16 @@
+import os
+import re
+import threading
+import time
 import uuid, math
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import List, Dict, Any, Tuple
 from io import BytesIO
 import numpy as np
+from sqlalchemy import event, insert, select, text as sql_text
 from sqlalchemy.orm import Session
-from .models import KbChunk
-from .embeddings import embed_text_local, cosine
+from .models import KbChunk, utcnow
+from .embeddings import embed_text_local, embed_query, cosine_batch
 
 def _chunk_text(text: str, target_chars: int = 800, overlap: int = 120) -> List[str]:
     """
@@ -25,52 +31,183 @@ def _chunk_text(text: str, target_chars: int = 800, overlap: int = 120) -> List[
         start = max(0, end - overlap)
     return chunks
 
-def ingest_text(db: Session, tenant_id: str, project_id: str, kind: str, ref_id: str, text: str) -> int:
-    chunks = _chunk_text(text)
-    count = 0
-    for c in chunks:
-        emb = embed_text_local(c)
-        row = KbChunk(
-            id=str(uuid.uuid4()),
-            tenant_id=tenant_id,
-            project_id=project_id,
-            kind=kind,
-            ref_id=ref_id or "",
-            text=c,
-            emb=emb,
-        )
-        db.add(row)
-        count += 1
+def ingest_text(db: Session, tenant_id: str, project_id: str, kind: str, ref_id: str, text: str, *, commit: bool = True) -> int:
+    """
+    Chunk, embed and store text. With commit=False the chunks are staged in the
+    caller's transaction; the search cache is invalidated once that transaction commits.
+    """
+    rows = [
+        {
+            "id": str(uuid.uuid4()),
+            "tenant_id": tenant_id,
+            "project_id": project_id,
+            "kind": kind,
+            "ref_id": ref_id or "",
+            "text": c,
+            "emb": embed_text_local(c),
+            "created_at": utcnow(),
+        }
+        for c in _chunk_text(text)
+    ]
+    count = len(rows)
+    if rows:
+        # One executemany INSERT for all chunks instead of a unit-of-work flush per row
+        db.execute(insert(KbChunk), rows)
+    if not commit:
+        if count:
+            db.info.setdefault(_PENDING_BUMPS, set()).add((tenant_id, project_id))
+        return count
     db.commit()
+    if count:
+        _bump_version(tenant_id, project_id)
     return count
 
+# Top-k over the same recent-chunk window, scored by pgvector in one round-trip.
+# emb is stored as JSON (portable with SQLite); its text form is valid vector input.
+# Embeddings are unit length, so the inner product (<#> is its negation) is the cosine.
+# Ties (identical chunk text) keep the recency order of the numpy ranking.
+_PG_SEARCH_SQL = sql_text(
+    """
+    SELECT id, kind, ref_id, text,
+           (CAST(CAST(emb AS TEXT) AS vector) <#> CAST(:q AS vector)) * -1 AS score
+    FROM (
+        SELECT id, kind, ref_id, text, emb, created_at
+        FROM kb_chunks
+        WHERE tenant_id = :tenant_id AND project_id = :project_id
+        ORDER BY created_at DESC, id
+        LIMIT 500
+    ) recent
+    ORDER BY score DESC, created_at DESC, id
+    LIMIT :k
+    """
+)
+
+# Whether each Postgres database has the pgvector extension. create_all does not
+# install it (only db/schema.sql does, on a fresh volume), so it is probed once per
+# database URL and search() falls back to the numpy ranking without it.
+_PGVECTOR: Dict[str, bool] = {}
+
+
+def _has_pgvector(db: Session) -> bool:
+    bind = db.get_bind()
+    key = str(bind.engine.url)
+    found = _PGVECTOR.get(key)
+    if found is None:
+        found = db.execute(sql_text("SELECT 1 FROM pg_extension WHERE extname = 'vector'")).first() is not None
+        _PGVECTOR[key] = found
+    return found
+
+
 def search(db: Session, tenant_id: str, project_id: str, query: str, k: int = 5) -> List[Dict[str, Any]]:
     """
-    Simple in-DB fetch then Python-side cosine ranking (keeps SQLite-compatible tests).
+    Rank the 500 most recent chunks by cosine similarity to the query.
+    Postgres with pgvector scores and limits in SQL; SQLite (and Postgres
+    without the extension) keep a vectorized Python-side ranking.
     """
     if not query:
         return []
-    q_emb = np.array(embed_text_local(query), dtype=np.float32)
-    rows = (
-        db.query(KbChunk)
-          .filter(KbChunk.tenant_id == tenant_id, KbChunk.project_id == project_id)
-          .order_by(KbChunk.created_at.desc())
-          .limit(500)
-          .all()
-    )
-    scored = []
-    for r in rows:
-        v = np.array(r.emb, dtype=np.float32)
-        s = cosine(q_emb, v)
-        scored.append((s, r))
-    scored.sort(key=lambda t: t[0], reverse=True)
-    top = scored[:max(1, k)]
+    q_emb = embed_query(query)
+    k = max(1, k)
+    if db.get_bind().dialect.name == "postgresql" and _has_pgvector(db):
+        rows = db.execute(
+            _PG_SEARCH_SQL,
+            {"q": str(q_emb.tolist()), "tenant_id": tenant_id, "project_id": project_id, "k": k},
+        ).all()
+        return [
+            {"id": r.id, "kind": r.kind, "ref_id": r.ref_id, "text": r.text, "score": round(float(r.score), 4)}
+            for r in rows
+        ]
+
+    rows = db.execute(
+        select(KbChunk.id, KbChunk.kind, KbChunk.ref_id, KbChunk.text, KbChunk.emb)
+        .where(KbChunk.tenant_id == tenant_id, KbChunk.project_id == project_id)
+        .order_by(KbChunk.created_at.desc(), KbChunk.id)
+        .limit(500)
+    ).all()
+    if not rows:
+        return []
+    # Stored chunks (embed_text_local) and the query (embed_query) are both unit length
+    scores = cosine_batch(q_emb, [r.emb for r in rows])
+    # Stable descending order keeps ties in recency order, as the per-row sort did
+    order = np.argsort(-scores, kind="stable")[:k]
     return [
-        {"id": r.id, "kind": r.kind, "ref_id": r.ref_id, "text": r.text, "score": round(float(s), 4)}
-        for s, r in top
+        {"id": rows[i].id, "kind": rows[i].kind, "ref_id": rows[i].ref_id, "text": rows[i].text,
+         "score": round(float(scores[i]), 4)}
+        for i in order
     ]
 
 
+# Opt-in bounded TTL/LRU cache for repeated searches (e.g. discovery views re-querying
+# the same item title). Entries are keyed on a per-(tenant, project) version that
+# ingest_text bumps, so new chunks invalidate stale results in this process only.
+# Other workers keep serving their copy until the TTL expires, so it is off by
+# default (KB_CACHE_TTL_SECONDS=0); enable it only with WEB_CONCURRENCY=1 or when
+# that staleness is acceptable.
+_CACHE_LOCK = threading.Lock()
+_SEARCH_CACHE: "OrderedDict[Tuple[Any, ...], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+_VERSIONS: Dict[Tuple[str, str], int] = {}
+
+
+def _cache_maxsize() -> int:
+    try:
+        return max(0, int(os.getenv("KB_CACHE_MAXSIZE", "4096")))
+    except Exception:
+        return 4096
+
+
+def _cache_ttl() -> float:
+    try:
+        return max(0.0, float(os.getenv("KB_CACHE_TTL_SECONDS", "0")))
+    except Exception:
+        return 0.0
+
+
+def _bump_version(tenant_id: str, project_id: str) -> None:
+    with _CACHE_LOCK:
+        key = (tenant_id, project_id)
+        _VERSIONS[key] = _VERSIONS.get(key, 0) + 1
+
+
+# (tenant, project) pairs staged by ingest_text(commit=False), kept in Session.info until
+# the transaction ends: bumped once each on commit, discarded on rollback.
+_PENDING_BUMPS = "kb_pending_version_bumps"
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_staged_versions(session: Session) -> None:
+    for tenant_id, project_id in session.info.pop(_PENDING_BUMPS, ()):
+        _bump_version(tenant_id, project_id)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_staged_versions(session: Session, previous_transaction) -> None:
+    # A savepoint rollback leaves the outer transaction open; its staged chunks may still commit
+    if not session.in_transaction():
+        session.info.pop(_PENDING_BUMPS, None)
+
+
+def search_cached(db: Session, tenant_id: str, project_id: str, query: str, k: int = 5) -> List[Dict[str, Any]]:
+    """
+    search() behind an in-process TTL/LRU cache. Returns fresh copies of the hit dicts.
+    """
+    maxsize, ttl = _cache_maxsize(), _cache_ttl()
+    if maxsize == 0 or ttl == 0:
+        return search(db, tenant_id, project_id, query, k=k)
+    with _CACHE_LOCK:
+        key = (tenant_id, project_id, query, k, _VERSIONS.get((tenant_id, project_id), 0))
+        hit = _SEARCH_CACHE.get(key)
+        if hit is not None and hit[0] > time.monotonic():
+            _SEARCH_CACHE.move_to_end(key)
+            return [dict(h) for h in hit[1]]
+    hits = search(db, tenant_id, project_id, query, k=k)
+    with _CACHE_LOCK:
+        _SEARCH_CACHE[key] = (time.monotonic() + ttl, [dict(h) for h in hits])
+        _SEARCH_CACHE.move_to_end(key)
+        while len(_SEARCH_CACHE) > maxsize:
+            _SEARCH_CACHE.popitem(last=False)
+    return hits
+
+
 def ingest_document(db: Session, tenant_id: str, project_id: str, kind: str, ref_id: str, text: str) -> int:
     """
     Deterministic document ingestion helper. Normalizes to chunks, embeds locally,
@@ -80,6 +217,15 @@ def ingest_document(db: Session, tenant_id: str, project_id: str, kind: str, ref
     return ingest_text(db, tenant_id=tenant_id, project_id=project_id, kind=kind, ref_id=ref_id, text=text)
 
 
+_MD_FENCE_RE = re.compile(r"```[\s\S]*?```")
+_MD_IMAGE_RE = re.compile(r"!\[([^\]]*)\]\([^)]*\)")
+_MD_LINK_RE = re.compile(r"\[([^\]]+)\]\([^)]*\)")
+_MD_HEADING_RE = re.compile(r"^(#{1,6})\s*")
+_MD_QUOTE_RE = re.compile(r"^>+\s*")
+_MD_LIST_RE = re.compile(r"^([\-*+])\s+")
+_MD_BLANKS_RE = re.compile(r"\n{3,}")
+
+
 def markdown_to_text(text: str) -> str:
     """
     Very small, deterministic markdown → text normalizer:
@@ -90,18 +236,16 @@ def markdown_to_text(text: str) -> str:
     - Remove emphasis markers (*, _, ~) while preserving inner text
     - Collapse excessive blank lines
     """
-    import re
-
     s = (text or "").replace("\r\n", "\n").replace("\r", "\n")
     if not s:
         return ""
 
     # Remove fenced code blocks
-    s = re.sub(r"```[\s\S]*?```", "\n", s)
+    s = _MD_FENCE_RE.sub("\n", s)
 
     # Links and images
-    s = re.sub(r"!\[([^\]]*)\]\([^)]*\)", r"\1", s)  # images → alt text
-    s = re.sub(r"\[([^\]]+)\]\([^)]*\)", r"\1", s)    # links → label
+    s = _MD_IMAGE_RE.sub(r"\1", s)  # images → alt text
+    s = _MD_LINK_RE.sub(r"\1", s)    # links → label
 
     # Inline code backticks
     s = s.replace("`", "")
@@ -111,9 +255,9 @@ def markdown_to_text(text: str) -> str:
     for line in s.split("\n"):
         # Strip common markdown prefixes
         line2 = line.lstrip()
-        line2 = re.sub(r"^(#{1,6})\s*", "", line2)  # headings
-        line2 = re.sub(r"^>+\s*", "", line2)        # blockquote
-        line2 = re.sub(r"^([\-*+])\s+", "", line2) # list markers
+        line2 = _MD_HEADING_RE.sub("", line2)  # headings
+        line2 = _MD_QUOTE_RE.sub("", line2)        # blockquote
+        line2 = _MD_LIST_RE.sub("", line2) # list markers
         # Emphasis markers (keep inner text)
         line2 = line2.replace("**", "").replace("__", "")
         line2 = line2.replace("*", "").replace("_", "").replace("~", "")
@@ -123,7 +267,7 @@ def markdown_to_text(text: str) -> str:
 
     s = "\n".join(lines)
     # Collapse 3+ newlines to 2, and strip
-    s = re.sub(r"\n{3,}", "\n\n", s).strip()
+    s = _MD_BLANKS_RE.sub("\n\n", s).strip()
     return s
 
 
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, Tuple
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return max(0.0, float(os.getenv(name, str(default))))
+    except Exception:
+        return default
+
+
+class ListCache:
+    """
+    Bounded in-process TTL/LRU cache for list pages. Cached rows are shared
+    between callers and must be treated as read-only (validated response models).
+
+    Keys are combined with a generation counter that invalidate() bumps, so a
+    write in this process makes every cached page of the list unreachable at
+    once. Other workers are not told about the write and keep serving their pages
+    until the TTL expires, so caching is opt-in: LIST_CACHE_TTL_SECONDS defaults
+    to 0 (disabled), mirroring kb.search_cached.
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Tuple[Any, ...], Tuple[float, Tuple[Any, ...]]]" = OrderedDict()
+        self._generation = 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], List[Any]]) -> List[Any]:
+        ttl = _env_float("LIST_CACHE_TTL_SECONDS", 0.0)
+        maxsize = int(_env_float("LIST_CACHE_MAXSIZE", 1024))
+        if ttl == 0 or maxsize == 0:
+            return loader()
+        with self._lock:
+            full_key = (self._generation, key)
+            hit = self._entries.get(full_key)
+            if hit is not None and hit[0] > time.monotonic():
+                self._entries.move_to_end(full_key)
+                self.hits += 1
+                return list(hit[1])
+            self.misses += 1
+        rows = loader()
+        with self._lock:
+            # A write that raced the load bumped the generation; this entry is then unreachable
+            self._entries[full_key] = (time.monotonic() + ttl, tuple(rows))
+            self._entries.move_to_end(full_key)
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+        return rows
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+projects_cache = ListCache("projects")
+roadmap_items_cache = ListCache("roadmap_items")
@@ -1,7 +1,7 @@
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import String, Text, Integer, DateTime, ForeignKey, Boolean, JSON, Index, UniqueConstraint
+from sqlalchemy import String, Text, Integer, DateTime, ForeignKey, Boolean, JSON, Index, UniqueConstraint, desc
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .db import Base
@@ -9,6 +9,10 @@ from .db import Base
 # Keep IDs as strings for cross-DB portability
 ID = String(36)
 
+def utcnow() -> datetime:
+    """Naive UTC timestamp (the stored convention) without the deprecated datetime.utcnow()."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 class Project(Base):
     __tablename__ = "projects"
     id: Mapped[str] = mapped_column(ID, primary_key=True)
@@ -16,7 +20,12 @@ class Project(Base):
     name: Mapped[str] = mapped_column(String(255))
     description: Mapped[str] = mapped_column(Text, default="")
     repo_url: Mapped[str] = mapped_column(Text, default="")
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow)
+
+    __table_args__ = (
+        # list_projects: WHERE tenant_id = ? ORDER BY created_at DESC, id DESC (keyset)
+        Index("ix_projects_tenant_created", "tenant_id", "created_at", "id"),
+    )
 
 class RoadmapItem(Base):
     __tablename__ = "roadmap_items"
@@ -29,6 +38,12 @@ class RoadmapItem(Base):
     priority: Mapped[int] = mapped_column(Integer, default=100)
     target_release: Mapped[str] = mapped_column(String(64), default="")
 
+    __table_args__ = (
+        # list_roadmap_items: WHERE project_id|tenant_id = ? ORDER BY priority, id (keyset)
+        Index("ix_roadmap_project_priority", "project_id", "priority", "id"),
+        Index("ix_roadmap_tenant_priority", "tenant_id", "priority", "id"),
+    )
+
 class RunDB(Base):
     __tablename__ = "runs"
     id: Mapped[str] = mapped_column(ID, primary_key=True)
@@ -37,7 +52,7 @@ class RunDB(Base):
     roadmap_item_id: Mapped[Optional[str]] = mapped_column(ID, nullable=True)
     phase: Mapped[str] = mapped_column(String(32), default="delivery")   # discovery|delivery|release
     status: Mapped[str] = mapped_column(String(32), default="pending")   # pending|running|succeeded|blocked
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow)
 
 # ---------- Discovery artifacts ----------
 class PRD(Base):
@@ -48,7 +63,13 @@ class PRD(Base):
     roadmap_item_id: Mapped[str] = mapped_column(ID)
     version: Mapped[str] = mapped_column(String(16), default="v0")
     prd_json: Mapped[dict] = mapped_column(JSON, default=dict)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow)
+
+    __table_args__ = (
+        # Latest artifact per roadmap item (discovery status, DoR gate): equality on the
+        # scope columns, then created_at for the ORDER BY and id so LIMIT 1 never hits the heap
+        Index("ix_prds_latest", "roadmap_item_id", "tenant_id", "project_id", "created_at", "id"),
+    )
 
 class DesignCheck(Base):
     __tablename__ = "design_checks"
@@ -59,7 +80,11 @@ class DesignCheck(Base):
     passes: Mapped[bool] = mapped_column(Boolean, default=True)
     heuristics_score: Mapped[int] = mapped_column(Integer, default=90)  # 0..100
     a11y_notes: Mapped[str] = mapped_column(Text, default="")
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow)
+
+    __table_args__ = (
+        Index("ix_design_checks_latest", "roadmap_item_id", "tenant_id", "project_id", "created_at", "id"),
+    )
 
 class ResearchNote(Base):
     __tablename__ = "research_notes"
@@ -69,7 +94,11 @@ class ResearchNote(Base):
     roadmap_item_id: Mapped[str] = mapped_column(ID)
     summary: Mapped[str] = mapped_column(Text, default="")
     evidence: Mapped[list] = mapped_column(JSON, default=list)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow)
+
+    __table_args__ = (
+        Index("ix_research_notes_latest", "roadmap_item_id", "tenant_id", "project_id", "created_at", "id"),
+    )
 
 from sqlalchemy import JSON as _JSON  # ensure JSON import exists for KbChunk
 
@@ -82,7 +111,7 @@ class KbChunk(Base):
     ref_id: Mapped[str] = mapped_column(String(64), default="")
     text: Mapped[str] = mapped_column(Text)
     emb: Mapped[list] = mapped_column(JSON, default=list)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow)
 
 
 # --- GitHub PR metadata ---
@@ -96,7 +125,12 @@ class PullRequest(Base):
     number: Mapped[int] = mapped_column(Integer)
     url: Mapped[str] = mapped_column(Text)
     state: Mapped[str] = mapped_column(String(32), default="open")
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow)
+
+    __table_args__ = (
+        # Latest PR per run: WHERE run_id = ? ORDER BY created_at DESC LIMIT 1
+        Index("ix_pr_run_created", "run_id", desc("created_at")),
+    )
 
 
 # --- Phase 11: Graph state persistence ---
@@ -111,8 +145,8 @@ class GraphState(Base):
     state_json: Mapped[dict] = mapped_column(JSON, default=dict)
     logs_json: Mapped[Optional[dict]] = mapped_column(JSON, nullable=True)
     error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow, onupdate=utcnow)
 
     __table_args__ = (
         UniqueConstraint("run_id", "step_index", "attempt", name="uq_graph_state_run_step_attempt"),
@@ -132,7 +166,7 @@ class BudgetUsage(Base):
     status: Mapped[str] = mapped_column(String(16), default="ok")  # ok|warn|blocked
     attempts: Mapped[int] = mapped_column(Integer, default=0)
     error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow, onupdate=utcnow)
 
     __table_args__ = (
         UniqueConstraint("run_id", "persona", name="uq_budget_run_persona"),
@@ -144,7 +178,7 @@ class BudgetUsage(Base):
 class AuditLog(Base):
     __tablename__ = "audit_logs"
     id: Mapped[str] = mapped_column(String(36), primary_key=True)
-    ts: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    ts: Mapped[datetime] = mapped_column(DateTime, default=utcnow)
     actor: Mapped[str] = mapped_column(String(64), default="system")
     event_type: Mapped[str] = mapped_column(String(64))
     run_id: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
@@ -167,7 +201,7 @@ class SchedulerItem(Base):
     tenant_id: Mapped[str] = mapped_column(String(36), index=True)
     priority: Mapped[int] = mapped_column(Integer, default=0, index=True)
     state: Mapped[str] = mapped_column(String(16), default="queued", index=True)  # queued|active|completed
-    enqueued_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    enqueued_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow)
 
     __table_args__ = (
         Index("ix_sched_state", "state"),
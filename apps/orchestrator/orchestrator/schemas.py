@@ -1,5 +1,5 @@
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pydantic import AliasChoices, BaseModel, ConfigDict, Field
 from typing import Optional, Literal, List, Any, Dict
 
 
@@ -493,6 +493,7 @@ class ProjectRead(BaseModel):
 
 # NEW: partial update for Project
 class ProjectUpdate(BaseModel):
+    model_config = ConfigDict(frozen=True)
     name: Optional[str] = None
     description: Optional[str] = None
     repo_url: Optional[str] = None
@@ -538,15 +539,18 @@ class RunRead(BaseModel):
 
 # ---------- Discovery artifacts ----------
 class PRDRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
     id: str
     tenant_id: str
     project_id: str
     roadmap_item_id: str
     version: str
-    prd: Dict[str, Any]
+    # ORM rows expose the payload as prd_json
+    prd: Dict[str, Any] = Field(validation_alias=AliasChoices("prd", "prd_json"))
     created_at: datetime
 
 class DesignCheckRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
     id: str
     tenant_id: str
     project_id: str
@@ -557,6 +561,7 @@ class DesignCheckRead(BaseModel):
     created_at: datetime
 
 class ResearchNoteRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
     id: str
     tenant_id: str
     project_id: str
@@ -566,6 +571,7 @@ class ResearchNoteRead(BaseModel):
     created_at: datetime
 
 class KbIngest(BaseModel):
+    model_config = ConfigDict(frozen=True)
     tenant_id: str
     project_id: str
     kind: str
@@ -573,6 +579,7 @@ class KbIngest(BaseModel):
     text: str
 
 class KbSearchResult(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
     id: str
     kind: str
     ref_id: str
@@ -581,6 +588,7 @@ class KbSearchResult(BaseModel):
 
 # --- Phase 13: file ingestion ---
 class KbFileIngest(BaseModel):
+    model_config = ConfigDict(frozen=True)
     tenant_id: str
     project_id: str
     filename: str
@@ -603,12 +611,14 @@ from typing import Optional, Literal
 
 # ---------- Projects ----------
 class ProjectCreate(BaseModel):
+    model_config = ConfigDict(frozen=True)
     tenant_id: str
     name: str
     description: str = ""
     repo_url: str = ""
 
 class ProjectRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
     id: str
     tenant_id: str
     name: str
@@ -620,6 +630,7 @@ class ProjectRead(BaseModel):
 Status = Literal["planned", "in_progress", "blocked", "done"]
 
 class RoadmapItemCreate(BaseModel):
+    model_config = ConfigDict(frozen=True)
     tenant_id: str
     project_id: str
     title: str
@@ -628,6 +639,7 @@ class RoadmapItemCreate(BaseModel):
     target_release: str = ""
 
 class RoadmapItemRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
     id: str
     tenant_id: str
     project_id: str
@@ -638,6 +650,7 @@ class RoadmapItemRead(BaseModel):
     target_release: str
 
 class RoadmapItemUpdate(BaseModel):
+    model_config = ConfigDict(frozen=True)
     title: Optional[str] = None
     description: Optional[str] = None
     status: Optional[Status] = None
@@ -645,12 +658,14 @@ class RoadmapItemUpdate(BaseModel):
 
 # ---------- Runs ----------
 class RunCreate(BaseModel):
+    model_config = ConfigDict(frozen=True)
     tenant_id: str
     project_id: str
     roadmap_item_id: str | None = None
     phase: str = "delivery"
 
 class RunRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
     id: str
     status: str
     created_at: datetime
@@ -663,10 +678,12 @@ from datetime import datetime
 from pydantic import BaseModel
 
 class GithubVerify(BaseModel):
+    model_config = ConfigDict(frozen=True)
     project_id: Optional[str] = None
     repo_url: Optional[str] = None
 
 class PRRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
     id: str
     run_id: str
     project_id: str
@@ -243,21 +243,48 @@ def audit_event(
     request_id: Optional[str] = None,
     details: Optional[Dict[str, Any]] = None,
     redaction_mode: Optional[str] = None,
+    details_redacted: Optional[Dict[str, Any]] = None,
+    commit: bool = True,
 ) -> Optional[str]:
     """
     Append-only audit log with idempotency on (event_type, run_id, request_id).
     Inputs are redacted via mask_dict.
+    Callers that already ran mask_dict(..., mode="strict") may pass the result as
+    details_redacted; it is stored as-is instead of being traversed a second time.
+    With commit=False the row is staged in the caller's transaction (duplicates are
+    skipped via ON CONFLICT DO NOTHING) and the caller's own db.commit() persists it.
     Returns audit id or None when disabled.
     """
     if not _audit_enabled():
         return None
     req_id = (request_id or "")[:64]
-    red_mode = redaction_mode or os.getenv("REDACTION_MODE", "strict")
-    red_details = mask_dict(details or {}, mode=red_mode)
+    if details_redacted is not None:
+        red_details = details_redacted
+    else:
+        red_mode = redaction_mode or os.getenv("REDACTION_MODE", "strict")
+        red_details = mask_dict(details or {}, mode=red_mode)
+    audit_id = str(uuid.uuid4())
+    dialect = db.get_bind().dialect.name
+    if not commit and dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as _insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as _insert
+        stmt = _insert(AuditLog).values(
+            id=audit_id,
+            actor=(actor or "system")[:64],
+            event_type=(event_type or "")[:64],
+            run_id=(run_id or None),
+            project_id=(project_id or None),
+            request_id=req_id,
+            details_redacted=red_details,
+        ).on_conflict_do_nothing()
+        res = db.execute(stmt)
+        return audit_id if res.rowcount else None
     # Idempotent insert: rely on unique constraint and ignore on conflict
     try:
         row = AuditLog(
-            id=str(uuid.uuid4()),
+            id=audit_id,
             actor=(actor or "system")[:64],
             event_type=(event_type or "")[:64],
             run_id=(run_id or None),
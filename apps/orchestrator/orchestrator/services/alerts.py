@@ -7,12 +7,12 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 
 from sqlalchemy import UniqueConstraint
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy import String, DateTime, Text, Integer
 from sqlalchemy.orm import Mapped, mapped_column
 
 from ..db import Base
-from ..models import GraphState, BudgetUsage, RunDB, PullRequest
+from ..models import GraphState, BudgetUsage, RunDB, PullRequest, utcnow
 from ..discovery import dor_check
 from .preview import PreviewDeployRow
 from ..integrations import github as gh
@@ -43,7 +43,7 @@ def _env_int(key: str, default: int) -> int:
 
 
 def _now() -> datetime:
-    return datetime.utcnow()
+    return utcnow()
 
 
 class AlertRow(Base):
@@ -239,6 +239,7 @@ class AlertsService:
         # Load recent history for SLOs and retry conditions
         rows = (
             db.query(GraphState)
+            .options(load_only(GraphState.step_index, GraphState.step_name, GraphState.attempt, GraphState.status))
             .filter(GraphState.run_id == run_id)
             .order_by(GraphState.step_index.asc(), GraphState.attempt.asc())
             .all()
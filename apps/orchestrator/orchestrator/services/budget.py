@@ -4,6 +4,7 @@ import json
 import math
 import os
 import uuid
+from collections import Counter
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
@@ -146,36 +147,24 @@ class BudgetService:
             persona_budget_usd[p] = usd_val
             persona_budget_cents[p] = int(round(usd_val * 100.0))
 
-        # Aggregate tokens/costs from persisted graph history
-        rows: List[GraphState] = (
-            db.query(GraphState)
-            .filter(GraphState.run_id == run_id)
-            .order_by(GraphState.step_index.asc(), GraphState.attempt.asc())
-            .all()
-        )
-        if not rows:
-            # Allow computing even if graph hasn't run; totals are zero
-            pass
+        # Aggregate tokens/costs from persisted graph history. Every attempt costs the same
+        # deterministic token count, so only attempt counts per step are needed (no state_json).
+        step_counts = Counter(name for (name,) in db.query(GraphState.step_name).filter(GraphState.run_id == run_id))
+        t_total = self.TOKENS_PER_ATTEMPT_TOTAL
+        t_in = int(math.floor(t_total * self.TOKENS_IN_FRACTION))
+        t_out = t_total - t_in
 
-        persona_totals: Dict[str, Dict[str, int]] = {p: {"tokens_in": 0, "tokens_out": 0, "tokens_total": 0} for p in persona_list}
-        totals = {"tokens_in": 0, "tokens_out": 0, "tokens_total": 0}
+        def _tokens(attempts: int) -> Dict[str, int]:
+            return {"tokens_in": attempts * t_in, "tokens_out": attempts * t_out, "tokens_total": attempts * t_total}
+
+        persona_attempts: Dict[str, int] = {}
+        for name, n in step_counts.items():
+            persona = _persona_for_step(name)
+            if persona:
+                persona_attempts[persona] = persona_attempts.get(persona, 0) + n
+        totals = _tokens(sum(step_counts.values()))
+        persona_totals: Dict[str, Dict[str, int]] = {p: _tokens(persona_attempts.get(p, 0)) for p in persona_list}
 
-        for r in rows:
-            # Deterministic tokens per attempt
-            t_total = self.TOKENS_PER_ATTEMPT_TOTAL
-            t_in = int(math.floor(t_total * self.TOKENS_IN_FRACTION))
-            t_out = t_total - t_in
-            totals["tokens_in"] += t_in
-            totals["tokens_out"] += t_out
-            totals["tokens_total"] += t_total
-
-            persona = _persona_for_step(r.step_name)
-            if persona and persona in persona_totals:
-                p = persona_totals[persona]
-                p["tokens_in"] += t_in
-                p["tokens_out"] += t_out
-                p["tokens_total"] += t_total
-        
         # Compute costs post-aggregation to preserve fractional cents
         totals_cost_cents = _cost_cents_for_tokens(totals["tokens_total"], rate.usd_per_1k_tokens)
         totals_cost_usd = (totals["tokens_total"] / 1000.0) * rate.usd_per_1k_tokens
@@ -194,12 +183,14 @@ class BudgetService:
 
         # Upsert ledger rows (idempotent)
         self._upsert_ledger(db, run_id, None, totals_with_cost, status)
+        # Persona status vs persona budget (defaults to run budget when not specified); one pass
+        # feeds both the ledger and the persona outputs used for summary + GH comment
+        personas_out = []
         for persona in persona_list:
-            p = persona_totals.get(persona, {"tokens_in": 0, "tokens_out": 0, "tokens_total": 0})
-            # Compute persona status vs persona budget (defaults to run budget when not specified)
+            p = persona_totals[persona]
             p_budget_usd = persona_budget_usd.get(persona, run_budget_usd_val)
-            p_cost_usd = (p.get("tokens_total", 0) / 1000.0) * rate.usd_per_1k_tokens
-            p_cost = _cost_cents_for_tokens(p.get("tokens_total", 0), rate.usd_per_1k_tokens)
+            p_cost_usd = (p["tokens_total"] / 1000.0) * rate.usd_per_1k_tokens
+            p_cost = _cost_cents_for_tokens(p["tokens_total"], rate.usd_per_1k_tokens)
             p_pct = (p_cost_usd / p_budget_usd) if p_budget_usd > 0 else 0.0
             if p_pct >= thresholds.block_pct:
                 p_status = "blocked"
@@ -210,31 +201,16 @@ class BudgetService:
             p_with_cost = dict(p)
             p_with_cost["cost_cents"] = p_cost
             self._upsert_ledger(db, run_id, persona, p_with_cost, p_status)
-
-        # Build persona outputs (used for summary + GH comment)
-        personas_out = []
-        for persona in persona_list:
-            p = persona_totals.get(persona, {"tokens_in": 0, "tokens_out": 0, "tokens_total": 0})
-            p_budget_usd = persona_budget_usd.get(persona, run_budget_usd_val)
-            p_budget = persona_budget_cents.get(persona, run_budget_cents)
-            p_cost = _cost_cents_for_tokens(p.get("tokens_total", 0), rate.usd_per_1k_tokens)
-            p_cost_usd = (p.get("tokens_total", 0) / 1000.0) * rate.usd_per_1k_tokens
-            p_pct = (p_cost_usd / p_budget_usd) if p_budget_usd > 0 else 0.0
-            p_status = "ok"
-            if p_pct >= thresholds.block_pct:
-                p_status = "blocked"
-            elif p_pct >= thresholds.warn_pct:
-                p_status = "warn"
             personas_out.append({
                 "persona": persona,
                 "tokens_in": p["tokens_in"],
                 "tokens_out": p["tokens_out"],
                 "cost_cents": p_cost,
-                "budget_cents": p_budget,
+                "budget_cents": persona_budget_cents.get(persona, run_budget_cents),
                 "pct_used": round(p_pct, 4),
                 "status": p_status,
             })
-        
+
         # Publish GitHub status (pending -> final), and upsert summary comment with Budget section
         gh_result = self._publish_github(db, run_id, status=status, pct_used=pct_used, run_budget_cents=run_budget_cents, personas=personas_out)
 
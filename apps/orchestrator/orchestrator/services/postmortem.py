@@ -123,17 +123,18 @@ def _derive_causes(history: List[Dict[str, Any]], *, not_green: List[str]) -> Li
 
 
 def _derive_learnings(budget_status: str, causes: List[str]) -> List[str]:
+    # Tags are appended in lexical order and at most once each, so the result is
+    # already canonical (sorted, unique) without a post-hoc sort.
     tags: List[str] = []
-    if any(c.startswith("retry_exhaust") for c in causes):
-        tags.append("retry_exhaust")
-    if budget_status == "warn":
-        tags.append("budget_warn")
     if budget_status == "blocked":
         tags.append("budget_block")
+    if budget_status == "warn":
+        tags.append("budget_warn")
     if any(c.startswith("gate_not_green") for c in causes):
         tags.append("gate_not_green")
-    # Deterministic order
-    return sorted(sorted(set(tags)))
+    if any(c.startswith("retry_exhaust") for c in causes):
+        tags.append("retry_exhaust")
+    return tags
 
 
 def _build_summary_headline(run_id: str, meta: Dict[str, Any], alerts_sum: Dict[str, Any], budget_sum: Dict[str, Any]) -> str:
@@ -185,7 +186,7 @@ class PostmortemService:
 
         # Tags: env defaults + learnings + base marker
         tags = ["postmortem"] + _env_list("POSTMORTEM_TAGS") + learnings
-        tags = sorted(sorted(set([t for t in tags if t])))
+        tags = sorted({t for t in tags if t})
 
         meta = {
             "run_id": run_id,
@@ -292,11 +293,11 @@ class PostmortemService:
         _KB_INGESTED[run_id] = True
         return {"ok": True, "chunks": int(chunks)}
 
-    def search(self, q: Optional[str] = None, tag: Optional[str] = None) -> List[Dict[str, Any]]:
-        # Deterministic text/tags search over in-memory artifacts
+    def _matching(self, q: Optional[str], tag: Optional[str]) -> List[Tuple[str, Dict[str, Any], str]]:
+        # Deterministic text/tags filter over in-memory artifacts, ordered by run_id asc
         q_norm = (q or "").strip().lower()
         tag_norm = (tag or "").strip().lower()
-        results: List[Tuple[str, Dict[str, Any]]] = []
+        results: List[Tuple[str, Dict[str, Any], str]] = []
         for rid, art in _ARTIFACTS.items():
             tags = [str(t).lower() for t in (art.get("tags") or [])]
             meta = art.get("meta", {})
@@ -313,14 +314,34 @@ class PostmortemService:
                 continue
             if q_norm and q_norm not in text_blob:
                 continue
-            results.append((rid, {
+            results.append((rid, art, headline))
+        results.sort(key=lambda t: str(t[0]))
+        return results
+
+    def search(self, q: Optional[str] = None, tag: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [
+            {
                 "run_id": rid,
                 "tags": art.get("tags") or [],
-                "status": meta.get("status"),
+                "status": art.get("meta", {}).get("status"),
                 "summary_headline": headline,
-            }))
-        # Stable ordering: run_id asc
-        results.sort(key=lambda t: str(t[0]))
-        return [r for _, r in results]
-
+            }
+            for rid, art, headline in self._matching(q, tag)
+        ]
 
+    def list(self, q: Optional[str] = None, tag: Optional[str] = None) -> List[Dict[str, Any]]:
+        # Search results already hydrated with the artifact fields the cockpit table shows
+        rows: List[Dict[str, Any]] = []
+        for rid, art, headline in self._matching(q, tag):
+            meta = art.get("meta", {})
+            rows.append({
+                "run_id": rid,
+                "status": meta.get("status"),
+                "failed_step": meta.get("failed_step"),
+                "retries": int(meta.get("retries") or 0),
+                "alerts_count": int(((art.get("alerts") or {}).get("counts") or {}).get("total") or 0),
+                "budget_status": str((art.get("budget") or {}).get("status") or "n/a"),
+                "tags": art.get("tags") or [],
+                "summary_headline": headline,
+            })
+        return rows
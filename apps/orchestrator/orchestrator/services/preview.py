@@ -20,7 +20,7 @@ from ..integrations.github import (
 )
 from ..integrations.github import _parse_repo_url  # reuse parser if needed
 from ..discovery import dor_check
-from ..models import RunDB, Project, RoadmapItem, PullRequest
+from ..models import RunDB, Project, RoadmapItem, PullRequest, utcnow
 
 
 def _env_true(key: str, default: str = "1") -> bool:
@@ -32,7 +32,7 @@ def _env_true(key: str, default: str = "1") -> bool:
 
 
 def _now() -> datetime:
-    return datetime.utcnow()
+    return utcnow()
 
 
 def _slug(s: str) -> str:
@@ -5,8 +5,8 @@ import time
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
-from sqlalchemy import UniqueConstraint
-from sqlalchemy.orm import Session
+from sqlalchemy import UniqueConstraint, func, select
+from sqlalchemy.orm import Session, load_only
 from sqlalchemy import String, Integer, DateTime, Text
 from sqlalchemy.orm import Mapped, mapped_column
 from datetime import datetime
@@ -18,7 +18,7 @@ from ..integrations.github import _write_enabled as _gh_write_enabled  # reuse e
 
 from ..blueprints.registry import registry
 from ..ai_graph.repo import record_step
-from ..models import GraphState
+from ..models import GraphState, utcnow
 
 
 class ScaffoldStepRow(Base):
@@ -30,7 +30,7 @@ class ScaffoldStepRow(Base):
     status: Mapped[str] = mapped_column(String(16), default="pending")  # pending|running|completed|failed
     attempts: Mapped[int] = mapped_column(Integer, default=0)
     error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
-    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=utcnow, onupdate=utcnow)
 
     __table_args__ = (
         UniqueConstraint("op_id", "blueprint_id", "step_name", name="uq_scaffold_step_unique"),
@@ -69,6 +69,35 @@ def _upsert_ledger(
     db: Session, *, op_id: str, blueprint_id: str, step: str, status: str, error: Optional[str] = None
 ) -> Tuple[str, int]:
     from uuid import uuid4
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert as _insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert as _insert
+        # Single atomic INSERT .. ON CONFLICT on the (op, blueprint, step) key; completed rows stay untouched
+        stmt = _insert(ScaffoldStepRow).values(
+            id=str(uuid4()), op_id=op_id, blueprint_id=blueprint_id, step_name=step,
+            status=status, attempts=1, error=error, updated_at=utcnow(),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["op_id", "blueprint_id", "step_name"],
+            set_={
+                "status": stmt.excluded.status,
+                "attempts": func.coalesce(ScaffoldStepRow.attempts, 0) + 1,
+                "error": stmt.excluded.error,
+                "updated_at": stmt.excluded.updated_at,
+            },
+            where=ScaffoldStepRow.status != "completed",
+        ).returning(ScaffoldStepRow.id, ScaffoldStepRow.attempts)
+        row = db.execute(stmt).first()
+        db.commit()
+        if row is None:
+            row = db.execute(
+                select(ScaffoldStepRow.id, ScaffoldStepRow.attempts)
+                .where(ScaffoldStepRow.op_id == op_id, ScaffoldStepRow.blueprint_id == blueprint_id, ScaffoldStepRow.step_name == step)
+            ).first()
+        return row.id, row.attempts
     # Try fetch existing row for idempotency
     row = (
         db.query(ScaffoldStepRow)
@@ -161,6 +190,7 @@ class ScaffolderService:
                 # skip if already recorded to satisfy unique constraint
                 exists = (
                     db.query(GraphState)
+                    .options(load_only(GraphState.id))
                     .filter(GraphState.run_id == op_id, GraphState.step_index == idx, GraphState.attempt == 1)
                     .first()
                 )
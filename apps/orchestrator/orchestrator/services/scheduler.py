@@ -4,6 +4,7 @@ import os
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from ..models import RunDB, SchedulerItem
@@ -155,9 +156,15 @@ def enqueue(db: Session, run_id: str, priority: Optional[int] = None) -> Dict[st
 
 
 def _eligible_next(db: Session) -> Optional[Tuple[SchedulerItem, Dict[str, int]]]:
+    # Per-tenant active counts in one grouped query; the global count is their sum
+    tenant_active: Dict[str, int] = dict(
+        db.query(SchedulerItem.tenant_id, func.count())
+        .filter(SchedulerItem.state == "active")
+        .group_by(SchedulerItem.tenant_id)
+        .all()
+    )
     # Respect global concurrency
-    global_active = db.query(SchedulerItem).filter(SchedulerItem.state == "active").count()
-    if global_active >= _POLICY.global_concurrency:
+    if sum(tenant_active.values()) >= _POLICY.global_concurrency:
         _STATS["skipped_due_to_quota"] += 1
         return None
 
@@ -166,15 +173,6 @@ def _eligible_next(db: Session) -> Optional[Tuple[SchedulerItem, Dict[str, int]]
     if not queued:
         return None
 
-    # Compute per-tenant active counts
-    tenant_active: Dict[str, int] = {}
-    for (tenant_id, cnt) in (
-        db.query(SchedulerItem.tenant_id)
-        .filter(SchedulerItem.state == "active")
-        .all()
-    ):
-        tenant_active[tenant_id] = tenant_active.get(tenant_id, 0) + 1
-
     # Group queued by priority
     by_pri: Dict[int, List[SchedulerItem]] = {}
     for r in queued:
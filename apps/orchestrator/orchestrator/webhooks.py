@@ -1,5 +1,6 @@
-import os, hmac, hashlib
+import os, hmac, hashlib, json
 from fastapi import APIRouter, Request, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from .db import get_db
 from .security import audit_event
@@ -14,23 +15,8 @@ def _verify_sig(secret: str, body: bytes, sent_sig: str | None) -> bool:
     expected = "sha256=" + mac.hexdigest()
     return hmac.compare_digest(expected, sent_sig or "")
 
-@router.post("/webhooks/github")
-async def github_webhook(request: Request, db: Session = Depends(get_db)):
-    secret = os.getenv("GITHUB_WEBHOOK_SECRET", "")
-    raw = await request.body()
-    sig = request.headers.get("X-Hub-Signature-256")
-    # Dev/CI friendly: only enforce verification when both secret and signature are present
-    # This allows local/CI simulations without headers while keeping verification when used.
-    if secret and sig:
-        if not _verify_sig(secret, raw, sig):
-            raise HTTPException(401, "invalid signature")
-
-    event = request.headers.get("X-GitHub-Event", "")
-    try:
-        payload = await request.json()
-    except Exception:
-        payload = {}
-
+def _handle_event(db: Session, event: str, payload: dict) -> dict:
+    # Blocking part of the webhook (DB + GitHub API); runs on the threadpool
     # Allow CI simulation where headers might be absent
     if event == "pull_request" or (not event and payload.get("pull_request")):
         action = payload.get("action")
@@ -65,4 +51,24 @@ async def github_webhook(request: Request, db: Session = Depends(get_db)):
         return {"ok": True, "handled": False, "reason": f"action {action} ignored"}
     return {"ok": True, "handled": False, "reason": f"event {event} ignored"}
 
+@router.post("/webhooks/github")
+async def github_webhook(request: Request, db: Session = Depends(get_db)):
+    secret = os.getenv("GITHUB_WEBHOOK_SECRET", "")
+    raw = await request.body()
+    sig = request.headers.get("X-Hub-Signature-256")
+    # Dev/CI friendly: only enforce verification when both secret and signature are present
+    # This allows local/CI simulations without headers while keeping verification when used.
+    if secret and sig:
+        if not _verify_sig(secret, raw, sig):
+            raise HTTPException(401, "invalid signature")
+
+    event = request.headers.get("X-GitHub-Event", "")
+    try:
+        payload = json.loads(raw)
+    except Exception:
+        payload = {}
+    if not isinstance(payload, dict):
+        payload = {}
 
+    # The session is synchronous: keep its queries and the GitHub calls off the event loop
+    return await run_in_threadpool(_handle_event, db, event, payload)
@@ -23,3 +23,57 @@ def test_run_lifecycle():
     r2 = client.get(f"/runs/{run['id']}")
     assert r2.status_code == 200
 
+
+def test_engine_pool_kwargs_env_overrides(monkeypatch):
+    from orchestrator.db import _engine_kwargs
+    assert _engine_kwargs("sqlite:///./dev.db") == {}
+    kw = _engine_kwargs("postgresql+psycopg://u:p@h/db")
+    assert (kw["pool_size"], kw["max_overflow"], kw["pool_pre_ping"]) == (20, 40, True)
+    monkeypatch.setenv("DB_POOL_SIZE", "8")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "not-a-number")
+    kw = _engine_kwargs("postgresql+psycopg://u:p@h/db")
+    assert (kw["pool_size"], kw["max_overflow"]) == (8, 40)
+
+
+def test_ensure_indexes_adds_missing_indexes_to_existing_tables(tmp_path):
+    from sqlalchemy import create_engine, inspect
+    from orchestrator.db import Base, ensure_indexes
+    from orchestrator.models import RoadmapItem
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'idx.db'}")
+    Base.metadata.create_all(bind=engine)
+    # Simulate a table created before the index was declared
+    [idx] = [i for i in RoadmapItem.__table__.indexes if i.name == "ix_roadmap_project_priority"]
+    idx.drop(bind=engine)
+    assert "ix_roadmap_project_priority" not in {i["name"] for i in inspect(engine).get_indexes("roadmap_items")}
+    assert ensure_indexes(engine) == ["ix_roadmap_project_priority"]
+    assert ensure_indexes(engine) == []  # idempotent
+    assert "ix_roadmap_project_priority" in {i["name"] for i in inspect(engine).get_indexes("roadmap_items")}
+
+
+def test_index_builds_run_outside_the_request_path(tmp_path):
+    import os, subprocess, sys
+    from pathlib import Path
+    from sqlalchemy import create_engine, inspect
+    from orchestrator.db import Base
+    from orchestrator.models import RoadmapItem
+
+    db_path = tmp_path / "script.db"
+    engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=engine)
+    [idx] = [i for i in RoadmapItem.__table__.indexes if i.name == "ix_roadmap_tenant_priority"]
+    idx.drop(bind=engine)
+    script = Path(__file__).resolve().parents[3] / "scripts" / "db_ensure_indexes.py"
+    env = {**os.environ, "DATABASE_URL": f"sqlite:///{db_path}"}
+    out = subprocess.run([sys.executable, str(script)], env=env, capture_output=True, text=True, timeout=120)
+    assert out.returncode == 0, out.stderr
+    assert "created ix_roadmap_tenant_priority" in out.stdout
+    assert "ix_roadmap_tenant_priority" in {i["name"] for i in inspect(engine).get_indexes("roadmap_items")}
+
+
+def test_no_route_is_registered_twice():
+    from collections import Counter
+    seen = Counter((r.path, m) for r in app.routes for m in (getattr(r, "methods", None) or ()))
+    assert [k for k, n in seen.items() if n > 1] == []
+    assert seen[("/roadmap-items/{item_id}", "PATCH")] == 1
+
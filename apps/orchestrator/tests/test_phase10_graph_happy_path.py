@@ -31,3 +31,14 @@ def test_graph_happy_path():
     assert seq == ["product", "design", "research", "cto_plan", "engineer", "qa", "release"]
 
 
+def test_checkpoint_dir_created_only_for_sqlite(tmp_path, monkeypatch):
+    from orchestrator.ai_graph import graph
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(graph, "_checkpoint_dir_ready", False)
+    monkeypatch.setenv("LANGGRAPH_CHECKPOINT", "memory")
+    graph._checkpointer()
+    assert not (tmp_path / "data").exists()
+    if graph._HAS_SQLITE:
+        monkeypatch.setenv("LANGGRAPH_CHECKPOINT", "sqlite")
+        graph._checkpointer()
+        assert (tmp_path / "data").is_dir()
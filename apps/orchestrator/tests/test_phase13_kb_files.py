@@ -1,6 +1,7 @@
 from fastapi.testclient import TestClient
 from orchestrator.app import app
 import base64
+import pytest
 
 TENANT = "00000000-0000-0000-0000-000000000000"
 
@@ -77,3 +78,59 @@ def test_kb_ingest_pdf_and_search():
     assert any(h["kind"] == "file-pdf" for h in hits)
 
 
+def test_pdf_extraction_on_worker_processes(monkeypatch):
+    from orchestrator import app as app_module
+    monkeypatch.setattr(app_module, "_PDF_WORKERS", 1)
+    monkeypatch.setattr(app_module, "_PDF_POOL", None)
+    pdf_bytes = _build_minimal_pdf_bytes("Worker pool extracts pz-pool-phrase-24680.")
+    try:
+        text = app_module._pdf_to_text(pdf_bytes)
+        assert app_module._PDF_POOL is not None
+        assert "pz-pool-phrase-24680" in text
+        assert text == app_module.pdf_to_text_bytes(pdf_bytes)
+    finally:
+        if app_module._PDF_POOL is not None:
+            app_module._PDF_POOL.shutdown()
+
+
+class _FailingPool:
+    def __init__(self, exc):
+        self.exc = exc
+        self.shut = False
+
+    def submit(self, fn, *args):
+        from concurrent.futures import Future
+        f = Future()
+        f.set_exception(self.exc)
+        return f
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shut = True
+
+
+def test_pdf_pool_recovers_from_a_dead_worker(monkeypatch):
+    from concurrent.futures.process import BrokenProcessPool
+    from orchestrator import app as app_module
+    broken = _FailingPool(BrokenProcessPool("worker died"))
+    monkeypatch.setattr(app_module, "_PDF_WORKERS", 1)
+    monkeypatch.setattr(app_module, "_PDF_POOL", broken)
+    pdf_bytes = _build_minimal_pdf_bytes("Fresh pool extracts pz-fresh-phrase-13579.")
+    try:
+        assert "pz-fresh-phrase-13579" in app_module._pdf_to_text(pdf_bytes)
+        assert broken.shut and app_module._PDF_POOL is not broken
+    finally:
+        if app_module._PDF_POOL is not None and app_module._PDF_POOL is not broken:
+            app_module._PDF_POOL.shutdown()
+
+
+def test_pdf_extraction_timeout_is_a_bad_request(monkeypatch):
+    from concurrent.futures import TimeoutError as FutureTimeoutError
+    from fastapi import HTTPException
+    from orchestrator import app as app_module
+    stuck = _FailingPool(FutureTimeoutError())
+    monkeypatch.setattr(app_module, "_PDF_WORKERS", 1)
+    monkeypatch.setattr(app_module, "_PDF_POOL", stuck)
+    with pytest.raises(HTTPException) as ei:
+        app_module._pdf_to_text(b"%PDF-1.4")
+    assert ei.value.status_code == 400
+    assert stuck.shut and app_module._PDF_POOL is None
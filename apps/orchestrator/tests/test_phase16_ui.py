@@ -1,5 +1,7 @@
 import os, uuid, httpx
 
+from orchestrator.models import RunDB
+
 BASE = os.getenv("ORCH_BASE", "http://localhost:8000")
 TENANT = "00000000-0000-0000-0000-000000000000"
 
@@ -55,3 +57,118 @@ def test_ui_gates_approve_merge_when_dry_run():
     assert "approveBtn\" disabled" in html or "mergeBtn\" disabled" in html
 
 
+def test_ui_pages_revalidate_with_etag():
+    for path in ("/ui", "/ui/run/dummy-run-id?dry_run=1"):
+        r = httpx.get(f"{BASE}{path}", timeout=60)
+        r.raise_for_status()
+        etag = r.headers["etag"]
+        again = httpx.get(f"{BASE}{path}", headers={"If-None-Match": etag}, timeout=60)
+        assert again.status_code == 304
+        assert again.content == b""
+    # A different rendering of the run page carries a different validator
+    wet = httpx.get(f"{BASE}/ui/run/dummy-run-id?dry_run=0", headers={"If-None-Match": etag}, timeout=60)
+    assert wet.status_code == 200
+
+
+def test_ui_run_escapes_run_id():
+    html = _get_html("/ui/run/%3Cb%3Ex%22y?dry_run=1")
+    assert "<b>x\"y" not in html
+    assert "&lt;b&gt;x&quot;y" in html
+    assert 'data-quoted-id="%3Cb%3Ex%22y"' in html
+
+
+def test_run_cockpit_aggregates_panels():
+    proj = _post_ok("/projects", {"tenant_id": TENANT, "name": f"UI-{uuid.uuid4().hex[:6]}", "description": "", "repo_url": ""})
+    item = _post_ok("/roadmap-items", {"tenant_id": TENANT, "project_id": proj["id"], "title": "Cockpit"})
+    run = _post_ok("/runs", {"tenant_id": TENANT, "project_id": proj["id"], "roadmap_item_id": item["id"], "phase": "delivery"})
+
+    r = httpx.get(f"{BASE}/runs/{run['id']}/cockpit", timeout=60)
+    r.raise_for_status()
+    d = r.json()
+    assert set(d) == {"run", "pr", "history", "metrics", "budget", "alerts"}
+    assert d["run"]["id"] == run["id"]
+    assert d["history"] == []
+    # No PR and no budget records yet: those panels degrade independently
+    assert "error" in d["pr"] and "error" in d["budget"]
+    assert d["metrics"] == httpx.get(f"{BASE}/runs/{run['id']}/metrics", timeout=60).json()
+
+    assert httpx.get(f"{BASE}/runs/does-not-exist/cockpit", timeout=60).status_code == 404
+
+
+def test_run_cockpit_rolls_back_failed_sections(db_session, monkeypatch):
+    from orchestrator import app as app_module
+
+    db_session.add(RunDB(id="cockpit-rb", tenant_id=TENANT, project_id="p", status="pending"))
+    db_session.commit()
+
+    def boom(db, run_id):
+        raise RuntimeError("history unavailable")
+
+    rollbacks = []
+    real_rollback = db_session.rollback
+    monkeypatch.setattr(db_session, "rollback", lambda: (rollbacks.append(1), real_rollback()))
+    monkeypatch.setattr(app_module, "repo_get_history", boom)
+    monkeypatch.setattr(app_module, "compute_run_metrics", lambda db, run_id: {"ok": True})
+
+    d = app_module.run_cockpit("cockpit-rb", db=db_session)
+    # A failing history panel degrades like the others instead of failing the whole cockpit
+    assert d["history"] == {"error": "history unavailable"}
+    assert d["metrics"] == {"ok": True}
+    # Each failed section leaves the shared session usable for the next one
+    assert rollbacks
+
+
+def test_ui_pages_are_minified():
+    for path in ("/ui", "/ui/postmortems", "/ui/run/dummy-run-id?dry_run=1"):
+        html = _get_html(path)
+        lines = html.split("\n")
+        assert lines[0] == "<!doctype html>"
+        assert all(line == line.strip() and line for line in lines)
+
+
+def test_static_ui_pages_honor_if_modified_since():
+    r = httpx.get(f"{BASE}/ui/scheduler", timeout=60)
+    r.raise_for_status()
+    lm = r.headers["last-modified"]
+    again = httpx.get(f"{BASE}/ui/scheduler", headers={"If-Modified-Since": lm}, timeout=60)
+    assert again.status_code == 304
+    old = httpx.get(f"{BASE}/ui/scheduler", headers={"If-Modified-Since": "Thu, 01 Jan 1970 00:00:00 GMT"}, timeout=60)
+    assert old.status_code == 200
+    # A validator mismatch wins over a fresh date
+    stale = httpx.get(f"{BASE}/ui/scheduler", headers={"If-None-Match": '"nope"', "If-Modified-Since": lm}, timeout=60)
+    assert stale.status_code == 200
+
+
+def test_ui_pages_serve_precompressed_gzip():
+    for path in ("/ui/postmortems", "/ui/run/dummy-run-id?dry_run=1"):
+        plain = httpx.get(f"{BASE}{path}", headers={"Accept-Encoding": "identity"}, timeout=60)
+        gz = httpx.get(f"{BASE}{path}", headers={"Accept-Encoding": "gzip"}, timeout=60)
+        assert "content-encoding" not in plain.headers
+        assert gz.headers["content-encoding"] == "gzip"
+        assert gz.headers["vary"] == "Accept-Encoding"
+        # httpx transparently decodes; both variants carry the same page
+        assert gz.text == plain.text
+        assert gz.headers["etag"] != plain.headers["etag"]
+        again = httpx.get(f"{BASE}{path}", headers={"Accept-Encoding": "gzip", "If-None-Match": gz.headers["etag"]}, timeout=60)
+        assert again.status_code == 304
+    refused = httpx.get(f"{BASE}/ui", headers={"Accept-Encoding": "gzip;q=0"}, timeout=60)
+    assert "content-encoding" not in refused.headers
+
+
+def test_ui_pages_link_shared_stylesheet():
+    import re
+    html = _get_html("/ui/scheduler")
+    href = re.search(r'<link rel="stylesheet" href="(/ui/static/cockpit\.css\?v=[0-9a-f]+)"', html).group(1)
+    assert href in _get_html("/ui/run/dummy-run-id?dry_run=1")
+    css = httpx.get(f"{BASE}{href}", timeout=60)
+    css.raise_for_status()
+    assert css.headers["content-type"].startswith("text/css")
+    assert "max-age=604800" in css.headers["cache-control"]
+    assert "button:hover" in css.text
+
+
+def test_ui_buttons_use_delegated_actions():
+    html = _get_html("/ui/run/dummy-run-id?dry_run=1")
+    for action in ("refresh", "approve", "merge", "compute-budget"):
+        assert f'data-action="{action}"' in html
+    assert html.count("addEventListener") == 1
@@ -24,4 +24,29 @@ def test_blueprints_list_and_get_valid():
     assert mf["stack"]["backend"]["framework"] == "fastapi"
 
 
+def test_registry_sorted_ids_follow_load():
+    from orchestrator.blueprints.registry import BlueprintRegistry
+    reg = BlueprintRegistry(base_dir=os.path.abspath("blueprints"))
+    assert reg.sorted_ids == ()
+    reg.load()
+    assert reg.sorted_ids == tuple(sorted(b.id for b in reg.list()))
+    assert "ai-chat-agent-web" in reg.sorted_ids
 
+
+def test_registry_reload_reuses_unchanged_manifests(tmp_path):
+    from orchestrator.blueprints.registry import BlueprintRegistry
+    src = os.path.abspath("blueprints")
+    for fname in ("web-crud-fastapi-postgres-react.json", "ai-chat-agent-web.json"):
+        shutil.copy(os.path.join(src, fname), tmp_path / fname)
+    reg = BlueprintRegistry(base_dir=str(tmp_path))
+    reg.load()
+    before = {i: reg.get(i) for i in reg.sorted_ids}
+    # Touch one manifest: only that one is re-parsed
+    path = tmp_path / "ai-chat-agent-web.json"
+    data = json.loads(path.read_text(encoding="utf-8"))
+    data["name"] = data["name"] + " v2"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(path, ns=(os.stat(path).st_atime_ns, os.stat(path).st_mtime_ns + 10**9))
+    reg.load()
+    assert reg.get("web-crud-fastapi-postgres-react") is before["web-crud-fastapi-postgres-react"]
+    assert reg.get("ai-chat-agent-web").name.endswith(" v2")
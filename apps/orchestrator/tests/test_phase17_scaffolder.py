@@ -62,3 +62,15 @@ def test_scaffolder_dry_run_idempotent(tmp_path):
     assert r3.status_code == 400
 
 
+def test_scaffold_ledger_upsert_is_single_row(db_session):
+    from orchestrator.services.scaffolder import ScaffoldStepRow, _upsert_ledger
+
+    key = dict(op_id="op-ledger", blueprint_id="bp", step="init")
+    rid, attempts = _upsert_ledger(db_session, status="running", **key)
+    assert attempts == 1
+    assert _upsert_ledger(db_session, status="failed", error="boom", **key) == (rid, 2)
+    assert _upsert_ledger(db_session, status="completed", **key) == (rid, 3)
+    # Completed steps are never reopened
+    assert _upsert_ledger(db_session, status="running", **key) == (rid, 3)
+    rows = db_session.query(ScaffoldStepRow).filter(ScaffoldStepRow.op_id == "op-ledger").all()
+    assert [(r.status, r.error) for r in rows] == [("completed", None)]
@@ -1,5 +1,8 @@
 import os, uuid, httpx
 
+from orchestrator.models import GraphState, RunDB
+from orchestrator.services.budget import BudgetService
+
 BASE = os.getenv("ORCH_BASE", "http://localhost:8000")
 TENANT = "00000000-0000-0000-0000-000000000000"
 
@@ -41,3 +44,18 @@ def test_budget_compute_and_get_idempotent():
     assert got["status"] == res2["status"]
 
 
+def test_budget_compute_counts_attempts_per_persona(db_session, monkeypatch):
+    monkeypatch.setenv("GITHUB_WRITE_ENABLED", "0")
+    db_session.add(RunDB(id="bud-run", tenant_id=TENANT, project_id="p"))
+    steps = [("cto_plan", 1), ("qa", 1), ("qa", 2), ("release", 1)]
+    for i, (name, attempt) in enumerate(steps):
+        db_session.add(GraphState(id=f"g{i}", run_id="bud-run", step_index=i, step_name=name, status="ok", attempt=attempt))
+    db_session.commit()
+
+    res = BudgetService().compute(db_session, "bud-run", personas=["cto", "qa", "engineer"], rate_usd_per_1k=1.0, run_budget_usd=1.0)
+    per = BudgetService.TOKENS_PER_ATTEMPT_TOTAL
+    assert res["totals"]["cost_cents"] == 4 * per // 10
+    by_persona = {p["persona"]: p for p in res["personas"]}
+    assert by_persona["qa"]["tokens_in"] + by_persona["qa"]["tokens_out"] == 2 * per
+    assert by_persona["cto"]["cost_cents"] == per // 10
+    assert by_persona["engineer"]["cost_cents"] == 0 and by_persona["engineer"]["status"] == "ok"
@@ -1,5 +1,8 @@
 import os, json, uuid, httpx, tempfile, pathlib, subprocess, sys
 
+from orchestrator.models import AuditLog
+from orchestrator.security import audit_event
+
 BASE = os.getenv("ORCH_BASE", "http://127.0.0.1:8001")
 TENANT = "00000000-0000-0000-0000-000000000000"
 
@@ -125,3 +128,28 @@ def test_compliance_script_wrapper():
     assert code in (0, 1)
 
 
+def test_audit_event_staged_in_caller_transaction(db_session):
+    run_id = str(uuid.uuid4())
+    kw = dict(actor="service", event_type="github.merge", run_id=run_id, request_id=f"{run_id}:gh:merge", details={"token": "ghp_" + "a" * 30})
+    first = audit_event(db_session, commit=False, **kw)
+    assert first is not None
+    # Duplicate is skipped without poisoning the open transaction
+    assert audit_event(db_session, commit=False, **kw) is None
+    db_session.commit()
+    rows = db_session.query(AuditLog).filter(AuditLog.run_id == run_id).all()
+    assert [r.id for r in rows] == [first]
+    assert "a" * 30 not in json.dumps(rows[0].details_redacted)
+
+
+def test_partner_call_audit_masks_payload_strictly_and_envelope_per_mode(db_session, monkeypatch):
+    from orchestrator.api.partners_endpoints import CallBody, call_partner
+
+    monkeypatch.setenv("REDACTION_MODE", "relaxed")
+    key = f"audit-{uuid.uuid4().hex[:8]}"
+    call_partner("mock_echo", CallBody(op="Echo Back", payload={"note": "call 555-123-4567"}, idempotency_key=key), db=db_session)
+    db_session.commit()
+    row = db_session.query(AuditLog).filter(AuditLog.request_id == f"mock_echo:call:Echo Back:{key}").one()
+    # Relaxed mode leaves the name-like op alone; the payload is still strict-masked
+    assert row.details_redacted["op"] == "Echo Back"
+    assert row.details_redacted["partner_id"] == "mock_echo"
+    assert row.details_redacted["payload"] == {"note": "call <phone:redacted>"}
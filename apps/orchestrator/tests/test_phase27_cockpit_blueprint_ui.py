@@ -21,6 +21,9 @@ def test_ui_has_create_from_blueprint_nav_and_blueprints_page():
     # Required form fields
     for field in ("owner", "repo", "branch"):
         assert f"id=\"{field}\"" in html2
+    # Options come from the registry, sorted
+    assert "<option value=\"ai-chat-agent-web\">ai-chat-agent-web</option>" in html2
+    assert html2.index("ai-chat-agent-web") < html2.index("web-crud-fastapi-postgres-react")
 
 
 def test_scaffold_endpoint_dry_run_and_shape_offline():
@@ -1,5 +1,8 @@
 import os, uuid, httpx
 
+from orchestrator.models import SchedulerItem
+from orchestrator.services import scheduler
+
 BASE = os.getenv("ORCH_BASE", "http://localhost:8000")
 TENANT_A = "aaaaaaaa-aaaa-aaaa-aaaa-aaaaaaaaaaaa"
 TENANT_B = "bbbbbbbb-bbbb-bbbb-bbbb-bbbbbbbbbbbb"
@@ -104,3 +107,19 @@ def test_scheduler_policy_enqueue_step_and_ui():
     assert "Scheduler" in sched_html and "Step" in sched_html and "Queue" in sched_html
 
 
+def test_eligible_next_honors_tenant_cap_with_active_items(db_session, monkeypatch):
+    monkeypatch.setattr(scheduler, "_POLICY", scheduler.SchedulerPolicy(global_concurrency=3, tenant_max_active=1))
+    monkeypatch.setattr(scheduler, "_RR_CURSOR", {})
+    db_session.add(SchedulerItem(run_id="a1", tenant_id="t1", priority=0, state="active"))
+    db_session.add(SchedulerItem(run_id="q1", tenant_id="t1", priority=5, state="queued"))
+    db_session.add(SchedulerItem(run_id="q2", tenant_id="t2", priority=0, state="queued"))
+    db_session.commit()
+
+    # t1 is at its cap, so the lower-priority t2 item is picked
+    item, tenant_active = scheduler._eligible_next(db_session)
+    assert item.run_id == "q2" and tenant_active == {"t1": 1}
+
+    db_session.add(SchedulerItem(run_id="a2", tenant_id="t2", priority=0, state="active"))
+    db_session.add(SchedulerItem(run_id="a3", tenant_id="t3", priority=0, state="active"))
+    db_session.commit()
+    assert scheduler._eligible_next(db_session) is None
@@ -117,3 +117,14 @@ def test_ui_entry_and_page_have_integrations_controls():
     page.raise_for_status()
     txt = page.text
     assert "Partners" in txt and "Tick" in txt and "Call" in txt
+
+
+def test_registry_flat_rows_match_nested():
+    nested = _get_ok("/integrations/partners")
+    flat = _get_ok("/integrations/partners?format=flat")
+    assert [x["partner_id"] for x in flat] == [x["partner_id"] for x in nested]
+    for n, f in zip(nested, flat):
+        assert list(f) == ["partner_id", "circuit_state", "rate_remaining", "calls", "retries", "failures", "deduped"]
+        assert f["circuit_state"] == n["state"]["circuit_state"]
+        assert f["rate_remaining"] == n["state"]["rate_remaining"]
+        assert all(f[k] == n["counters"][k] for k in ("calls", "retries", "failures", "deduped"))
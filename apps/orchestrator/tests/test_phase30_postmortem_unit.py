@@ -78,3 +78,18 @@ def test_postmortem_ingest_idempotent_when_kb_row_exists(db_session):
     assert res2.get("already") is True or res2.get("chunks", 0) >= 1
 
 
+def test_postmortem_list_rows_are_hydrated(db_session):
+    from orchestrator.services.postmortem import _ARTIFACTS as STORE  # type: ignore
+    STORE.clear()
+    STORE["b-run"] = {"meta": {"status": "error", "failed_step": "qa", "retries": 2}, "tags": ["postmortem", "alpha"], "alerts": {"counts": {"total": 1}}, "budget": {"status": "warn"}}
+    STORE["a-run"] = {"meta": {"status": "ok"}, "tags": ["postmortem"], "alerts": {}, "budget": {}}
+
+    svc = PostmortemService()
+    rows = svc.list()
+    assert [r["run_id"] for r in rows] == ["a-run", "b-run"]
+    assert rows[0]["failed_step"] is None and rows[0]["alerts_count"] == 0 and rows[0]["budget_status"] == "n/a"
+    b = rows[1]
+    assert (b["failed_step"], b["retries"], b["alerts_count"], b["budget_status"]) == ("qa", 2, 1, "warn")
+    # Same filter semantics as search
+    assert [r["run_id"] for r in svc.list(tag="alpha")] == [r["run_id"] for r in svc.search(tag="alpha")]
+    STORE.clear()
@@ -1,3 +1,5 @@
+import uuid
+
 from fastapi.testclient import TestClient
 from orchestrator.app import app
 
@@ -17,6 +19,8 @@ def test_projects_roadmap_and_run_flow():
     project = p.json()
     assert project["id"]
     project_id = project["id"]
+    # The create response is built from the inserted row; it must match a fresh read
+    assert client.get(f"/projects/{project_id}").json() == project
 
     # Create a roadmap item
     rmi = client.post("/roadmap-items", json={
@@ -28,6 +32,7 @@ def test_projects_roadmap_and_run_flow():
     })
     assert rmi.status_code == 200, rmi.text
     item_id = rmi.json()["id"]
+    assert client.get(f"/roadmap-items/{item_id}").json() == rmi.json()
 
     # Create a run
     run = client.post("/runs", json={
@@ -50,3 +55,221 @@ def test_projects_roadmap_and_run_flow():
     assert got.json()["status"] == "succeeded"
 
 
+def test_list_endpoints_paginate_with_cursor():
+    client = TestClient(app)
+    tenant = f"paged-{uuid.uuid4().hex[:24]}"
+
+    p = client.post("/projects", json={"tenant_id": tenant, "name": "Paged Project"})
+    assert p.status_code == 200, p.text
+    project_id = p.json()["id"]
+    for i in range(4):
+        r = client.post("/projects", json={"tenant_id": tenant, "name": f"Paged {i}"})
+        assert r.status_code == 200, r.text
+    for i in range(5):
+        r = client.post("/roadmap-items", json={
+            "tenant_id": tenant, "project_id": project_id, "title": f"Item {i}", "priority": 10 * (i % 2)
+        })
+        assert r.status_code == 200, r.text
+
+    first = client.get("/projects", params={"tenant_id": tenant, "limit": 3}).json()
+    assert len(first) == 3
+    rest = client.get("/projects", params={"tenant_id": tenant, "limit": 3, "cursor": first[-1]["id"]}).json()
+    assert len(rest) == 2
+    assert len({x["id"] for x in first + rest}) == 5
+
+    items1 = client.get("/roadmap-items", params={"project_id": project_id, "limit": 2}).json()
+    items2 = client.get("/roadmap-items", params={"project_id": project_id, "limit": 10, "cursor": items1[-1]["id"]}).json()
+    prios = [x["priority"] for x in items1 + items2]
+    assert prios == sorted(prios) and len(prios) == 5
+
+    bad = client.get("/projects", params={"cursor": "does-not-exist"})
+    assert bad.status_code == 400
+
+
+def test_get_endpoints_honor_if_none_match():
+    client = TestClient(app)
+    p = client.post("/projects", json={"tenant_id": TENANT, "name": "ETag Project", "description": "", "repo_url": ""})
+    assert p.status_code == 200, p.text
+    project_id = p.json()["id"]
+
+    first = client.get(f"/projects/{project_id}")
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+
+    cached = client.get(f"/projects/{project_id}", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+
+    # Any field change produces a new validator
+    up = client.patch(f"/projects/{project_id}", json={"description": "changed"})
+    assert up.status_code == 200, up.text
+    fresh = client.get(f"/projects/{project_id}", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.json()["description"] == "changed"
+    assert fresh.headers["etag"] != etag
+
+
+def test_list_endpoints_cache_until_write(monkeypatch):
+    from orchestrator.list_cache import projects_cache, roadmap_items_cache
+
+    monkeypatch.setenv("LIST_CACHE_TTL_SECONDS", "30")
+    client = TestClient(app)
+    tenant = "cache-" + TENANT[6:]
+    client.post("/projects", json={"tenant_id": tenant, "name": "Cached A", "description": "", "repo_url": ""})
+    first = client.get("/projects", params={"tenant_id": tenant}).json()
+    hits = projects_cache.hits
+    assert client.get("/projects", params={"tenant_id": tenant}).json() == first
+    assert projects_cache.hits == hits + 1
+
+    # Writes invalidate: the new project and the renamed one are visible immediately
+    p = client.post("/projects", json={"tenant_id": tenant, "name": "Cached B", "description": "", "repo_url": ""}).json()
+    assert len(client.get("/projects", params={"tenant_id": tenant}).json()) == len(first) + 1
+    client.patch(f"/projects/{p['id']}", json={"name": "Cached B2"})
+    assert "Cached B2" in [x["name"] for x in client.get("/projects", params={"tenant_id": tenant}).json()]
+
+    it = client.post("/roadmap-items", json={"tenant_id": tenant, "project_id": p["id"], "title": "Before"}).json()
+    assert [x["title"] for x in client.get("/roadmap-items", params={"project_id": p["id"]}).json()] == ["Before"]
+    misses = roadmap_items_cache.misses
+    client.patch(f"/roadmap-items/{it['id']}", json={"title": "After"})
+    assert [x["title"] for x in client.get("/roadmap-items", params={"project_id": p["id"]}).json()] == ["After"]
+    assert roadmap_items_cache.misses == misses + 1
+
+
+def test_run_start_in_background_returns_accepted():
+    import time
+
+    client = TestClient(app)
+    p = client.post("/projects", json={"tenant_id": TENANT, "name": "Background", "description": "", "repo_url": ""}).json()
+    it = client.post("/roadmap-items", json={"tenant_id": TENANT, "project_id": p["id"], "title": "Bg"}).json()
+    run = client.post("/runs", json={"tenant_id": TENANT, "project_id": p["id"], "roadmap_item_id": it["id"], "phase": "delivery"}).json()
+
+    started = client.post(f"/runs/{run['id']}/start", params={"background": "true"})
+    assert started.status_code == 202, started.text
+    assert started.json() == {"run_id": run["id"], "status": "accepted", "poll": f"/runs/{run['id']}"}
+
+    deadline = time.monotonic() + 30
+    while client.get(f"/runs/{run['id']}").json()["status"] == "running" and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert client.get(f"/runs/{run['id']}").json()["status"] == "succeeded"
+    assert client.post("/runs/does-not-exist/start", params={"background": "true"}).status_code == 404
+
+
+def test_background_delivery_failure_marks_run_partial(monkeypatch):
+    import time
+    from orchestrator import app as app_module
+
+    def boom(db, run_id):
+        raise RuntimeError("delivery failed")
+
+    monkeypatch.setattr(app_module, "_deliver_run", boom)
+    client = TestClient(app)
+    p = client.post("/projects", json={"tenant_id": TENANT, "name": "BackgroundFail", "description": "", "repo_url": ""}).json()
+    it = client.post("/roadmap-items", json={"tenant_id": TENANT, "project_id": p["id"], "title": "Bg fail"}).json()
+    run = client.post("/runs", json={"tenant_id": TENANT, "project_id": p["id"], "roadmap_item_id": it["id"], "phase": "delivery"}).json()
+
+    assert client.post(f"/runs/{run['id']}/start", params={"background": "true"}).status_code == 202
+    deadline = time.monotonic() + 30
+    while client.get(f"/runs/{run['id']}").json()["status"] == "running" and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert client.get(f"/runs/{run['id']}").json()["status"] == "partial"
+
+
+def test_background_run_start_rejects_a_running_run(monkeypatch):
+    import threading, time
+    from orchestrator import app as app_module
+
+    release = threading.Event()
+    monkeypatch.setattr(app_module, "_deliver_run", lambda db, run_id: release.wait(30))
+    client = TestClient(app)
+    p = client.post("/projects", json={"tenant_id": TENANT, "name": "BackgroundDup", "description": "", "repo_url": ""}).json()
+    it = client.post("/roadmap-items", json={"tenant_id": TENANT, "project_id": p["id"], "title": "Bg dup"}).json()
+    run = client.post("/runs", json={"tenant_id": TENANT, "project_id": p["id"], "roadmap_item_id": it["id"], "phase": "delivery"}).json()
+
+    assert client.post(f"/runs/{run['id']}/start", params={"background": "true"}).status_code == 202
+    assert client.post(f"/runs/{run['id']}/start", params={"background": "true"}).status_code == 409
+    assert client.post(f"/runs/{run['id']}/graph/start", params={"background": "true"}, json={}).status_code == 409
+    release.set()
+
+
+def test_background_graph_start_rejects_duplicates_until_done(monkeypatch):
+    import threading, time
+    from orchestrator import app as app_module
+
+    release = threading.Event()
+
+    def slow(db, run_id, body):
+        release.wait(30)
+        raise ValueError("bad graph input")
+
+    monkeypatch.setattr(app_module, "_start_graph", slow)
+    client = TestClient(app)
+    p = client.post("/projects", json={"tenant_id": TENANT, "name": "GraphBg", "description": "", "repo_url": ""}).json()
+    it = client.post("/roadmap-items", json={"tenant_id": TENANT, "project_id": p["id"], "title": "Graph bg"}).json()
+    run = client.post("/runs", json={"tenant_id": TENANT, "project_id": p["id"], "roadmap_item_id": it["id"], "phase": "delivery"}).json()
+
+    started = client.post(f"/runs/{run['id']}/graph/start", params={"background": "true"}, json={})
+    assert started.status_code == 202, started.text
+    poll = started.json()["poll"]
+    # Pollable before the first node records any graph state
+    assert client.get(poll).json() == {"run_id": run["id"], "status": "running"}
+    assert client.post(f"/runs/{run['id']}/graph/start", params={"background": "true"}, json={}).status_code == 409
+    assert client.post(f"/runs/{run['id']}/graph/start", json={}).status_code == 409
+
+    release.set()
+    deadline = time.monotonic() + 30
+    while client.get(poll).json()["status"] == "running" and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert client.get(poll).json()["status"] == "partial"
+    assert client.get("/runs/does-not-exist/graph/state").status_code == 404
+
+
+def test_startup_sweep_marks_orphaned_runs_partial(db_session, monkeypatch):
+    from sqlalchemy.orm import sessionmaker
+    from orchestrator import app as app_module
+    from orchestrator.models import RunDB
+
+    monkeypatch.setattr(app_module, "SessionLocal", sessionmaker(bind=db_session.get_bind()))
+    db_session.add_all([
+        RunDB(id="orphan", tenant_id=TENANT, project_id="p", status="running"),
+        RunDB(id="done", tenant_id=TENANT, project_id="p", status="succeeded"),
+    ])
+    db_session.commit()
+
+    assert app_module._sweep_orphaned_runs() == 1
+    db_session.expire_all()
+    assert db_session.get(RunDB, "orphan").status == "partial"
+    assert db_session.get(RunDB, "done").status == "succeeded"
+    # A swept run can be claimed again; a claimed one cannot be claimed twice
+    assert app_module._claim_run(db_session, "orphan") is True
+    assert app_module._claim_run(db_session, "orphan") is False
+
+
+def test_malformed_graph_workers_does_not_break_import():
+    import os, subprocess, sys
+    import orchestrator
+    app_dir = os.path.dirname(os.path.dirname(orchestrator.__file__))
+    env = {**os.environ, "GRAPH_WORKERS": "two", "PYTHONPATH": os.pathsep.join(filter(None, [app_dir, os.environ.get("PYTHONPATH")]))}
+    code = "from orchestrator import app; print(app._GRAPH_POOL._max_workers)"
+    out = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, timeout=120)
+    assert out.returncode == 0, out.stderr
+    assert out.stdout.strip().splitlines()[-1] == "2"
+
+
+def test_create_runs_batch_inserts_in_order():
+    client = TestClient(app)
+    body = [
+        {"tenant_id": TENANT, "project_id": "batch-p", "phase": "delivery"},
+        {"tenant_id": TENANT, "project_id": "batch-p", "roadmap_item_id": None, "phase": "discovery"},
+    ]
+    r = client.post("/runs/batch", json=body)
+    assert r.status_code == 200, r.text
+    runs = r.json()
+    assert len(runs) == 2 and len({x["id"] for x in runs}) == 2
+    assert all(x["status"] == "pending" for x in runs)
+    for run in runs:
+        assert client.get(f"/runs/{run['id']}").json()["id"] == run["id"]
+
+    assert client.post("/runs/batch", json=[]).json() == []
+    assert client.post("/runs/batch", json=body * 251).status_code == 422
@@ -48,3 +48,161 @@ def test_discovery_and_dor_gate():
     assert len(dj["prd"]["prd"]["acceptance_criteria"]) >= 1
 
 
+def test_item_with_latest_artifacts_single_query(db_session):
+    import datetime as dt
+    from orchestrator.discovery import item_with_latest_artifacts
+    from orchestrator.models import Project, RoadmapItem, PRD
+
+    db = db_session
+    db.add(Project(id="p1", tenant_id=TENANT, name="P"))
+    db.add(RoadmapItem(id="i1", tenant_id=TENANT, project_id="p1", title="T"))
+    t0 = dt.datetime(2024, 1, 1)
+    db.add(PRD(id="old", tenant_id=TENANT, project_id="p1", roadmap_item_id="i1", version="v1", created_at=t0))
+    db.add(PRD(id="new", tenant_id=TENANT, project_id="p1", roadmap_item_id="i1", version="v2", created_at=t0 + dt.timedelta(seconds=1)))
+    db.commit()
+
+    item, prd, design, research = item_with_latest_artifacts(db, "i1")
+    assert item.id == "i1"
+    assert prd.id == "new"
+    assert design is None and research is None
+    assert item_with_latest_artifacts(db, "missing") == (None, None, None, None)
+
+
+def test_upsert_discovery_fills_gaps_and_bumps_version(db_session):
+    from orchestrator.discovery import upsert_discovery_artifacts, dor_check
+    from orchestrator.models import Project, RoadmapItem, PRD
+
+    db = db_session
+    db.add(Project(id="p2", tenant_id=TENANT, name="P"))
+    db.add(RoadmapItem(id="i2", tenant_id=TENANT, project_id="p2", title="T"))
+    db.commit()
+
+    first = upsert_discovery_artifacts(db, TENANT, "p2", "i2")
+    assert first["created"] == {"prd": True, "design": True, "research": True}
+    again = upsert_discovery_artifacts(db, TENANT, "p2", "i2")
+    assert again["created"] == {"prd": False, "design": False, "research": False}
+    assert again["ids"] == first["ids"]
+    assert dor_check(db, TENANT, "p2", "i2")[0] is True
+
+    forced = upsert_discovery_artifacts(db, TENANT, "p2", "i2", force=True)
+    assert db.get(PRD, forced["ids"]["prd"]).version == "v1"
+
+
+def test_upsert_discovery_skips_kb_search_when_complete(db_session, monkeypatch):
+    from orchestrator import discovery
+    from orchestrator.models import Project, RoadmapItem
+
+    db = db_session
+    db.add(Project(id="p3", tenant_id=TENANT, name="P"))
+    db.add(RoadmapItem(id="i3", tenant_id=TENANT, project_id="p3", title="T"))
+    db.commit()
+    first = discovery.upsert_discovery_artifacts(db, TENANT, "p3", "i3")
+    assert [a.id for a in first["artifacts"]] == [first["ids"][k] for k in ("prd", "design", "research")]
+
+    calls = []
+    monkeypatch.setattr(discovery, "kb_search_cached", lambda *a, **kw: calls.append(a) or [])
+    again = discovery.upsert_discovery_artifacts(db, TENANT, "p3", "i3")
+    assert calls == [] and [a.id for a in again["artifacts"]] == [a.id for a in first["artifacts"]]
+    discovery.upsert_discovery_artifacts(db, TENANT, "p3", "i3", force=True)
+    assert len(calls) == 1
+
+
+def test_upsert_discovery_writes_nothing_when_an_agent_fails(db_session, monkeypatch):
+    import pytest
+    from orchestrator import discovery
+    from orchestrator.models import Project, RoadmapItem, PRD, KbChunk
+
+    db = db_session
+    db.add(Project(id="p5", tenant_id=TENANT, name="P"))
+    db.add(RoadmapItem(id="i5", tenant_id=TENANT, project_id="p5", title="T"))
+    db.commit()
+
+    def boom(*a, **kw):
+        raise RuntimeError("agent down")
+
+    monkeypatch.setattr(discovery.research_agent, "synthesize", boom)
+    with pytest.raises(RuntimeError):
+        discovery.upsert_discovery_artifacts(db, TENANT, "p5", "i5")
+    db.rollback()
+    # Drafting happens before any write, so the PRD and design are not left behind
+    assert db.query(PRD).filter(PRD.roadmap_item_id == "i5").count() == 0
+    assert db.query(KbChunk).filter(KbChunk.project_id == "p5").count() == 0
+
+
+def test_upsert_discovery_commits_once(db_session):
+    from sqlalchemy import event
+    from orchestrator.discovery import upsert_discovery_artifacts
+    from orchestrator.models import Project, RoadmapItem, KbChunk
+
+    db = db_session
+    db.add(Project(id="p6", tenant_id=TENANT, name="P"))
+    db.add(RoadmapItem(id="i6", tenant_id=TENANT, project_id="p6", title="T"))
+    db.commit()
+
+    commits = []
+    event.listen(db, "after_commit", lambda s: commits.append(1))
+    res = upsert_discovery_artifacts(db, TENANT, "p6", "i6")
+    assert res["created"] == {"prd": True, "design": True, "research": True}
+    # Artifacts and their KB chunks land in the same transaction
+    assert len(commits) == 1
+    assert {c.kind for c in db.query(KbChunk).filter(KbChunk.project_id == "p6")} == {"prd", "design", "research"}
+
+
+def test_dor_check_column_query_matches_object_check(db_session):
+    from orchestrator.discovery import dor_check, dor_check_from_objs, latest_discovery_artifacts
+    from orchestrator.models import Project, RoadmapItem, PRD, DesignCheck, ResearchNote
+
+    db = db_session
+    db.add(Project(id="p7", tenant_id=TENANT, name="P"))
+    db.add(RoadmapItem(id="i7", tenant_id=TENANT, project_id="p7", title="T"))
+    db.add(PRD(id="prd7", tenant_id=TENANT, project_id="p7", roadmap_item_id="i7", version="v0", prd_json={"acceptance_criteria": []}))
+    db.add(DesignCheck(id="d7", tenant_id=TENANT, project_id="p7", roadmap_item_id="i7", passes=False, heuristics_score=1, a11y_notes=""))
+    db.commit()
+
+    got = dor_check(db, TENANT, "p7", "i7")
+    assert got == (False, ["prd.acceptance_criteria", "design.passes", "research"], {"prd_id": "prd7", "design_id": "d7"})
+    assert got == dor_check_from_objs(*latest_discovery_artifacts(db, TENANT, "p7", "i7"))
+
+    db.add(ResearchNote(id="r7", tenant_id=TENANT, project_id="p7", roadmap_item_id="i7", summary="", evidence=[]))
+    db.commit()
+    assert dor_check(db, TENANT, "p7", "i7")[1] == ["prd.acceptance_criteria", "design.passes", "research.summary"]
+    assert dor_check(db, TENANT, "p7", "missing") == (False, ["prd", "design", "research"], {})
+
+
+def test_discovery_status_matches_response_model():
+    from orchestrator.schemas import DiscoveryStatus
+
+    client = TestClient(app)
+    p = client.post("/projects", json={"tenant_id": TENANT, "name": "P4 Status", "description": "", "repo_url": ""}).json()
+    item = client.post("/roadmap-items", json={"tenant_id": TENANT, "project_id": p["id"], "title": "P4 Status"}).json()
+
+    empty = client.get(f"/roadmap-items/{item['id']}/discovery")
+    assert empty.status_code == 200
+    assert empty.headers["content-type"] == "application/json"
+    assert DiscoveryStatus.model_validate_json(empty.content).dor_pass is False
+
+    ensured = client.post(f"/roadmap-items/{item['id']}/discovery/ensure")
+    assert ensured.status_code == 200
+    body = DiscoveryStatus.model_validate_json(ensured.content)
+    assert body.dor_pass is True and body.prd.roadmap_item_id == item["id"]
+    assert client.get(f"/roadmap-items/{item['id']}/discovery").json() == ensured.json()
+
+
+def test_gate_skips_upsert_when_dor_already_passes(db_session, monkeypatch):
+    from orchestrator import graph
+    from orchestrator.models import Project, RoadmapItem, RunDB
+
+    db = db_session
+    db.add(Project(id="p8", tenant_id=TENANT, name="P"))
+    db.add(RoadmapItem(id="i8", tenant_id=TENANT, project_id="p8", title="T"))
+    run = RunDB(id="r8", tenant_id=TENANT, project_id="p8", roadmap_item_id="i8", phase="delivery", status="pending")
+    db.add(run)
+    db.commit()
+
+    calls = []
+    real = graph.upsert_discovery_artifacts
+    monkeypatch.setattr(graph, "upsert_discovery_artifacts", lambda *a, **kw: calls.append(a) or real(*a, **kw))
+    assert graph.ensure_discovery_and_gate(db, run) == (True, [])
+    assert len(calls) == 1
+    assert graph.ensure_discovery_and_gate(db, run) == (True, [])
+    assert len(calls) == 1
@@ -53,3 +53,118 @@ def test_kb_and_discovery_rag():
     assert isinstance(refs, list)
 
 
+def test_kb_search_cached_invalidates_on_ingest(db_session, monkeypatch):
+    from orchestrator.kb import ingest_text, search_cached
+
+    monkeypatch.setenv("KB_CACHE_TTL_SECONDS", "60")
+    proj = "kb-cache-proj"
+    ingest_text(db_session, TENANT, proj, kind="note", ref_id="", text="Alpha feature notes.")
+    first = search_cached(db_session, TENANT, proj, "Alpha feature", k=5)
+    assert len(first) == 1
+    # Repeat lookups are served from the cache and return independent copies
+    first[0]["text"] = "mutated"
+    again = search_cached(db_session, TENANT, proj, "Alpha feature", k=5)
+    assert again[0]["text"] == "Alpha feature notes."
+
+    ingest_text(db_session, TENANT, proj, kind="note", ref_id="", text="Alpha feature follow-up.")
+    after = search_cached(db_session, TENANT, proj, "Alpha feature", k=5)
+    assert len(after) == 2
+
+
+def test_staged_ingest_invalidates_cache_on_commit(db_session, monkeypatch):
+    from orchestrator import kb
+    from orchestrator.kb import ingest_text, search_cached
+
+    monkeypatch.setenv("KB_CACHE_TTL_SECONDS", "60")
+    bumps = []
+    real_bump = kb._bump_version
+    monkeypatch.setattr(kb, "_bump_version", lambda t, p: (bumps.append((t, p)), real_bump(t, p)))
+
+    proj = "kb-staged-proj"
+    ingest_text(db_session, TENANT, proj, kind="note", ref_id="", text="Beta feature notes.")
+    assert len(search_cached(db_session, TENANT, proj, "Beta feature", k=5)) == 1
+    bumps.clear()
+
+    for _ in range(3):
+        ingest_text(db_session, TENANT, proj, kind="note", ref_id="", text="Beta follow-up.", commit=False)
+        db_session.rollback()
+    assert len(search_cached(db_session, TENANT, proj, "Beta feature", k=5)) == 1
+    # Rolled-back stages leave nothing behind for an unrelated later commit to fire
+    db_session.commit()
+    assert bumps == []
+
+    ingest_text(db_session, TENANT, proj, kind="note", ref_id="", text="Beta follow-up.", commit=False)
+    ingest_text(db_session, TENANT, proj, kind="note", ref_id="", text="Beta second follow-up.", commit=False)
+    db_session.commit()
+    assert bumps == [(TENANT, proj)]
+    assert len(search_cached(db_session, TENANT, proj, "Beta feature", k=5)) == 3
+
+
+def test_embed_text_local_matches_per_byte_histogram():
+    import hashlib
+    import numpy as np
+    from orchestrator.embeddings import _noise, embed_text_local
+
+    text, dim = "héllo ✓ " * 40, 16
+    data = text.encode("utf-8")
+    v = _noise(int.from_bytes(hashlib.sha256(data).digest()[:8], "little"), dim)
+    hist = np.zeros(dim, dtype=np.float32)
+    for b in data:
+        hist[b % dim] += 1.0
+    v += hist
+    expected = v / float(np.linalg.norm(v) + 1e-8)
+    assert np.array_equal(np.asarray(embed_text_local(text, dim), dtype=np.float32), expected)
+    assert embed_text_local("", dim) == embed_text_local("", dim)
+
+
+def test_embedding_noise_is_deterministic_unit_variance():
+    import numpy as np
+    from orchestrator.embeddings import _noise
+
+    a = _noise(42, 385)
+    assert a.dtype == np.float32 and a.shape == (385,)
+    assert np.array_equal(a, _noise(42, 385))
+    assert not np.array_equal(a, _noise(43, 385))
+    big = _noise(7, 200_001)
+    assert abs(float(big.mean())) < 0.02 and abs(float(big.var()) - 1.0) < 0.02
+    assert float(np.abs(big).max()) < np.sqrt(3.0)
+
+
+def test_unit_cosine_helpers_match_general_cosine():
+    import numpy as np
+    from orchestrator.embeddings import cosine, cosine_batch, cosine_unit, embed_text_local
+
+    q = embed_text_local("query text")
+    rows = [embed_text_local(t) for t in ("alpha", "beta gamma", "query text", "")]
+    batch = cosine_batch(q, rows)
+    assert batch.dtype == np.float32 and batch.shape == (4,)
+    for row, score in zip(rows, batch):
+        general = cosine(np.asarray(q), np.asarray(row))
+        assert abs(cosine_unit(np.asarray(q), np.asarray(row)) - general) < 1e-6
+        assert abs(float(score) - general) < 1e-6
+    assert round(float(batch[2]), 4) == 1.0
+
+
+def test_embed_query_is_memoized_and_read_only():
+    import numpy as np
+    import pytest
+    from orchestrator.embeddings import embed_query, embed_text_local
+
+    q = embed_query("Project Alpha Feature", 32)
+    assert embed_query("Project Alpha Feature", 32) is q
+    assert np.array_equal(q, np.asarray(embed_text_local("Project Alpha Feature", 32), dtype=np.float32))
+    with pytest.raises(ValueError):
+        q[0] = 0.0
+    assert not np.shares_memory(q, embed_query("Project Alpha Feature", 16))
+
+
+def test_stored_embedding_json_is_compact_and_exact():
+    import json
+    import numpy as np
+    from orchestrator.embeddings import embed_query, embed_text_local
+
+    text = "Alpha feature notes " * 20
+    stored = embed_text_local(text)
+    exact = embed_query(text)
+    assert np.array_equal(np.asarray(json.loads(json.dumps(stored)), dtype=np.float32), exact)
+    assert len(json.dumps(stored)) < 0.75 * len(json.dumps(exact.tolist()))
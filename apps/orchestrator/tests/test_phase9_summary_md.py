@@ -18,3 +18,150 @@ def test_build_pr_summary_md_contains_marker_and_links():
     assert "blob/feature/1234abcd-feature-a/docs/roadmap/1234abcd-feature-a/prd.json" in md
 
 
+def test_github_helpers_share_one_pooled_client():
+    from orchestrator.integrations import github
+    c = github._client()
+    assert github._client() is c
+    assert not c.is_closed
+
+
+def test_commit_files_makes_one_commit_and_skips_unchanged_trees():
+    import json, httpx
+    from orchestrator.integrations import github
+    calls = []
+    tree_sha = {"value": "t2"}
+
+    def handler(req):
+        path = req.url.path
+        calls.append((req.method, path.split("/git/", 1)[-1]))
+        if path.endswith("/git/ref/heads/br"):
+            return httpx.Response(200, json={"object": {"sha": "c1"}})
+        if path.endswith("/git/commits/c1"):
+            return httpx.Response(200, json={"tree": {"sha": "t1"}})
+        if path.endswith("/git/trees"):
+            body = json.loads(req.content)
+            assert body["base_tree"] == "t1"
+            assert [e["path"] for e in body["tree"]] == ["d/a.md", "d/b.md", "d/c.md"]
+            return httpx.Response(201, json={"sha": tree_sha["value"]})
+        if path.endswith("/git/commits"):
+            assert json.loads(req.content) == {"message": "msg", "tree": "t2", "parents": ["c1"]}
+            return httpx.Response(201, json={"sha": "c2"})
+        assert req.method == "PATCH" and path.endswith("/git/refs/heads/br")
+        assert json.loads(req.content) == {"sha": "c2", "force": False}
+        return httpx.Response(200, json={})
+
+    c = httpx.Client(transport=httpx.MockTransport(handler))
+    files = [("d/a.md", b"a"), ("d/b.md", b"b"), ("d/c.md", b"c")]
+    assert github._commit_files(c, "o", "r", "br", files, "msg", {}) == "c2"
+    assert len(calls) == 5
+
+    # Same contents again: the tree matches the head's, so no empty commit is created
+    calls.clear()
+    tree_sha["value"] = "t1"
+    assert github._commit_files(c, "o", "r", "br", files, "msg", {}) == "c1"
+    assert [m for m, _ in calls] == ["GET", "GET", "POST"]
+
+    # Missing branch: created directly at the new commit on top of the base branch
+    calls.clear()
+    tree_sha["value"] = "t2"
+
+    def new_branch(req):
+        path = req.url.path
+        if path.endswith("/git/ref/heads/feat"):
+            return httpx.Response(404)
+        if path.endswith("/git/ref/heads/main"):
+            calls.append("base")
+            return httpx.Response(200, json={"object": {"sha": "c1"}})
+        if req.method == "POST" and path.endswith("/git/refs"):
+            assert json.loads(req.content) == {"ref": "refs/heads/feat", "sha": "c2"}
+            calls.append("create")
+            return httpx.Response(201, json={"object": {"sha": "c2"}})
+        assert req.method != "PATCH"
+        return handler(req)
+
+    c = httpx.Client(transport=httpx.MockTransport(new_branch))
+    assert github._commit_files(c, "o", "r", "feat", files, "msg", {}, base_branch="main") == "c2"
+    assert calls[0] == "base" and calls[-1] == "create"
+
+
+def test_set_statuses_posts_contexts_concurrently():
+    import json, threading, httpx
+    from orchestrator.integrations import github
+    contexts = [github.CTX_DOR, github.CTX_HUMAN, github.CTX_ARTIFACTS, github.CTX_PREVIEW]
+    barrier = threading.Barrier(len(contexts), timeout=5)
+    posted = []
+
+    def handler(req):
+        barrier.wait()  # every status POST must be in flight at once
+        posted.append(json.loads(req.content)["context"])
+        return httpx.Response(201, json={"context": posted[-1]})
+
+    c = httpx.Client(transport=httpx.MockTransport(handler))
+    res = github._set_statuses(c, "o", "r", "s", [{"context": ctx, "state": "pending"} for ctx in contexts], {})
+    assert sorted(posted) == sorted(contexts)
+    # Results come back in request order
+    assert [r["context"] for r in res] == contexts
+
+
+def test_github_gets_revalidate_with_etags_per_token():
+    import httpx
+    from orchestrator.integrations import github
+    sent = []
+
+    def handler(req):
+        sent.append((req.headers.get("authorization"), req.headers.get("if-none-match")))
+        if req.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, json={"default_branch": "main"}, headers={"ETag": '"v1"'})
+
+    c = httpx.Client(transport=httpx.MockTransport(handler))
+    url = f"{github.GITHUB_API_BASE}/repos/etag-owner/etag-repo"
+    first = github._get_repo(c, "etag-owner", "etag-repo", github._headers("tok-a"))
+    first["default_branch"] = "mutated"
+    again = github._get_repo(c, "etag-owner", "etag-repo", github._headers("tok-a"))
+    # 304 replays the cached body; the caller's earlier mutation does not leak into it
+    assert again == {"default_branch": "main"}
+    github._get_repo(c, "etag-owner", "etag-repo", github._headers("tok-b"))
+    assert [inm for _, inm in sent] == [None, '"v1"', None]
+    assert any(k[1] == url for k in github._ETAG_CACHE)
+
+
+def test_marker_comment_lookup_pages_lazily():
+    import httpx
+    from orchestrator.integrations import github
+    fetched = []
+    marker = "<!-- ai-csuite:summary:feature/x -->"
+
+    def pages(marker_page):
+        def handler(req):
+            page = int(req.url.params.get("page", "1"))
+            fetched.append((page, req.url.params.get("per_page")))
+            body = [{"id": page * 1000 + i, "body": marker if (page == marker_page and i == 7) else "hi"} for i in range(100)]
+            nxt = {"Link": f'<{req.url.copy_merge_params({"page": page + 1, "per_page": 100})}>; rel="next"'} if page < 3 else {}
+            return httpx.Response(200, json=body, headers=nxt)
+        return httpx.Client(transport=httpx.MockTransport(handler))
+
+    # A marker on page 2 is found and page 3 is never fetched
+    assert github._find_marker_comment_id(github._iter_issue_comments(pages(2), "o", "r", 1, {}), "feature/x") == 2007
+    assert fetched == [(1, "100"), (2, "100")]
+    fetched.clear()
+    assert github._find_marker_comment_id(github._iter_issue_comments(pages(None), "o", "r", 2, {}), "feature/x") is None
+    assert [p for p, _ in fetched] == [1, 2, 3]
+
+
+def test_project_for_owner_repo_matches_exact_pair(db_session):
+    from orchestrator.integrations import github
+    from orchestrator.models import Project
+    t = "00000000-0000-0000-0000-000000000000"
+    db_session.add_all([
+        Project(id="p1", tenant_id=t, name="a", repo_url="https://github.com/acme/app-extra.git"),
+        Project(id="p2", tenant_id=t, name="b", repo_url="https://github.com/xacme/app.git"),
+        Project(id="p3", tenant_id=t, name="c", repo_url="git@github.com:acme/app.git"),
+        Project(id="p4", tenant_id=t, name="d", repo_url="https://github.com/acme/a_p.git"),
+    ])
+    db_session.commit()
+    assert github._project_for_owner_repo(db_session, "acme", "app").id == "p3"
+    # LIKE wildcards in the name are matched literally
+    assert github._project_for_owner_repo(db_session, "acme", "a%p") is None
+    assert github._project_for_owner_repo(db_session, "acme", "a_p").id == "p4"
+    assert github._project_for_owner_repo(db_session, "acme", "missing") is None
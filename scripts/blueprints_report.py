@@ -7,6 +7,7 @@ import os
 import sys
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
+from json_report import ENC_SORTED, write_json_sorted
 
 
 # Ensure orchestrator app modules are importable (local, in-process)
@@ -56,13 +57,8 @@ def _now_iso() -> str:
     )
 
 
-def _write_json_sorted(path: Path, obj: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(obj, sort_keys=True) + "\n", encoding="utf-8")
-
-
 def _read_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
+    return json.loads(path.read_bytes())
 
 
 def _match_any(name: str, patterns: List[str]) -> bool:
@@ -86,7 +82,7 @@ def _ingest_kb_if_enabled(report: Dict[str, Any]) -> None:
             "perf_budget_ms": (b.get("quality_gates") or {}).get("perf_budget_ms"),
         }
         rows.append(mask_dict(row))
-    text = json.dumps({"rows": rows}, sort_keys=True)
+    text = ENC_SORTED.encode({"rows": rows})
     text = apply_redaction(text, mode="strict")
     # Ensure tables exist for standalone script usage
     try:
@@ -132,7 +128,7 @@ def _discover_blueprints(bp_dir: Path) -> List[Tuple[Path, Dict[str, Any]]]:
 def main() -> int:
     if not _get_env_bool("BLUEPRINTS_ENABLED", True):
         outdir = Path(os.getenv("BLUEPRINTS_OUTDIR", "blueprints"))
-        _write_json_sorted(outdir / "report.json", {"blueprints": [], "summary": {"count": 0, "failed": 0, "finished_at": "", "passed": 0, "started_at": ""}})
+        write_json_sorted(outdir / "report.json", {"blueprints": [], "summary": {"count": 0, "failed": 0, "finished_at": "", "passed": 0, "started_at": ""}})
         return 0
 
     bp_dir = Path("blueprints").resolve()
@@ -156,7 +152,7 @@ def main() -> int:
             continue
         # Validate with Pydantic
         try:
-            mf = BlueprintManifest(**raw)  # type: ignore
+            mf = BlueprintManifest.model_validate(raw)  # type: ignore
             bid = mf.id
             raw_id = bid
         except Exception:
@@ -225,7 +221,7 @@ def main() -> int:
                     "passed": (prev.get("summary") or {}).get("passed"),
                 },
             }
-            if json.dumps(prev_core, sort_keys=True) == json.dumps(report_core, sort_keys=True):
+            if ENC_SORTED.encode(prev_core) == ENC_SORTED.encode(report_core):
                 started_at = str((prev.get("summary") or {}).get("started_at") or started_at)
                 finished_at = str((prev.get("summary") or {}).get("finished_at") or finished_at)
         except Exception:
@@ -242,7 +238,7 @@ def main() -> int:
         },
     }
 
-    _write_json_sorted(report_path, report)
+    write_json_sorted(report_path, report)
 
     # Optional local-only KB ingestion
     _ingest_kb_if_enabled(report)
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Build indexes declared on the models that an existing database is missing.
+
+create_all() only indexes tables it creates, so run this once after deploying a
+release that declares new indexes. Uses DATABASE_URL / POSTGRES_* like the app;
+on Postgres the indexes are built CONCURRENTLY so writes are not blocked.
+"""
+import os
+import sys
+
+_APPS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "apps", "orchestrator"))
+if _APPS_DIR not in sys.path:
+    sys.path.insert(0, _APPS_DIR)
+
+from orchestrator.db import engine, ensure_indexes  # type: ignore
+
+
+def main() -> int:
+    created = ensure_indexes(engine)
+    for name in created:
+        print(f"[db_ensure_indexes] created {name}")
+    if not created:
+        print("[db_ensure_indexes] all declared indexes present")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
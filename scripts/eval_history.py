@@ -5,20 +5,16 @@ import json
 import hashlib
 from pathlib import Path
 from typing import Any, Dict, List
+from json_report import ENC_SORTED, write_json_sorted
 
 
 def _read_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
-def _write_json_sorted(path: Path, obj: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(obj, sort_keys=True) + "\n", encoding="utf-8")
+    return json.loads(path.read_bytes())
 
 
 def _fingerprint(report: Dict[str, Any]) -> str:
     core = {"suites": report.get("suites", []), "summary": {k: report.get("summary", {}).get(k) for k in ("score", "passed", "failed")}}
-    b = json.dumps(core, sort_keys=True).encode("utf-8")
+    b = ENC_SORTED.encode(core).encode("utf-8")
     return hashlib.sha256(b).hexdigest()
 
 
@@ -28,7 +24,7 @@ def main() -> int:
     history_path = outdir / "history.json"
     if not report_path.exists():
         # Nothing to do
-        _write_json_sorted(history_path, {"runs": []})
+        write_json_sorted(history_path, {"runs": []})
         return 0
     report = _read_json(report_path)
     fp = _fingerprint(report)
@@ -81,7 +77,7 @@ def main() -> int:
         r["suites"] = sorted(r.get("suites", []), key=lambda s: str(s.get("id")))
     runs.sort(key=lambda r: (str(r.get("finished_at")), str(r.get("fingerprint"))))
 
-    _write_json_sorted(history_path, {"runs": runs})
+    write_json_sorted(history_path, {"runs": runs})
     return 0
 
 
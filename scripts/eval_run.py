@@ -17,16 +17,11 @@ from orchestrator.integrations.github import build_pr_summary_md  # type: ignore
 from orchestrator.security import apply_redaction, mask_dict  # type: ignore
 from orchestrator.db import SessionLocal, Base, engine  # type: ignore
 from orchestrator.kb import ingest_text as kb_ingest  # type: ignore
+from json_report import ENC_SORTED, write_json_sorted
 
 
 def _read_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
-def _write_json_sorted(path: Path, obj: Any) -> None:
-    # Stable formatting: sorted keys, newline-terminated
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(obj, sort_keys=True) + "\n", encoding="utf-8")
+    return json.loads(path.read_bytes())
 
 
 def _get_env_bool(name: str, default: bool) -> bool:
@@ -63,7 +58,7 @@ def _json_path_get(obj: Any, path: str) -> Any:
 
 
 def _hash_fingerprint(obj: Any) -> str:
-    b = json.dumps(obj, sort_keys=True).encode("utf-8")
+    b = ENC_SORTED.encode(obj).encode("utf-8")
     return hashlib.sha256(b).hexdigest()
 
 
@@ -178,7 +173,7 @@ def _ingest_kb_if_enabled(report: Dict[str, Any]) -> None:
             "threshold": s.get("threshold"),
         }
         safe_rows.append(mask_dict(row))
-    text = json.dumps({"rows": safe_rows}, sort_keys=True)
+    text = ENC_SORTED.encode({"rows": safe_rows})
     text = apply_redaction(text, mode="strict")
     # Ensure tables exist for standalone script usage
     try:
@@ -197,7 +192,7 @@ def main() -> int:
     if not _get_env_bool("EVAL_ENABLED", True):
         # Graceful no-op with stable empty report if disabled
         outdir = Path(os.getenv("EVAL_OUTDIR", "eval"))
-        _write_json_sorted(outdir / "report.json", {"suites": [], "summary": {"score": 0.0, "passed": 0, "failed": 0, "started_at": "", "finished_at": ""}})
+        write_json_sorted(outdir / "report.json", {"suites": [], "summary": {"score": 0.0, "passed": 0, "failed": 0, "started_at": "", "finished_at": ""}})
         return 0
 
     outdir = Path(os.getenv("EVAL_OUTDIR", "eval"))
@@ -308,7 +303,7 @@ def main() -> int:
         try:
             prev = _read_json(report_path)
             prev_core = {"suites": prev.get("suites", []), "summary": {k: prev.get("summary", {}).get(k) for k in ("score", "passed", "failed")}}
-            if json.dumps(prev_core, sort_keys=True) == json.dumps(report_core, sort_keys=True):
+            if ENC_SORTED.encode(prev_core) == ENC_SORTED.encode(report_core):
                 # Reuse timestamps
                 started_at = str(prev.get("summary", {}).get("started_at") or started_at)
                 finished_at = str(prev.get("summary", {}).get("finished_at") or finished_at)
@@ -326,7 +321,7 @@ def main() -> int:
         },
     }
 
-    _write_json_sorted(report_path, report)
+    write_json_sorted(report_path, report)
 
     # Optional local-only KB ingestion
     _ingest_kb_if_enabled(report)
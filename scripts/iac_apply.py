@@ -5,15 +5,11 @@ import os
 import sys
 from pathlib import Path
 from typing import Any, Dict, List
+from json_report import write_json_sorted
 
 
 def _read_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
-def _write_json_sorted(path: Path, obj: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(obj, sort_keys=True) + "\n", encoding="utf-8")
+    return json.loads(path.read_bytes())
 
 
 def _env_str(name: str, default: str) -> str:
@@ -58,7 +54,7 @@ def main() -> int:
         resources = _flatten_resources(plan)
         state = {"env": env, "resources": resources, "status": "applied", "version_pins": pins}
 
-    _write_json_sorted(outdir / "state.json", state)
+    write_json_sorted(outdir / "state.json", state)
     return 0
 
 
@@ -4,15 +4,11 @@ import sys
 import json
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
+from json_report import write_json_sorted
 
 
 def _read_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
-def _write_json_sorted(path: Path, obj: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(obj, sort_keys=True) + "\n", encoding="utf-8")
+    return json.loads(path.read_bytes())
 
 
 def _get_env_bool(name: str, default: bool) -> bool:
@@ -116,7 +112,7 @@ def main() -> int:
     env = _load_env_manifest(env_dir, env_id)
     plan = _merge_plan(env, mods)
 
-    _write_json_sorted(outdir / "plan.json", plan)
+    write_json_sorted(outdir / "plan.json", plan)
     return 0
 
 
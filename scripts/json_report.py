@@ -0,0 +1,29 @@
+"""
+Shared JSON report writing for the local report/history scripts.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+# One encoder for all calls: json.dumps(..., sort_keys=True) builds a new JSONEncoder each time
+ENC_SORTED = json.JSONEncoder(sort_keys=True)
+
+
+def write_json_sorted(path: Path, obj: Any) -> None:
+    """
+    Write obj with sorted keys and a trailing newline. An unchanged file is left
+    untouched (mtime included); otherwise the bytes are written to a temp file and
+    renamed over the target so readers never observe a half-written report.
+    """
+    data = (ENC_SORTED.encode(obj) + "\n").encode("utf-8")
+    try:
+        # A size mismatch settles it without reading the old file
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return
+    except FileNotFoundError:
+        pass
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
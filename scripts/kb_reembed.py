@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Recompute kb_chunks.emb with the current local embedding.
+
+embed_text_local is deterministic but not stable across releases (its seed and
+noise stream have changed), and search ranks stored chunk vectors against fresh
+query vectors, so run this once after deploying a release that changes the
+embedding. Uses DATABASE_URL / POSTGRES_* like the app; rows are rewritten in
+batches keyed by id, each batch committed on its own, and reruns are idempotent.
+"""
+import argparse
+import os
+import sys
+
+_APPS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "apps", "orchestrator"))
+if _APPS_DIR not in sys.path:
+    sys.path.insert(0, _APPS_DIR)
+
+from sqlalchemy import bindparam, select, update
+
+from orchestrator.db import SessionLocal  # type: ignore
+from orchestrator.embeddings import embed_text_local  # type: ignore
+from orchestrator.models import KbChunk  # type: ignore
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--batch-size", type=int, default=500)
+    args = ap.parse_args()
+    batch = max(1, args.batch_size)
+
+    stmt = update(KbChunk).where(KbChunk.id == bindparam("b_id")).values(emb=bindparam("b_emb"))
+    total, last_id = 0, ""
+    with SessionLocal() as db:
+        while True:
+            rows = db.execute(
+                select(KbChunk.id, KbChunk.text)
+                .where(KbChunk.id > last_id)
+                .order_by(KbChunk.id)
+                .limit(batch)
+            ).all()
+            if not rows:
+                break
+            db.connection().execute(
+                stmt, [{"b_id": r.id, "b_emb": embed_text_local(r.text or "")} for r in rows]
+            )
+            db.commit()
+            total += len(rows)
+            last_id = rows[-1].id
+            print(f"[kb_reembed] re-embedded {total} chunks")
+    if not total:
+        print("[kb_reembed] no chunks to re-embed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -108,6 +108,7 @@ KNOWN_LICENSES: Dict[str, str] = {
     "uvicorn": "BSD-3-Clause",
     "httpx": "BSD-3-Clause",
     "numpy": "BSD-3-Clause",
+    "orjson": "Apache-2.0 OR MIT",
     "pydantic": "MIT",
     "psycopg": "LGPL-3.0-or-later",
     "pypdf": "BSD-3-Clause",
@@ -42,7 +42,7 @@ def _allow_warn_override() -> bool:
 
 
 def _read(path: Path) -> Any:
-    return json.loads(path.read_text())
+    return json.loads(path.read_bytes())
 
 
 def _get_by_path(obj: Any, path: str) -> Any:
@@ -36,7 +36,7 @@ OUTPUT_PATH = OUTPUT_DIR / "facts.json"
 
 def _read_json(path: Path) -> Any:
     try:
-        return json.loads(path.read_text())
+        return json.loads(path.read_bytes())
     except FileNotFoundError:
         return None
 
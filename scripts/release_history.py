@@ -3,15 +3,11 @@ import json
 import hashlib
 from pathlib import Path
 from typing import Any, Dict, List
+from json_report import ENC_SORTED, write_json_sorted
 
 
 def _read_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
-def _write_json_sorted(path: Path, obj: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(obj, sort_keys=True) + "\n", encoding="utf-8")
+    return json.loads(path.read_bytes())
 
 
 def _fingerprint(report: Dict[str, Any]) -> str:
@@ -30,7 +26,7 @@ def _fingerprint(report: Dict[str, Any]) -> str:
         "threshold_err": (report.get("summary") or {}).get("threshold_err"),
         "threshold_p95": (report.get("summary") or {}).get("threshold_p95"),
     }
-    b = json.dumps(core, sort_keys=True).encode("utf-8")
+    b = ENC_SORTED.encode(core).encode("utf-8")
     return hashlib.sha256(b).hexdigest()
 
 
@@ -41,7 +37,7 @@ def main() -> int:
 
     if not report_path.exists():
         # Create empty history deterministically
-        _write_json_sorted(history_path, {"runs": []})
+        write_json_sorted(history_path, {"runs": []})
         return 0
 
     report = _read_json(report_path)
@@ -88,7 +84,7 @@ def main() -> int:
         return (str(r.get("started_at") or ""), str(r.get("env") or ""))
 
     runs.sort(key=_key)
-    _write_json_sorted(history_path, {"runs": runs})
+    write_json_sorted(history_path, {"runs": runs})
     return 0
 
 
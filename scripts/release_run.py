@@ -5,6 +5,7 @@ import sys
 import hashlib
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
+from json_report import ENC_SORTED, write_json_sorted
 
 
 # Orchestrator local-only helpers for optional KB ingest
@@ -33,12 +34,7 @@ except Exception:
 
 
 def _read_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
-def _write_json_sorted(path: Path, obj: Any) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(obj, sort_keys=True) + "\n", encoding="utf-8")
+    return json.loads(path.read_bytes())
 
 
 def _get_env_bool(name: str, default: bool) -> bool:
@@ -75,7 +71,7 @@ def _now_iso() -> str:
 
 
 def _hash_core(obj: Any) -> str:
-    b = json.dumps(obj, sort_keys=True).encode("utf-8")
+    b = ENC_SORTED.encode(obj).encode("utf-8")
     return hashlib.sha256(b).hexdigest()
 
 
@@ -126,7 +122,7 @@ def _ingest_kb_if_enabled(report: Dict[str, Any]) -> None:
         "threshold_p95": summary.get("threshold_p95"),
     }
     safe = mask_dict(safe)
-    text = json.dumps(safe, sort_keys=True)
+    text = ENC_SORTED.encode(safe)
     text = apply_redaction(text, mode="strict")
     try:
         Base.metadata.create_all(bind=engine)  # type: ignore
@@ -147,7 +143,7 @@ def main() -> int:
     if not _get_env_bool("RELEASE_ENABLED", True):
         # Graceful no-op writing a minimal report
         outdir = Path("deployments")
-        _write_json_sorted(outdir / "report.json", {"env": {"id": "", "target": ""}, "steps": [], "summary": {"failed": 0, "finished_at": "", "passed": 0, "score": 0.0, "started_at": "", "status": "pass", "threshold_err": 0.0, "threshold_p95": 0}})
+        write_json_sorted(outdir / "report.json", {"env": {"id": "", "target": ""}, "steps": [], "summary": {"failed": 0, "finished_at": "", "passed": 0, "score": 0.0, "started_at": "", "status": "pass", "threshold_err": 0.0, "threshold_p95": 0}})
         return 0
 
     release_env = _env_str("RELEASE_ENV", _env_str("IAC_ENV", "staging"))
@@ -237,7 +233,7 @@ def main() -> int:
                     "status": (prev.get("summary") or {}).get("status"),
                 },
             }
-            if json.dumps(prev_core, sort_keys=True) == json.dumps(report_core, sort_keys=True):
+            if ENC_SORTED.encode(prev_core) == ENC_SORTED.encode(report_core):
                 started_at = str((prev.get("summary") or {}).get("started_at") or started_at)
                 finished_at = str((prev.get("summary") or {}).get("finished_at") or finished_at)
         except Exception:
@@ -258,7 +254,7 @@ def main() -> int:
         },
     }
 
-    _write_json_sorted(report_path, report)
+    write_json_sorted(report_path, report)
 
     # Optional local-only KB ingestion
     _ingest_kb_if_enabled(report)